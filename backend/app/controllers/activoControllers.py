@@ -1,5 +1,7 @@
 # app/controllers/activoController.py
+from typing import List, Optional
 from fastapi import HTTPException
+from app.controllers.respuestas import respuesta_parcial
 from app.services.activoService import (
     get_activos_service,
     get_activo_service,
@@ -10,10 +12,13 @@ from app.services.activoService import (
 from app.schemas.activo import ActivoCreate, ActivoUpdate
 
 
-def get_activos_controller(usuario_autenticado: dict) -> list:
+def get_activos_controller(
+    usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> list:
     """Controller para GET /activos"""
     try:
-        return get_activos_service(usuario_autenticado["usuario_id"])
+        datos = get_activos_service(usuario_autenticado["usuario_id"], campos)
+        return respuesta_parcial(datos, campos)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -21,10 +26,12 @@ def get_activos_controller(usuario_autenticado: dict) -> list:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-def get_activo_controller(activo_id: int, usuario_autenticado: dict) -> dict:
+def get_activo_controller(
+    activo_id: int, usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> dict:
     """Controller para GET /activos/{activo_id}"""
     try:
-        return get_activo_service(activo_id)
+        return respuesta_parcial(get_activo_service(activo_id, campos), campos)
     except ValueError as e:
         error_msg = str(e)
         if "no encontrado" in error_msg.lower():
@@ -0,0 +1,141 @@
+# app/controllers/adminControllers.py
+from typing import Optional
+from fastapi import HTTPException
+from fastapi.responses import Response
+from app.services.memoriaService import (
+    iniciar_tracemalloc,
+    detener_tracemalloc,
+    estado_memoria,
+    tomar_snapshot,
+    borrar_snapshot,
+    comparar_snapshots,
+    picos_requests,
+)
+from app.services.librosService import reconstruir_libros
+from app.services.eliminacionUsuarioService import obtener_eliminacion
+from app.services.perfilesService import (
+    listar_perfiles,
+    obtener_perfil,
+    perfilador_continuo,
+    texto_colapsado,
+)
+
+
+def listar_perfiles_controller() -> list:
+    """Controller para GET /admin/perfiles"""
+    try:
+        return listar_perfiles()
+    except Exception as e:
+        print(f"Error en listar_perfiles_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def obtener_perfil_controller(
+    request_id: str, crudo: bool, orden: str, limite: int
+) -> Response:
+    """Controller para GET /admin/perfiles/{request_id}"""
+    try:
+        contenido, media_type, archivo = obtener_perfil(request_id, crudo, orden, limite)
+    except ValueError as e:
+        if "no encontrado" in str(e):
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_perfil_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+    headers = {"Content-Disposition": f'attachment; filename="{archivo}"'} if archivo else None
+    return Response(contenido, media_type=media_type, headers=headers)
+
+
+def perfilador_continuo_controller(reiniciar: bool) -> Response:
+    """Controller para GET /admin/perfilador (pilas colapsadas)"""
+    if reiniciar:
+        texto = texto_colapsado(perfilador_continuo.reiniciar())
+    else:
+        texto = perfilador_continuo.colapsado()
+    return Response(texto, media_type="text/plain; charset=utf-8")
+
+
+def estado_perfilador_controller() -> dict:
+    """Controller para GET /admin/perfilador/estado"""
+    return perfilador_continuo.estado()
+
+
+def _error_memoria(e: ValueError):
+    if "no encontrado" in str(e):
+        raise HTTPException(status_code=404, detail=str(e))
+    raise HTTPException(status_code=400, detail=str(e))
+
+
+def estado_memoria_controller() -> dict:
+    """Controller para GET /admin/memoria"""
+    return estado_memoria()
+
+
+def iniciar_tracemalloc_controller(marcos: int) -> dict:
+    """Controller para POST /admin/memoria/iniciar"""
+    try:
+        return iniciar_tracemalloc(marcos)
+    except ValueError as e:
+        _error_memoria(e)
+
+
+def detener_tracemalloc_controller() -> dict:
+    """Controller para POST /admin/memoria/detener"""
+    return detener_tracemalloc()
+
+
+def tomar_snapshot_controller(nombre: str) -> dict:
+    """Controller para POST /admin/memoria/snapshots/{nombre}"""
+    try:
+        return tomar_snapshot(nombre)
+    except ValueError as e:
+        _error_memoria(e)
+
+
+def borrar_snapshot_controller(nombre: str) -> dict:
+    """Controller para DELETE /admin/memoria/snapshots/{nombre}"""
+    try:
+        borrar_snapshot(nombre)
+        return {"mensaje": f"Snapshot {nombre} borrado"}
+    except ValueError as e:
+        _error_memoria(e)
+
+
+def comparar_snapshots_controller(
+    nombre: str, contra: Optional[str], agrupar: str, limite: int
+) -> dict:
+    """Controller para GET /admin/memoria/snapshots/{nombre}/diferencias"""
+    try:
+        return comparar_snapshots(nombre, contra, agrupar, limite)
+    except ValueError as e:
+        _error_memoria(e)
+    except Exception as e:
+        print(f"Error en comparar_snapshots_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def picos_requests_controller(limite: int) -> dict:
+    """Controller para GET /admin/memoria/requests"""
+    return picos_requests(limite)
+
+
+def reconstruir_libros_controller(usuario_id: int) -> dict:
+    """Controller para POST /admin/usuarios/{usuario_id}/libros/reconstruir"""
+    try:
+        return reconstruir_libros(usuario_id)
+    except Exception as e:
+        print(f"Error en reconstruir_libros_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def obtener_eliminacion_controller(usuario_id: int) -> dict:
+    """Controller para GET /admin/usuarios/{usuario_id}/eliminacion"""
+    try:
+        return obtener_eliminacion(usuario_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_eliminacion_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
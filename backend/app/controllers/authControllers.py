@@ -4,19 +4,40 @@ from app.services.auth_service import (
     login_usuario,
     registrar_usuario,
     cambiar_contraseña_usuario,
+    renovar_tokens,
+    cerrar_sesion,
 )
+from app.services.limiteIntentosService import (
+    verificar_limite_intentos,
+    segundos_para_reintentar,
+    LimiteExcedido,
+)
+
 
+def _demasiados_intentos(error: LimiteExcedido) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": segundos_para_reintentar(error)},
+    )
 
-def login_controller(email: str, password: str) -> dict:
+
+def login_controller(email: str, password: str, ip: str) -> dict:
     """
     Controller para POST /auth/login
 
     El servicio devuelve el token o lanza ValueError
     El controller convierte eso a HTTP
+
+    El límite de intentos se controla antes de ir a la BD y correr bcrypt
     """
     try:
+        verificar_limite_intentos("login", ip=ip, email=email)
         return login_usuario(email, password)
 
+    except LimiteExcedido as e:
+        raise _demasiados_intentos(e)
+
     except ValueError as e:
         error_msg = str(e)
 
@@ -33,14 +54,18 @@ def login_controller(email: str, password: str) -> dict:
 
 
 def registrar_controller(
-    nombre_completo: str, email: str, username: str, password: str
+    nombre_completo: str, email: str, username: str, password: str, ip: str
 ) -> dict:
     """
     Controller para POST /auth/register
     """
     try:
+        verificar_limite_intentos("registro", ip=ip)
         return registrar_usuario(nombre_completo, email, username, password)
 
+    except LimiteExcedido as e:
+        raise _demasiados_intentos(e)
+
     except ValueError as e:
         error_msg = str(e)
 
@@ -55,16 +80,20 @@ def registrar_controller(
 
 
 def cambiar_contraseña_controller(
-    usuario_id: int, contraseña_actual: str, contraseña_nueva: str
+    usuario_id: int, contraseña_actual: str, contraseña_nueva: str, ip: str
 ) -> dict:
     """
     Controller para POST /auth/cambiar-contraseña
     """
     try:
+        verificar_limite_intentos("cambiar_contraseña", ip=ip, usuario=usuario_id)
         return cambiar_contraseña_usuario(
             usuario_id, contraseña_actual, contraseña_nueva
         )
 
+    except LimiteExcedido as e:
+        raise _demasiados_intentos(e)
+
     except ValueError as e:
         error_msg = str(e)
 
@@ -78,3 +107,33 @@ def cambiar_contraseña_controller(
     except Exception as e:
         print(f"Error en cambiar_contraseña_controller: {e}")
         raise HTTPException(status_code=500, detail=f"Error interno del servidor {e}")
+
+
+def renovar_tokens_controller(refresh_token: str) -> dict:
+    """
+    Controller para POST /auth/refresh
+    """
+    try:
+        return renovar_tokens(refresh_token)
+
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+    except Exception as e:
+        print(f"Error en renovar_tokens_controller: {e}")
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor {e}")
+
+
+def logout_controller(usuario: dict) -> dict:
+    """
+    Controller para POST /auth/logout
+    """
+    try:
+        return cerrar_sesion(usuario.get("sesion"))
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        print(f"Error en logout_controller: {e}")
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor {e}")
@@ -0,0 +1,16 @@
+# app/controllers/balanceControllers.py
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException
+from app.services.saldosService import saldo_a_fecha
+
+
+def obtener_balance_controller(usuario_autenticado: dict, fecha: Optional[date]) -> dict:
+    """Controller para GET /balance (saldo del usuario autenticado a una fecha)"""
+    try:
+        return saldo_a_fecha(usuario_autenticado["usuario_id"], fecha or date.today())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_balance_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
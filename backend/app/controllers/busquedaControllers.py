@@ -0,0 +1,23 @@
+# app/controllers/busquedaControllers.py
+from typing import List, Optional
+from fastapi import HTTPException
+from app.services.busquedaService import buscar_service
+
+
+def buscar_controller(
+    usuario_autenticado: dict,
+    q: str,
+    tipos: Optional[List[str]] = None,
+    pagina: int = 1,
+    limite: int = 20,
+) -> dict:
+    """Controller para GET /busqueda (solo busca en los datos del usuario)"""
+    try:
+        return buscar_service(
+            usuario_autenticado["usuario_id"], q, tipos, pagina, limite
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en buscar_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
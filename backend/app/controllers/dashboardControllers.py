@@ -0,0 +1,25 @@
+# app/controllers/dashboardControllers.py
+from typing import List
+from fastapi import HTTPException
+from app.controllers.motorInferenciaControllers import validar_permiso_usuario
+from app.services.dashboardService import obtener_dashboard_service
+
+
+def obtener_dashboard_controller(
+    usuario_id: int,
+    usuario_autenticado: dict,
+    secciones: List[str],
+    dias: int = 30,
+    limite_recientes: int = 10,
+) -> dict:
+    """Controller para el dashboard completo (o las secciones pedidas)"""
+    try:
+        validar_permiso_usuario(usuario_id, usuario_autenticado)
+        return obtener_dashboard_service(usuario_id, secciones, dias, limite_recientes)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_dashboard_controller: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
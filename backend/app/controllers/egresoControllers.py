@@ -1,19 +1,26 @@
 # app/controllers/egresoController.py
+from typing import List, Optional
 from fastapi import HTTPException
+from app.controllers.respuestas import respuesta_parcial
 from app.services.egresoService import (
     get_egresos_service,
     get_egreso_service,
     post_egreso_service,
     put_egreso_service,
     delete_egreso_service,
+    get_anomalias_service,
+    get_recurrentes_service,
 )
 from app.schemas.egreso import EgresoCreate, EgresoUpdate
 
 
-def get_egresos_controller(usuario_autenticado: dict) -> list:
+def get_egresos_controller(
+    usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> list:
     """Controller para GET /egresos"""
     try:
-        return get_egresos_service(usuario_autenticado["usuario_id"])
+        datos = get_egresos_service(usuario_autenticado["usuario_id"], campos)
+        return respuesta_parcial(datos, campos)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -21,10 +28,12 @@ def get_egresos_controller(usuario_autenticado: dict) -> list:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-def get_egreso_controller(egreso_id: int, usuario_autenticado: dict) -> dict:
+def get_egreso_controller(
+    egreso_id: int, usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> dict:
     """Controller para GET /egresos/{egreso_id}"""
     try:
-        return get_egreso_service(egreso_id)
+        return respuesta_parcial(get_egreso_service(egreso_id, campos), campos)
     except ValueError as e:
         error_msg = str(e)
         if "no encontrado" in error_msg.lower():
@@ -81,3 +90,25 @@ def delete_egreso_controller(egreso_id: int, usuario_autenticado: dict) -> dict:
     except Exception as e:
         print(f"Error en delete_egreso_controller: {e}")
         raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def get_anomalias_controller(usuario_autenticado: dict, limite: int = 20) -> list:
+    """Controller para GET /egresos/anomalias"""
+    try:
+        return get_anomalias_service(usuario_autenticado["usuario_id"], limite)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        print(f"Error en get_anomalias_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def get_recurrentes_controller(usuario_autenticado: dict) -> dict:
+    """Controller para GET /egresos/recurrentes"""
+    try:
+        return get_recurrentes_service(usuario_autenticado["usuario_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        print(f"Error en get_recurrentes_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
@@ -1,5 +1,7 @@
 # app/controllers/ingresoController.py
+from typing import List, Optional
 from fastapi import HTTPException
+from app.controllers.respuestas import respuesta_parcial
 from app.services.ingresoService import (
     get_ingresos_service,
     get_ingreso_service,
@@ -10,10 +12,13 @@ from app.services.ingresoService import (
 from app.schemas.ingreso import IngresoCreate, IngresoUpdate
 
 
-def get_ingresos_controller(usuario_autenticado: dict) -> list:
+def get_ingresos_controller(
+    usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> list:
     """Controller para GET /ingresos"""
     try:
-        return get_ingresos_service(usuario_autenticado["usuario_id"])
+        datos = get_ingresos_service(usuario_autenticado["usuario_id"], campos)
+        return respuesta_parcial(datos, campos)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -21,10 +26,12 @@ def get_ingresos_controller(usuario_autenticado: dict) -> list:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-def get_ingreso_controller(ingreso_id: int, usuario_autenticado: dict) -> dict:
+def get_ingreso_controller(
+    ingreso_id: int, usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> dict:
     """Controller para GET /ingresos/{ingreso_id}"""
     try:
-        return get_ingreso_service(ingreso_id)
+        return respuesta_parcial(get_ingreso_service(ingreso_id, campos), campos)
     except ValueError as e:
         error_msg = str(e)
         if "no encontrado" in error_msg.lower():
@@ -1,11 +1,17 @@
 # app/controllers/motorInferenciaController.py
+from typing import List
 from fastapi import HTTPException
 from app.services.motorInferenciaService import (
     evaluar_salud_financiera,
+    evaluar_salud_financiera_ventanas,
     obtener_ingresos_totales_usuario,
     obtener_egresos_totales_usuario,
     obtener_egresos_por_categoria,
+    obtener_egresos_de_categorias,
     obtener_distribucion_gastos_service,
+    CATEGORIAS_NECESIDADES,
+    CATEGORIAS_DESEOS,
+    CATEGORIAS_AHORROS,
 )
 from app.services.motorInferenciaService import (
     regla_50_30_20,
@@ -19,6 +25,8 @@ from app.services.motorInferenciaService import (
     obtener_valor_total_activos,
     obtener_flujo_mensual_activos,
 )
+from app.services.patrimonioService import obtener_historial_patrimonio
+from app.services.pronosticoService import pronosticar_egresos
 
 
 def validar_permiso_usuario(usuario_id: int, usuario_autenticado: dict):
@@ -47,6 +55,43 @@ def obtener_distribucion_gastos(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def obtener_historial_patrimonio_controller(
+    usuario_id: int, usuario_autenticado: dict, resolucion: str = "diaria", dias: int = 365
+) -> dict:
+    """Controller para la serie histórica de patrimonio neto"""
+    try:
+        validar_permiso_usuario(usuario_id, usuario_autenticado)
+        serie = obtener_historial_patrimonio(usuario_id, resolucion, dias)
+        return {"usuario_id": usuario_id, "resolucion": resolucion, "serie": serie}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_historial_patrimonio_controller: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def obtener_pronostico_egresos_controller(
+    usuario_id: int,
+    usuario_autenticado: dict,
+    meses: int = 12,
+    horizonte: int = 1,
+    nivel: int = 80,
+) -> dict:
+    """Controller para el pronóstico de egresos por categoría"""
+    try:
+        validar_permiso_usuario(usuario_id, usuario_autenticado)
+        return pronosticar_egresos(usuario_id, meses, horizonte, nivel)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en obtener_pronostico_egresos_controller: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 def evaluar_salud_financiera_controller(
     usuario_id: int, usuario_autenticado: dict, dias: int = 30
 ) -> dict:
@@ -64,6 +109,24 @@ def evaluar_salud_financiera_controller(
         )
 
 
+def evaluar_salud_financiera_ventanas_controller(
+    usuario_id: int, usuario_autenticado: dict, dias: List[int]
+) -> dict:
+    """Controller para evaluar todas las reglas en varios períodos"""
+    try:
+        validar_permiso_usuario(usuario_id, usuario_autenticado)
+        return evaluar_salud_financiera_ventanas(usuario_id, dias)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error en evaluar_salud_financiera_ventanas_controller: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error al evaluar salud financiera: {str(e)}"
+        )
+
+
 def evaluar_regla_50_30_20_controller(
     usuario_id: int, usuario_autenticado: dict, dias: int = 30
 ) -> dict:
@@ -73,26 +136,10 @@ def evaluar_regla_50_30_20_controller(
 
         ingresos = obtener_ingresos_totales_usuario(usuario_id, dias)
 
-        gastos_necesidades = (
-            obtener_egresos_por_categoria(usuario_id, "vivienda", dias)
-            + obtener_egresos_por_categoria(usuario_id, "comida", dias)
-            + obtener_egresos_por_categoria(usuario_id, "transporte", dias)
-            + obtener_egresos_por_categoria(usuario_id, "salud", dias)
-            + obtener_egresos_por_categoria(usuario_id, "servicios", dias)
-            + obtener_egresos_por_categoria(usuario_id, "deudas", dias)
-        )
-
-        gastos_deseos = (
-            obtener_egresos_por_categoria(usuario_id, "entretenimiento", dias)
-            + obtener_egresos_por_categoria(usuario_id, "restaurantes", dias)
-            + obtener_egresos_por_categoria(usuario_id, "viajes", dias)
-            + obtener_egresos_por_categoria(usuario_id, "lujos", dias)
-        )
-
-        gastos_ahorros = (
-            obtener_egresos_por_categoria(usuario_id, "ahorro", dias)
-            + obtener_egresos_por_categoria(usuario_id, "inversión", dias)
-            + obtener_egresos_por_categoria(usuario_id, "educación", dias)
+        gastos_necesidades, gastos_deseos, gastos_ahorros = obtener_egresos_de_categorias(
+            usuario_id,
+            [CATEGORIAS_NECESIDADES, CATEGORIAS_DESEOS, CATEGORIAS_AHORROS],
+            dias,
         )
 
         return regla_50_30_20(
@@ -202,9 +249,9 @@ def evaluar_lujos_vs_educacion_controller(
     try:
         validar_permiso_usuario(usuario_id, usuario_autenticado)
 
-        lujos = obtener_egresos_por_categoria(usuario_id, "lujos", dias)
-        educacion = obtener_egresos_por_categoria(usuario_id, "educación", dias)
-        activos = obtener_egresos_por_categoria(usuario_id, "inversión", dias)
+        lujos, educacion, activos = obtener_egresos_de_categorias(
+            usuario_id, [["lujos"], ["educación"], ["inversión"]], dias
+        )
 
         return regla_lujos_vs_educacion(lujos, educacion, activos)
 
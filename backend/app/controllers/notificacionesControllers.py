@@ -0,0 +1,115 @@
+# app/controllers/notificacionesControllers.py
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.controllers.motorInferenciaControllers import validar_permiso_usuario
+from app.services.notificacionesService import (
+    suscribir,
+    desuscribir,
+    obtener_resumen,
+    LimiteStreamsExcedido,
+    ESPERA_AGRUPAR_SEGUNDOS,
+)
+from app.services.revocacionService import esta_revocada
+
+# Cada cuánto se manda un comentario para que proxies no corten la conexión
+LATIDO_SEGUNDOS = float(os.getenv("SSE_LATIDO_SEGUNDOS", "15"))
+
+
+def _mensaje_sse(evento: str, datos: dict) -> str:
+    return f"event: {evento}\ndata: {json.dumps(jsonable_encoder(datos))}\n\n"
+
+
+async def _token_vigente(sesion: Optional[str], expira: Optional[float]) -> bool:
+    """El token con el que se abrió el stream no venció y su sesión no se cerró"""
+    if expira is not None and time.time() >= expira:
+        return False
+    # Casi siempre en memoria, pero puede confirmar en la BD
+    return not await run_in_threadpool(esta_revocada, sesion)
+
+
+async def _eventos(
+    suscripcion,
+    usuario_id: int,
+    dias: int,
+    modo: str,
+    sesion: Optional[str],
+    expira: Optional[float],
+):
+    # El token se valida al abrir el stream y después en cada latido o
+    # evento: si venció o se cerró la sesión (logout, cambio de contraseña)
+    # el stream termina, y el cliente vuelve a abrirlo con un token nuevo
+    try:
+        # Al conectarse el cliente recibe el estado actual
+        if modo == "resumen":
+            yield _mensaje_sse("resumen", await obtener_resumen(usuario_id, dias))
+
+        while True:
+            espera = LATIDO_SEGUNDOS
+            if expira is not None:
+                espera = max(0.0, min(espera, expira - time.time()))
+            try:
+                await asyncio.wait_for(suscripcion.cola.get(), espera)
+            except asyncio.TimeoutError:
+                if not await _token_vigente(sesion, expira):
+                    return
+                yield ": latido\n\n"
+                continue
+
+            # Se esperan unos instantes para juntar cambios seguidos
+            await asyncio.sleep(ESPERA_AGRUPAR_SEGUNDOS)
+            if not suscripcion.cola.empty():
+                suscripcion.cola.get_nowait()
+            if not await _token_vigente(sesion, expira):
+                return
+
+            entidades = suscripcion.tomar_entidades()
+            if modo == "resumen":
+                resumen = await obtener_resumen(usuario_id, dias)
+                yield _mensaje_sse("resumen", resumen)
+            else:
+                yield _mensaje_sse("cambio", {"entidades": entidades})
+    finally:
+        desuscribir(suscripcion)
+
+
+async def stream_analisis_controller(
+    usuario_id: int, usuario_autenticado: dict, dias: int = 30, modo: str = "resumen"
+) -> StreamingResponse:
+    """
+    Controller para GET /analisis/stream/{usuario_id}
+
+    Abre un stream SSE que manda el análisis actualizado (modo "resumen") o
+    solo un aviso de qué cambió (modo "cambio") cada vez que el usuario
+    modifica sus ingresos, egresos, activos o pasivos. Se cierra cuando
+    vence el token o se cierra la sesión.
+    """
+    try:
+        validar_permiso_usuario(usuario_id, usuario_autenticado)
+        suscripcion = suscribir(usuario_id)
+    except HTTPException:
+        raise
+    except LimiteStreamsExcedido as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        print(f"Error en stream_analisis_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+    return StreamingResponse(
+        _eventos(
+            suscripcion,
+            usuario_id,
+            dias,
+            modo,
+            usuario_autenticado.get("sesion"),
+            usuario_autenticado.get("expira"),
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,8 @@
 # app/controllers/pasivoController.py
 # Capa de control que maneja las peticiones HTTP y coordina con los servicios
+from typing import List, Optional
 from fastapi import HTTPException
+from app.controllers.respuestas import respuesta_parcial
 from app.services.pasivoService import (
     get_pasivos_service,
     get_pasivo_service,
@@ -8,10 +10,14 @@ from app.services.pasivoService import (
     put_pasivo_service,
     delete_pasivo_service,
 )
+from app.services.amortizacionService import obtener_amortizacion_service
+from app.services.estrategiaPagoService import comparar_estrategias_service
 from app.schemas.pasivo import PasivoCreate, PasivoUpdate
 
 
-def get_pasivos_controller(usuario_autenticado: dict) -> list:
+def get_pasivos_controller(
+    usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> list:
     """
     Controller para GET /pasivos
     Obtiene todos los pasivos del usuario autenticado
@@ -21,7 +27,7 @@ def get_pasivos_controller(usuario_autenticado: dict) -> list:
          # Extraer el ID del usuario desde el diccionario de autenticación (viene del JWT)
         usuario_id = usuario_autenticado["usuario_id"]
 
-        return get_pasivos_service(usuario_id)
+        return respuesta_parcial(get_pasivos_service(usuario_id, campos), campos)
     except ValueError as e:
         
         raise HTTPException(status_code=500, detail=str(e))
@@ -30,14 +36,16 @@ def get_pasivos_controller(usuario_autenticado: dict) -> list:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-def get_pasivo_controller(pasivo_id: int, usuario_autenticado: dict) -> dict:
+def get_pasivo_controller(
+    pasivo_id: int, usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> dict:
     """
     Controller para GET /pasivos/{pasivo_id}
     Obtiene un pasivo específico por su ID
 
     """
     try:
-        return get_pasivo_service(pasivo_id)
+        return respuesta_parcial(get_pasivo_service(pasivo_id, campos), campos)
     except ValueError as e:
         error_msg = str(e)
         if "no encontrado" in error_msg.lower():
@@ -123,4 +131,50 @@ def delete_pasivo_controller(pasivo_id: int, usuario_autenticado: dict) -> dict:
         raise HTTPException(status_code=400, detail=error_msg)
     except Exception as e:
         print(f"Error en delete_pasivo_controller: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def get_amortizacion_controller(
+    usuario_autenticado: dict, meses_max: int = 360, detalle: bool = True
+) -> dict:
+    """
+    Controller para GET /pasivos/amortizacion
+    Devuelve el cronograma de amortización de todos los pasivos del usuario
+
+    """
+    try:
+        usuario_id = usuario_autenticado["usuario_id"]
+
+        return obtener_amortizacion_service(usuario_id, meses_max, detalle)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        print(f"Error en get_amortizacion_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def get_estrategias_controller(
+    usuario_autenticado: dict,
+    presupuesto_mensual: float,
+    orden: Optional[List[int]] = None,
+    meses_max: int = 360,
+) -> dict:
+    """
+    Controller para GET /pasivos/estrategias
+    Compara las estrategias de pago (avalancha, bola de nieve y personalizada)
+
+    """
+    try:
+        usuario_id = usuario_autenticado["usuario_id"]
+
+        return comparar_estrategias_service(
+            usuario_id, presupuesto_mensual, orden, meses_max
+        )
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrado" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    except Exception as e:
+        print(f"Error en get_estrategias_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
@@ -0,0 +1,75 @@
+# app/controllers/presupuestoControllers.py
+from fastapi import HTTPException
+from app.services.presupuestoService import (
+    get_presupuestos_service,
+    post_presupuesto_service,
+    put_presupuesto_service,
+    delete_presupuesto_service,
+)
+from app.schemas.presupuesto import PresupuestoCreate, PresupuestoUpdate
+
+
+def get_presupuestos_controller(usuario_autenticado: dict) -> list:
+    """Controller para GET /presupuestos"""
+    try:
+        return get_presupuestos_service(usuario_autenticado["usuario_id"])
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrado" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    except Exception as e:
+        print(f"Error en get_presupuestos_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def post_presupuesto_controller(
+    presupuesto_data: PresupuestoCreate, usuario_autenticado: dict
+) -> dict:
+    """Controller para POST /presupuestos"""
+    try:
+        return post_presupuesto_service(presupuesto_data, usuario_autenticado["usuario_id"])
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrado" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        if "ya hay" in error_msg.lower():
+            raise HTTPException(status_code=409, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    except Exception as e:
+        print(f"Error en post_presupuesto_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def put_presupuesto_controller(
+    presupuesto_id: int, presupuesto_data: PresupuestoUpdate, usuario_autenticado: dict
+) -> dict:
+    """Controller para PUT /presupuestos/{presupuesto_id}"""
+    try:
+        return put_presupuesto_service(
+            presupuesto_id, presupuesto_data, usuario_autenticado["usuario_id"]
+        )
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrado" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        if "ya hay" in error_msg.lower():
+            raise HTTPException(status_code=409, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    except Exception as e:
+        print(f"Error en put_presupuesto_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def delete_presupuesto_controller(presupuesto_id: int, usuario_autenticado: dict) -> dict:
+    """Controller para DELETE /presupuestos/{presupuesto_id}"""
+    try:
+        return delete_presupuesto_service(presupuesto_id, usuario_autenticado["usuario_id"])
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrado" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    except Exception as e:
+        print(f"Error en delete_presupuesto_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
@@ -0,0 +1,27 @@
+# app/controllers/respuestas.py
+# Respuestas HTTP compartidas por varios controllers
+import json
+from typing import List, Optional
+from fastapi.responses import Response
+
+
+def _a_json(valor):
+    # Fechas (date/datetime) en formato ISO, igual que FastAPI
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def respuesta_parcial(datos, campos: Optional[List[str]]):
+    """
+    Si se pidieron campos parciales (?fields=) se devuelve la respuesta ya
+    serializada: el response_model del endpoint exige todos los campos y
+    además así se evita validar cada fila con Pydantic (con listas grandes
+    es lo que más tarda).
+    """
+    if campos is None:
+        return datos
+    return Response(
+        json.dumps(datos, default=_a_json, ensure_ascii=False),
+        media_type="application/json",
+    )
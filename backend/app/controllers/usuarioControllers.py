@@ -1,14 +1,19 @@
 # app/controllers/usuarioController.py
+from typing import List, Optional
 from fastapi import HTTPException
+from app.controllers.respuestas import respuesta_parcial
 from app.services.usuarioService import (
     get_usuarios,
     get_usuario,
     put_usuario,
     delete_usuario,
+    get_eliminacion_usuario,
 )
 
 
-def get_usuarios_controller(usuario_autenticado: dict) -> list:
+def get_usuarios_controller(
+    usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> list:
     """
     Controller para GET /usuarios
 
@@ -20,7 +25,7 @@ def get_usuarios_controller(usuario_autenticado: dict) -> list:
     try:
         print(f"Usuario autenticado: {usuario_autenticado['email']}")
 
-        return get_usuarios()
+        return respuesta_parcial(get_usuarios(campos), campos)
 
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -29,7 +34,9 @@ def get_usuarios_controller(usuario_autenticado: dict) -> list:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-def get_usuario_controller(usuario_id: int, usuario_autenticado: dict) -> dict:
+def get_usuario_controller(
+    usuario_id: int, usuario_autenticado: dict, campos: Optional[List[str]] = None
+) -> dict:
     """
     Controller para GET /usuarios/{usuario_id}
 
@@ -40,7 +47,7 @@ def get_usuario_controller(usuario_id: int, usuario_autenticado: dict) -> dict:
         # Ejemplo: Solo dejar que los usuarios vean su propio perfil
         # if usuario_autenticado["usuario_id"] != usuario_id:
         #     raise HTTPException(status_code=403, detail="No tienes permiso para ver este usuario")
-        return get_usuario(usuario_id)
+        return respuesta_parcial(get_usuario(usuario_id, campos), campos)
 
     except ValueError as e:
         error_msg = str(e)
@@ -115,6 +122,37 @@ def delete_usuario_controller(usuario_id: int, usuario_autenticado: dict) -> dic
             raise HTTPException(status_code=404, detail=error_msg)
         raise HTTPException(status_code=400, detail=error_msg)
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error en delete_usuario_controller: {e}")
         raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+def get_eliminacion_usuario_controller(
+    usuario_id: int, usuario_autenticado: dict
+) -> dict:
+    """
+    Controller para GET /usuarios/{usuario_id}/eliminacion
+
+    Seguridad: Un usuario solo puede ver la baja de su propia cuenta
+    """
+    try:
+        if usuario_autenticado["usuario_id"] != usuario_id:
+            raise HTTPException(
+                status_code=403, detail="No tienes permiso para ver este usuario"
+            )
+
+        return get_eliminacion_usuario(usuario_id)
+
+    except ValueError as e:
+        error_msg = str(e)
+        if "no encontrad" in error_msg.lower():
+            raise HTTPException(status_code=404, detail=error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error en get_eliminacion_usuario_controller: {e}")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
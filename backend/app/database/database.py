@@ -1,13 +1,127 @@
 # app/database/database.py
-from pony.orm import Database
+from contextvars import ContextVar
+from pony.orm import Database, db_session
+from pony.orm.dbproviders.postgres import PGPool
 from dotenv import load_dotenv
 import os
+import threading
+import time
+from app.database.registroConsultas import instalar_registro, sin_registro
+from app.database.sesionRequest import instalar_solo_lectura
 
 load_dotenv()
 
 # Crear instancia de la base de datos
 db = Database()
 
+# Réplica de solo lectura (opcional). Si no se define, todo va a la primaria
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+# Segundos en los que las lecturas de un usuario siguen yendo a la primaria
+# después de que escribió algo (para que vea sus propios cambios aunque la
+# réplica tenga retraso)
+VENTANA_LECTURA_PROPIA = float(os.getenv("VENTANA_LECTURA_PROPIA_SEGUNDOS", "5"))
+
+# Destino de las consultas del request actual: "primaria" o "replica"
+_destino_consultas = ContextVar("destino_consultas", default="primaria")
+
+# usuario_id -> momento (time.monotonic) de su última escritura en este
+# proceso. Las de todos los procesos están en la tabla escrituras_recientes
+# (sql/012_escrituras_recientes.sql); esto solo evita consultarla.
+_ultimas_escrituras = {}
+_lock_escrituras = threading.Lock()
+
+
+class PoolConReplica(PGPool):
+    """
+    Pool de conexiones de Pony que enruta a la primaria o a la réplica.
+
+    Pony guarda una conexión por hilo. Acá se guardan dos (una por destino)
+    y en cada db_session se elige cuál usar según el destino del request.
+    """
+
+    def __init__(self, dbapi_module, *args, dsn_replica=None, **kwargs):
+        super().__init__(dbapi_module, *args, **kwargs)
+        self.dsn_replica = dsn_replica
+        self.conexiones = {}
+        self.destino = "primaria"
+
+    def connect(self):
+        self.destino = _destino_consultas.get()
+        self.con = self.conexiones.get(self.destino)
+        con, es_nueva = super().connect()
+        self.conexiones[self.destino] = con
+        return con, es_nueva
+
+    def _connect(self):
+        if self.destino != "replica":
+            return super()._connect()
+
+        kwargs = dict(self.kwargs, dsn=self.dsn_replica)
+        self.con = self.dbapi_module.connect(*self.args, **kwargs)
+        self.con.set_client_encoding("UTF8")
+
+    def drop(self, con):
+        self.conexiones = {k: c for k, c in self.conexiones.items() if c is not con}
+        super().drop(con)
+
+    def disconnect(self):
+        for con in self.conexiones.values():
+            con.close()
+        self.conexiones = {}
+        self.con = None
+
+
+def usar_replica():
+    """Envía las consultas del request actual a la réplica (si está configurada)"""
+    if DATABASE_REPLICA_URL:
+        _destino_consultas.set("replica")
+
+
+def hay_replica() -> bool:
+    return bool(DATABASE_REPLICA_URL)
+
+
+def registrar_escritura(usuario_id: int):
+    """
+    Marca que el usuario escribió, para leer desde la primaria un rato.
+    Se guarda en la primaria para que lo vean todos los procesos.
+    """
+    with _lock_escrituras:
+        _ultimas_escrituras[usuario_id] = time.monotonic()
+
+    with sin_registro(), db_session:
+        db.execute(
+            """
+            INSERT INTO escrituras_recientes (fk_usuarios, momento)
+            VALUES ($usuario_id, now())
+            ON CONFLICT (fk_usuarios) DO UPDATE SET momento = EXCLUDED.momento
+            """
+        )
+
+
+def escribio_recientemente(usuario_id: int) -> bool:
+    """Indica si el usuario está dentro de la ventana de lectura propia"""
+    with _lock_escrituras:
+        ultima = _ultimas_escrituras.get(usuario_id)
+        if ultima is not None:
+            if time.monotonic() - ultima <= VENTANA_LECTURA_PROPIA:
+                return True
+            # Ya venció, se limpia para que el diccionario no crezca
+            del _ultimas_escrituras[usuario_id]
+
+    # Pudo escribir a través de otro proceso
+    ventana = VENTANA_LECTURA_PROPIA
+    with sin_registro(), db_session:
+        return bool(
+            db.select(
+                """SELECT 1 FROM escrituras_recientes
+                WHERE fk_usuarios = $usuario_id
+                  AND momento > now() - $ventana * interval '1 second'
+                """
+            )
+        )
+
 
 def init_database():
     """
@@ -22,6 +136,23 @@ def init_database():
         # Generar mapeo (sin crear tablas porque ya existen)
         db.generate_mapping(create_tables=False)
 
+        # Anotar cada consulta SQL en el registro del request
+        instalar_registro(db)
+
+        # Conexiones de solo lectura en las sesiones de los GET
+        instalar_solo_lectura(db)
+
+        # Si hay réplica, reemplazar el pool para poder enrutar las lecturas
+        if DATABASE_REPLICA_URL:
+            pool_anterior = db.provider.pool
+            db.provider.pool = PoolConReplica(
+                pool_anterior.dbapi_module,
+                dsn=DATABASE_URL,
+                dsn_replica=DATABASE_REPLICA_URL,
+            )
+            pool_anterior.disconnect()
+            print("✅ Réplica de lectura configurada")
+
         print("✅ Base de datos conectada correctamente")
 
     except Exception as e:
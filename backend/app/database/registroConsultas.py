@@ -0,0 +1,194 @@
+# app/database/registroConsultas.py
+# Registro de las consultas SQL que ejecuta Pony.
+#
+# Todo el SQL de Pony (consultas del ORM, db.select, db.execute) pasa por
+# db.provider.execute. Se envuelve esa función para anotar cada sentencia con
+# su duración en el registro del request actual (ver
+# app/middleware/consultasSQL.py), y así:
+# - saber cuántas consultas hace cada request (header X-SQL-Consultas)
+# - detectar N+1: la misma consulta (con distintos parámetros) repetida
+#   muchas veces en un request, típico de `p.fk_usuarios.id` dentro de un
+#   for, que hace un SELECT por fila
+# - avisar de las consultas lentas
+# - comprobar en pruebas que un endpoint no pase de N consultas
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+HABILITADO = os.getenv("REGISTRO_SQL", "1") == "1"
+# Una consulta que tarda más que esto se informa siempre
+LENTA_MS = float(os.getenv("SQL_LENTA_MS", "200"))
+# Misma consulta repetida esta cantidad de veces en un request = N+1
+UMBRAL_N_MAS_1 = int(os.getenv("SQL_N_MAS_1_UMBRAL", "5"))
+# Con 1, pasarse del presupuesto de consultas corta el request con un error
+# (pensado para pruebas); si no, solo se avisa
+PRESUPUESTO_ESTRICTO = os.getenv("SQL_PRESUPUESTO_ESTRICTO", "0") == "1"
+
+# Registros activos (el del request y los de contar_consultas() anidados)
+_registros: ContextVar[Tuple["RegistroConsultas", ...]] = ContextVar(
+    "registros_consultas", default=()
+)
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Se hicieron más consultas que las permitidas"""
+
+
+@lru_cache(maxsize=4096)
+def forma_consulta(sql: str) -> str:
+    """
+    La consulta sin sus valores, para reconocer la "misma" consulta.
+    Pony ya manda los valores como parámetros, pero el SQL escrito a mano
+    puede traer números o textos dentro.
+    """
+    forma = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    forma = re.sub(r"\b\d+(?:\.\d+)?\b", "?", forma)
+    return " ".join(forma.split())
+
+
+class RegistroConsultas:
+    """Consultas de un request (o de un bloque contar_consultas)"""
+
+    def __init__(self, request_id: str = "-", limite: Optional[int] = None):
+        self.request_id = request_id
+        self.limite = limite
+        self.consultas: List[Tuple[str, float]] = []  # (sql, segundos)
+        self.por_forma: Dict[str, int] = {}
+        self.n_mas_1: List[str] = []  # Formas repetidas (en orden de aparición)
+        self.segundos = 0.0
+
+    def agregar(self, sql: str, segundos: float):
+        self.consultas.append((sql, segundos))
+        self.segundos += segundos
+
+        forma = forma_consulta(sql)
+        veces = self.por_forma.get(forma, 0) + 1
+        self.por_forma[forma] = veces
+        if veces == UMBRAL_N_MAS_1:
+            self.n_mas_1.append(forma)
+            print(
+                f"⚠️  Posible N+1 en request {self.request_id}: "
+                f"{veces} veces {_recortar(forma)}"
+            )
+
+        if self.limite is not None and len(self.consultas) == self.limite + 1:
+            mensaje = (
+                f"Request {self.request_id}: más de {self.limite} consultas SQL\n"
+                + self.detalle()
+            )
+            if PRESUPUESTO_ESTRICTO:
+                raise PresupuestoConsultasExcedido(mensaje)
+            print(f"⚠️  {mensaje}")
+
+    def __len__(self) -> int:
+        return len(self.consultas)
+
+    def detalle(self) -> str:
+        return "\n".join(
+            f"  {i}. {segundos * 1000:7.2f} ms  {_recortar(forma_consulta(sql))}"
+            for i, (sql, segundos) in enumerate(self.consultas, 1)
+        )
+
+
+def _recortar(sql: str, largo: int = 200) -> str:
+    return sql if len(sql) <= largo else sql[:largo] + "..."
+
+
+def registrar_consulta(sql: str, segundos: float):
+    for registro in _registros.get():
+        registro.agregar(sql, segundos)
+
+    if segundos * 1000 >= LENTA_MS:
+        registros = _registros.get()
+        request_id = registros[0].request_id if registros else "-"
+        print(
+            f"🐢 Consulta lenta ({segundos * 1000:.0f} ms) en request {request_id}: "
+            f"{_recortar(forma_consulta(sql))}"
+        )
+
+
+def instalar_registro(db):
+    """Envuelve db.provider.execute (se llama después de db.bind)"""
+    if not HABILITADO:
+        return
+    provider = db.provider
+    if getattr(provider.execute, "registra_consultas", False):
+        return
+    ejecutar = provider.execute
+
+    def execute(cursor, sql, arguments=None, returning_id=False):
+        inicio = time.perf_counter()
+        try:
+            return ejecutar(cursor, sql, arguments, returning_id)
+        finally:
+            registrar_consulta(sql, time.perf_counter() - inicio)
+
+    execute.registra_consultas = True
+    provider.execute = execute
+
+
+def activar_registro(registro: RegistroConsultas):
+    """Empieza a anotar las consultas en `registro`. Devuelve el token para desactivarlo."""
+    return _registros.set(_registros.get() + (registro,))
+
+
+def desactivar_registro(token):
+    _registros.reset(token)
+
+
+def registro_del_request() -> Optional[RegistroConsultas]:
+    registros = _registros.get()
+    return registros[0] if registros else None
+
+
+@contextmanager
+def sin_registro():
+    """
+    Las consultas del bloque no se anotan en el registro del request (ni
+    cuentan para su presupuesto): para las que hace la infraestructura y no
+    el endpoint, como la del enrutamiento a la réplica.
+    """
+    token = _registros.set(())
+    try:
+        yield
+    finally:
+        _registros.reset(token)
+
+
+@contextmanager
+def contar_consultas():
+    """
+    Cuenta las consultas hechas dentro del bloque (también dentro de un request).
+
+    with contar_consultas() as registro:
+        get_egresos_service(usuario_id)
+    print(len(registro), registro.n_mas_1)
+    """
+    registro = RegistroConsultas(request_id="contar_consultas")
+    token = activar_registro(registro)
+    try:
+        yield registro
+    finally:
+        desactivar_registro(token)
+
+
+@contextmanager
+def maximo_consultas(limite: int):
+    """
+    Falla (PresupuestoConsultasExcedido) si el bloque hace más de `limite`
+    consultas. Para pruebas:
+
+    with maximo_consultas(3):
+        client.get("/dashboard/1", headers=...)
+    """
+    with contar_consultas() as registro:
+        yield registro
+    if len(registro) > limite:
+        raise PresupuestoConsultasExcedido(
+            f"Se esperaban como mucho {limite} consultas y hubo {len(registro)}:\n"
+            + registro.detalle()
+        )
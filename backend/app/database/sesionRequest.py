@@ -0,0 +1,98 @@
+# app/database/sesionRequest.py
+# Una sola db_session de Pony por request.
+#
+# Los services están decorados con @db_session y un endpoint suele llamar a
+# varios (evaluar_salud_financiera llama a cada regla, y cada regla a sus
+# consultas). Sin una sesión del request cada llamada abre su propia sesión:
+# su propio caché de entidades (Usuario.get otra vez, las mismas consultas
+# otra vez) y al cerrarla Pony devuelve la conexión al pool (ROLLBACK +
+# DISCARD ALL).
+#
+# Con la sesión del request, los @db_session de los services quedan anidados
+# (Pony los ignora): todos comparten el mapa de identidad y el caché de
+# consultas, y la conexión se devuelve una sola vez.
+#
+# - GET/HEAD/OPTIONS: solo lectura, decidido por el método HTTP. La conexión
+#   se pone en modo solo lectura (readonly de psycopg2: PostgreSQL rechaza
+#   cualquier escritura, también la de un commit() explícito) y al terminar
+#   se hace rollback, así lo pendiente en el caché de Pony se descarta.
+# - POST/PUT/DELETE: commit al terminar el endpoint; si termina con una
+#   excepción (también las HTTPException de los controllers) rollback. Los
+#   commit() explícitos de los services siguen funcionando igual.
+#
+# Las sesiones de Pony son por hilo y los endpoints sync corren en el
+# threadpool, así que la sesión no la puede abrir un middleware ASGI: se abre
+# alrededor de la función de la ruta (ver RutaMedida en
+# app/middleware/serverTiming.py). Los endpoints async y los generadores
+# (streaming) quedan como estaban.
+import functools
+import inspect
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pony.orm import db_session, rollback
+
+HABILITADO = os.getenv("SESION_POR_REQUEST", "1") == "1"
+
+METODOS_LECTURA = {"GET", "HEAD", "OPTIONS"}
+
+
+# Si la sesión del request actual es de solo lectura
+_solo_lectura = ContextVar("sesion_solo_lectura", default=False)
+
+
+@contextmanager
+def sesion_request(solo_lectura: bool):
+    token = _solo_lectura.set(solo_lectura)
+    try:
+        with db_session:
+            yield
+            if solo_lectura:
+                # Sin esto, al salir de la db_session Pony intentaría
+                # guardar lo pendiente (y fallaría por la conexión)
+                rollback()
+    finally:
+        _solo_lectura.reset(token)
+
+
+def instalar_solo_lectura(db):
+    """
+    Envuelve db.provider.set_transaction_mode (se llama después de db.bind).
+    Pony lo llama al tomar la conexión para una sesión y al pasar a modo
+    transacción, antes de ejecutar nada: ahí se le fija readonly según la
+    sesión del request (y se saca en las demás, porque la conexión se reusa).
+    """
+    provider = db.provider
+    if getattr(provider.set_transaction_mode, "solo_lectura", False):
+        return
+    original = provider.set_transaction_mode
+
+    def set_transaction_mode(connection, cache):
+        readonly = True if _solo_lectura.get() else None
+        if connection.readonly != readonly:
+            connection.readonly = readonly
+        return original(connection, cache)
+
+    set_transaction_mode.solo_lectura = True
+    provider.set_transaction_mode = set_transaction_mode
+
+
+def en_sesion_request(endpoint, metodos):
+    """Envuelve un endpoint sync para que corra en una sesión del request"""
+    if (
+        not HABILITADO
+        or inspect.iscoroutinefunction(endpoint)
+        or inspect.isasyncgenfunction(endpoint)
+        or inspect.isgeneratorfunction(endpoint)
+    ):
+        return endpoint
+
+    metodos = set(metodos or ())
+    solo_lectura = bool(metodos) and metodos <= METODOS_LECTURA
+
+    @functools.wraps(endpoint)
+    def envoltura(*args, **kwargs):
+        with sesion_request(solo_lectura):
+            return endpoint(*args, **kwargs)
+
+    return envoltura
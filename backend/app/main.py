@@ -1,14 +1,15 @@
 # app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from app.middleware.consultasSQL import RegistroConsultasMiddleware
+from app.middleware.serverTiming import ServerTimingMiddleware
+from app.middleware.perfilado import PerfiladoMiddleware
+from app.middleware.memoria import MemoriaRequestMiddleware
 
 # Importar modelo ANTES de init_database
-from app.models.usuario import Usuario
-from app.models.ingreso import Ingreso
-from app.models.egreso import Egreso
-from app.models.pasivo import Pasivo
-from app.models.activo import Activo
+from app import models  # noqa: F401 (registra todas las entidades)
 
 # Importar e inicializar base de datos
 from app.database.database import init_database
@@ -24,13 +25,58 @@ from app.routes import (
     pasivoRoutes,
     activoRoutes,
     motorInferenciaRoutes,
+    notificacionesRoutes,
+    dashboardRoutes,
+    busquedaRoutes,
+    adminRoutes,
+    balanceRoutes,
+    presupuestoRoutes,
 )
 
+# Importar tareas en segundo plano
+from app.tareas.snapshotPatrimonio import (
+    iniciar_snapshot_diario,
+    detener_snapshot_diario,
+)
+from app.tareas.despachadorOutbox import iniciar_despachador, detener_despachador
+from app.tareas.eliminacionUsuarios import (
+    iniciar_eliminacion_usuarios,
+    detener_eliminacion_usuarios,
+)
+from app.tareas.perfiladorContinuo import (
+    iniciar_perfilador_continuo,
+    detener_perfilador_continuo,
+)
+from app.tareas.sincronizarRevocaciones import (
+    iniciar_sincronizacion_revocaciones,
+    detener_sincronizacion_revocaciones,
+)
+from app.services.librosService import aplicar_tipos_cambio
+
+
+# Tareas que arrancan y se detienen junto con la API
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    aplicar_tipos_cambio()
+    iniciar_sincronizacion_revocaciones()
+    iniciar_snapshot_diario()
+    iniciar_despachador()
+    iniciar_eliminacion_usuarios()
+    iniciar_perfilador_continuo()
+    yield
+    detener_perfilador_continuo()
+    detener_eliminacion_usuarios()
+    detener_despachador()
+    detener_sincronizacion_revocaciones()
+    detener_snapshot_diario()
+
+
 # Crear app
 app = FastAPI(
     title="Sistema Experto Financiero - API",
     version="1.0.0",
     description="API para gestión de usuarios y egresos con Pony ORM",
+    lifespan=lifespan,
 )
 
 # Configurar CORS (opcional)
@@ -40,8 +86,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Request-ID",
+        "X-SQL-Consultas",
+        "X-SQL-Ms",
+        "Server-Timing",
+        "X-Perfil",
+        "X-Memoria-Pico-KB",
+    ],
 )
 
+# Perfil de CPU a pedido (headers X-Perfilar + X-Admin-Token). Adentro de
+# todo: usa el ID del request del registro de consultas
+app.add_middleware(PerfiladoMiddleware)
+# Pico de memoria de una muestra de requests (solo con tracemalloc activo)
+app.add_middleware(MemoriaRequestMiddleware)
+# Desglose del tiempo por etapa (header Server-Timing). Se agrega antes que
+# el registro de consultas para quedar adentro y poder leerlo
+app.add_middleware(ServerTimingMiddleware)
+# Registro de consultas SQL por request (N+1, consultas lentas, presupuesto)
+app.add_middleware(RegistroConsultasMiddleware)
+
 
 # Ruta raíz
 @app.get("/")
@@ -61,6 +126,12 @@ app.include_router(egresoRoutes.router)
 app.include_router(pasivoRoutes.router)
 app.include_router(activoRoutes.router)
 app.include_router(motorInferenciaRoutes.router)
+app.include_router(notificacionesRoutes.router)
+app.include_router(dashboardRoutes.router)
+app.include_router(busquedaRoutes.router)
+app.include_router(balanceRoutes.router)
+app.include_router(presupuestoRoutes.router)
+app.include_router(adminRoutes.router)
 
 
 # Configurar OpenAPI para mostrar seguridad Bearer
@@ -90,6 +161,7 @@ def custom_openapi():
         if (
             "/auth/login" not in path
             and "/auth/register" not in path
+            and "/auth/refresh" not in path
             and "/auth/login-form" not in path
         ):
             for operation in path_item.values():
@@ -0,0 +1,64 @@
+# app/middleware/consultasSQL.py
+# Middleware que abre un registro de consultas SQL por request
+# (ver app/database/registroConsultas.py).
+#
+# - Le asigna un ID al request (o usa el X-Request-ID que mande el cliente)
+#   y lo devuelve en el header X-Request-ID, para encontrarlo en los logs.
+# - Devuelve X-SQL-Consultas y X-SQL-Ms: cuántas consultas hizo y cuánto
+#   tardaron en total. Sirve para pruebas del tipo "este endpoint hace como
+#   mucho 3 consultas" sin tocar el código del endpoint.
+#
+# Es un middleware ASGI "puro" (no BaseHTTPMiddleware) para que el registro
+# quede en el contexto que heredan las dependencias y el endpoint.
+import re
+import uuid
+from contextvars import ContextVar
+from starlette.datastructures import MutableHeaders
+from app.database.registroConsultas import (
+    RegistroConsultas,
+    activar_registro,
+    desactivar_registro,
+)
+
+# ID del request actual ("-" fuera de un request)
+request_id_actual: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Un X-Request-ID del cliente se acepta solo si es "razonable"
+_REQUEST_ID_VALIDO = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _request_id(scope) -> str:
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == b"x-request-id":
+            valor = valor.decode("latin-1")
+            if _REQUEST_ID_VALIDO.match(valor):
+                return valor
+    return uuid.uuid4().hex[:16]
+
+
+class RegistroConsultasMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = _request_id(scope)
+        registro = RegistroConsultas(request_id)
+        token_id = request_id_actual.set(request_id)
+        token_registro = activar_registro(registro)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                headers = MutableHeaders(scope=mensaje)
+                headers["X-Request-ID"] = request_id
+                headers["X-SQL-Consultas"] = str(len(registro))
+                headers["X-SQL-Ms"] = f"{registro.segundos * 1000:.1f}"
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            desactivar_registro(token_registro)
+            request_id_actual.reset(token_id)
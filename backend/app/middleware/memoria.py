@@ -0,0 +1,55 @@
+# app/middleware/memoria.py
+# Pico de memoria de una muestra de los requests (MEMORIA_MUESTREO), solo
+# mientras tracemalloc está prendido (ver app/services/memoriaService.py).
+# Los requests medidos devuelven el header X-Memoria-Pico-KB y quedan en
+# /admin/memoria/requests.
+#
+# Con tracemalloc apagado cada request solo paga un is_tracing().
+import os
+import random
+import tracemalloc
+from starlette.datastructures import MutableHeaders
+from app.services.memoriaService import empezar_medicion, terminar_medicion
+
+MUESTREO = float(os.getenv("MEMORIA_MUESTREO", "0.05"))
+
+
+class MemoriaRequestMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not tracemalloc.is_tracing()
+            or random.random() >= MUESTREO
+            # Los de diagnóstico (snapshots, comparaciones) no interesan
+            or scope["path"].startswith("/admin")
+        ):
+            return await self.app(scope, receive, send)
+
+        inicial = empezar_medicion()
+        if inicial is None:
+            return await self.app(scope, receive, send)
+
+        terminado = False
+
+        def terminar() -> int:
+            nonlocal terminado
+            terminado = True
+            # scope["route"] lo completa el router de Starlette
+            ruta = getattr(scope.get("route"), "path", scope.get("path", ""))
+            return terminar_medicion(inicial, scope.get("method", ""), ruta)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start" and not terminado:
+                pico = terminar()
+                headers = MutableHeaders(scope=mensaje)
+                headers["X-Memoria-Pico-KB"] = f"{pico / 1024:.1f}"
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            if not terminado:
+                terminar()
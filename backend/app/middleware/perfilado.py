@@ -0,0 +1,156 @@
+# app/middleware/perfilado.py
+# Perfil de CPU de un request puntual, a pedido:
+#
+#   curl -H "X-Admin-Token: ..." -H "X-Perfilar: pstats" .../analisis/salud-financiera
+#   -> X-Perfil: /admin/perfiles/<request_id>
+#
+# X-Perfilar puede ser "pstats" (cProfile, el valor por defecto) o "colapsado"
+# (muestras de la pila, para flamegraph/speedscope). Ver
+# app/services/perfilesService.py.
+#
+# Solo se perfila la función de la ruta (controller + services), que es lo
+# que mide la etapa "endpoint" de Server-Timing: la envoltura de
+# app/middleware/serverTiming.py llama a perfil_actual() y, si hay perfil,
+# ejecuta el endpoint a través de él.
+#
+# Un request sin el header solo paga buscarlo entre los headers: no se
+# instala ningún profiler ni hook.
+import cProfile
+import marshal
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from app.middleware.consultasSQL import request_id_actual
+from app.services.adminService import es_token_admin
+from app.services.perfilesService import FORMATOS, MuestreadorHilo, guardar_perfil, texto_colapsado
+
+_perfil: ContextVar[Optional["Perfil"]] = ContextVar("perfil_request", default=None)
+
+
+def perfil_actual() -> Optional["Perfil"]:
+    return _perfil.get()
+
+
+class Perfil:
+    """Perfil pedido para el request actual"""
+
+    def __init__(self, request_id: str, formato: str, ruta: str):
+        self.request_id = request_id
+        self.formato = formato
+        self.ruta = ruta
+        self.guardado = False
+
+    def ejecutar(self, funcion, args, kwargs):
+        """Ejecuta el endpoint (sync, en el hilo del threadpool) perfilándolo"""
+        inicio = time.perf_counter()
+        if self.formato == "pstats":
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                perfilador.disable()
+                self._guardar_pstats(perfilador, inicio)
+
+        muestreador = MuestreadorHilo(threading.get_ident()).iniciar()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            self._guardar_colapsado(muestreador.detener(), inicio)
+
+    async def ejecutar_async(self, funcion, args, kwargs):
+        """
+        Igual que ejecutar() para endpoints async. Ojo: corren en el hilo del
+        event loop, así que el perfil incluye lo que hagan otros requests en
+        los await.
+        """
+        inicio = time.perf_counter()
+        if self.formato == "pstats":
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+            try:
+                return await funcion(*args, **kwargs)
+            finally:
+                perfilador.disable()
+                self._guardar_pstats(perfilador, inicio)
+
+        muestreador = MuestreadorHilo(threading.get_ident()).iniciar()
+        try:
+            return await funcion(*args, **kwargs)
+        finally:
+            self._guardar_colapsado(muestreador.detener(), inicio)
+
+    def _guardar_pstats(self, perfilador: cProfile.Profile, inicio: float):
+        perfilador.create_stats()
+        # Mismo formato que Profile.dump_stats (lo lee pstats.Stats)
+        self._guardar(marshal.dumps(perfilador.stats), inicio, {})
+
+    def _guardar_colapsado(self, muestras, inicio: float):
+        contenido = texto_colapsado(muestras).encode()
+        self._guardar(contenido, inicio, {"muestras": sum(muestras.values())})
+
+    def _guardar(self, contenido: bytes, inicio: float, datos: dict):
+        datos.update(ruta=self.ruta, ms=round((time.perf_counter() - inicio) * 1000, 2))
+        try:
+            guardar_perfil(self.request_id, self.formato, contenido, datos)
+            self.guardado = True
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el perfil del request {self.request_id}: {e}")
+
+
+def _headers_perfil(scope):
+    """(formato pedido o None, token de admin)"""
+    formato = token = None
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == b"x-perfilar":
+            formato = valor.decode("latin-1").strip().lower() or "pstats"
+        elif nombre == b"x-admin-token":
+            token = valor.decode("latin-1")
+    return formato, token
+
+
+class PerfiladoMiddleware:
+    """
+    Va DENTRO de RegistroConsultasMiddleware (se agrega antes en main.py)
+    para usar su request_id como ID del perfil.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        formato, token = _headers_perfil(scope)
+        if formato is None:
+            return await self.app(scope, receive, send)
+
+        if not es_token_admin(token):
+            respuesta = JSONResponse(
+                {"detail": "Perfilar requests requiere X-Admin-Token"}, status_code=403
+            )
+            return await respuesta(scope, receive, send)
+        if formato not in FORMATOS:
+            respuesta = JSONResponse(
+                {"detail": f"X-Perfilar inválido. Opciones: {', '.join(FORMATOS)}"},
+                status_code=400,
+            )
+            return await respuesta(scope, receive, send)
+
+        perfil = Perfil(request_id_actual.get(), formato, scope.get("path", ""))
+        token_perfil = _perfil.set(perfil)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start" and perfil.guardado:
+                headers = MutableHeaders(scope=mensaje)
+                headers["X-Perfil"] = f"/admin/perfiles/{perfil.request_id}"
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _perfil.reset(token_perfil)
@@ -0,0 +1,224 @@
+# app/middleware/serverTiming.py
+# Desglose del tiempo de cada request por etapa, en el header estándar
+# Server-Timing (el navegador lo muestra en DevTools > Network > Timing):
+#
+#   Server-Timing: auth;dur=0.9, db;dur=3.2;desc="4 consultas", reglas;dur=0.3,
+#                  endpoint;dur=5.1, serializacion;dur=0.6, total;dur=6.8
+#
+# - auth: validar el token (obtener_usuario_autenticado)
+# - db: consultas SQL (del registro de app/database/registroConsultas.py)
+# - reglas: evaluación de las reglas del motor de inferencia
+# - endpoint: la función de la ruta (controller + services, incluye db y reglas)
+# - serializacion: desde que termina el endpoint hasta que sale la respuesta
+#   (validar con response_model y pasar a JSON)
+# - total: todo el request, hasta que empieza a enviarse la respuesta
+#
+# Además, una muestra de los requests (y todos los lentos) se escribe en el
+# log como una línea JSON con el mismo desglose.
+#
+# Medir cuesta unos pocos microsegundos por request (perf_counter y sumas),
+# así que queda prendido siempre.
+import functools
+import inspect
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from app.database.registroConsultas import registro_del_request
+from app.database.sesionRequest import en_sesion_request
+from app.middleware.perfilado import perfil_actual
+
+# Fracción de requests que se escriben en el log (0.01 = 1%)
+LOG_MUESTREO = float(os.getenv("TIEMPOS_LOG_MUESTREO", "0.01"))
+# Los que tardan más que esto se escriben siempre
+LOG_LENTO_MS = float(os.getenv("TIEMPOS_LOG_LENTO_MS", "1000"))
+
+
+class TiemposRequest:
+    """Segundos acumulados por etapa en un request"""
+
+    __slots__ = ("inicio", "etapas", "fin_endpoint")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas: Dict[str, float] = {}
+        self.fin_endpoint: Optional[float] = None
+
+    def sumar(self, etapa: str, segundos: float):
+        self.etapas[etapa] = self.etapas.get(etapa, 0.0) + segundos
+
+
+_tiempos: ContextVar[Optional[TiemposRequest]] = ContextVar("tiempos_request", default=None)
+
+
+@contextmanager
+def medir_etapa(etapa: str):
+    """
+    Suma lo que tarda el bloque a la etapa del request actual.
+    Fuera de un request no hace nada.
+
+    with medir_etapa("reglas"):
+        ...
+    """
+    tiempos = _tiempos.get()
+    if tiempos is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        tiempos.sumar(etapa, time.perf_counter() - inicio)
+
+
+def etapa(nombre: str):
+    """Decorador: suma lo que tarda la función a la etapa `nombre`"""
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir_etapa(nombre):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorador
+
+
+def _medir_endpoint(endpoint):
+    # Si el request pidió perfil (X-Perfilar, ver app/middleware/perfilado.py)
+    # el endpoint se ejecuta a través de él.
+    # Los endpoints que son generadores (streaming) se dejan como están
+    if inspect.isasyncgenfunction(endpoint) or inspect.isgeneratorfunction(endpoint):
+        return endpoint
+
+    def terminar(tiempos: Optional[TiemposRequest], inicio: float):
+        if tiempos is not None:
+            tiempos.fin_endpoint = time.perf_counter()
+            tiempos.sumar("endpoint", tiempos.fin_endpoint - inicio)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def envoltura(*args, **kwargs):
+            tiempos, inicio = _tiempos.get(), time.perf_counter()
+            perfil = perfil_actual()
+            try:
+                if perfil is not None:
+                    return await perfil.ejecutar_async(endpoint, args, kwargs)
+                return await endpoint(*args, **kwargs)
+            finally:
+                terminar(tiempos, inicio)
+
+    else:
+
+        @functools.wraps(endpoint)
+        def envoltura(*args, **kwargs):
+            tiempos, inicio = _tiempos.get(), time.perf_counter()
+            perfil = perfil_actual()
+            try:
+                if perfil is not None:
+                    return perfil.ejecutar(endpoint, args, kwargs)
+                return endpoint(*args, **kwargs)
+            finally:
+                terminar(tiempos, inicio)
+
+    return envoltura
+
+
+class RutaMedida(APIRoute):
+    """
+    Ruta de FastAPI que mide la etapa "endpoint" y la ejecuta en la sesión de
+    BD del request (app/database/sesionRequest.py). Se usa en los routers:
+    APIRouter(prefix=..., route_class=RutaMedida)
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        endpoint = en_sesion_request(endpoint, kwargs.get("methods"))
+        super().__init__(path, _medir_endpoint(endpoint), **kwargs)
+
+
+def _header(tiempos: TiemposRequest, fin: float) -> str:
+    metricas = []
+    for nombre, segundos in tiempos.etapas.items():
+        metricas.append(f"{nombre};dur={segundos * 1000:.1f}")
+
+    registro = registro_del_request()
+    if registro is not None and len(registro):
+        metricas.append(
+            f'db;dur={registro.segundos * 1000:.1f};desc="{len(registro)} consultas"'
+        )
+    if tiempos.fin_endpoint is not None:
+        metricas.append(f"serializacion;dur={(fin - tiempos.fin_endpoint) * 1000:.1f}")
+
+    metricas.append(f"total;dur={(fin - tiempos.inicio) * 1000:.1f}")
+    return ", ".join(metricas)
+
+
+def _escribir_log(scope, status: int, tiempos: TiemposRequest, fin: float):
+    total_ms = (fin - tiempos.inicio) * 1000
+    if total_ms < LOG_LENTO_MS and random.random() >= LOG_MUESTREO:
+        return
+
+    ruta = scope.get("route")
+    registro = registro_del_request()
+    etapas = {nombre: round(s * 1000, 2) for nombre, s in tiempos.etapas.items()}
+    if tiempos.fin_endpoint is not None:
+        etapas["serializacion"] = round((fin - tiempos.fin_endpoint) * 1000, 2)
+
+    print(
+        json.dumps(
+            {
+                "evento": "tiempos_request",
+                "request_id": registro.request_id if registro else None,
+                "metodo": scope.get("method"),
+                "ruta": getattr(ruta, "path", scope.get("path")),
+                "status": status,
+                "total_ms": round(total_ms, 2),
+                "etapas_ms": etapas,
+                "sql_consultas": len(registro) if registro else 0,
+                "sql_ms": round(registro.segundos * 1000, 2) if registro else 0,
+                "sql_n_mas_1": len(registro.n_mas_1) if registro else 0,
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+class ServerTimingMiddleware:
+    """
+    Va DENTRO de RegistroConsultasMiddleware (se agrega antes en main.py)
+    para poder leer el registro de consultas del request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        tiempos = TiemposRequest()
+        token = _tiempos.set(tiempos)
+        status = 500
+
+        async def enviar(mensaje):
+            nonlocal status
+            if mensaje["type"] == "http.response.start":
+                fin = time.perf_counter()
+                status = mensaje["status"]
+                headers = MutableHeaders(scope=mensaje)
+                headers["Server-Timing"] = _header(tiempos, fin)
+                headers["Timing-Allow-Origin"] = "*"
+                _escribir_log(scope, status, tiempos, fin)
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _tiempos.reset(token)
@@ -0,0 +1,30 @@
+# app/models/__init__.py
+# Todas las entidades de Pony. Tienen que estar definidas antes de
+# init_database() (generate_mapping), así que main.py, los benchmarks y
+# cualquier script importan los modelos desde acá: al agregar una entidad
+# nueva alcanza con sumarla en este archivo.
+from app.models.usuario import Usuario
+from app.models.ingreso import Ingreso
+from app.models.egreso import Egreso
+from app.models.pasivo import Pasivo
+from app.models.activo import Activo
+from app.models.patrimonio import PatrimonioDiario
+from app.models.outbox import EventoOutbox, OffsetConsumidor
+from app.models.sesion import RefreshToken, SesionRevocada
+from app.models.eliminacion import EliminacionUsuario
+from app.models.presupuesto import Presupuesto
+
+__all__ = [
+    "Usuario",
+    "Ingreso",
+    "Egreso",
+    "Pasivo",
+    "Activo",
+    "PatrimonioDiario",
+    "EventoOutbox",
+    "OffsetConsumidor",
+    "RefreshToken",
+    "SesionRevocada",
+    "EliminacionUsuario",
+    "Presupuesto",
+]
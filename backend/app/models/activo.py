@@ -10,4 +10,5 @@ class Activo(db.Entity):
     tipo = Required(str)
     nombre = Required(str)
     flujo_mensual = Optional(float)
+    moneda = Required(str)  # Código ISO (ver tiposCambioService)
     fk_usuarios = Required("Usuario")  # Relación con Usuario, (clave foránea)
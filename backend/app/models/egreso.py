@@ -10,5 +10,7 @@ class Egreso(db.Entity):
     id = PrimaryKey(int, auto=True)
     monto = Required(float)
     categoria = Required(str)
+    moneda = Required(str)  # Código ISO (ver tiposCambioService)
+    tasa_cambio = Required(float)  # A la moneda de reporte, fijada al guardar
     fecha = Required(date)
     fk_usuarios = Required("Usuario")
@@ -0,0 +1,23 @@
+# app/models/eliminacion.py
+from pony.orm import PrimaryKey, Required, Optional
+from app.database.database import db
+from datetime import datetime
+
+
+class EliminacionUsuario(db.Entity):
+    """
+    Pedido de baja de una cuenta. Lo procesa en segundo plano
+    app/tareas/eliminacionUsuarios.py, que va guardando el avance.
+    """
+
+    _table_ = "eliminaciones_usuario"
+
+    id = PrimaryKey(int, auto=True)
+    usuario_id = Required(int)  # Sin FK: el usuario se borra al final
+    estado = Required(str, default="pendiente")  # pendiente, en_curso, completado, error
+    total = Required(int, default=0)
+    borradas = Required(int, default=0)
+    tabla = Optional(str, nullable=True)
+    error = Optional(str, nullable=True)
+    creado = Required(datetime, default=datetime.now)
+    actualizado = Required(datetime, default=datetime.now)
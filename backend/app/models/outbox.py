@@ -0,0 +1,32 @@
+# app/models/outbox.py
+from pony.orm import PrimaryKey, Required, Optional, Json
+from app.database.database import db
+from datetime import datetime
+
+
+class EventoOutbox(db.Entity):
+    """
+    Cambio en un ingreso, egreso, activo o pasivo.
+    Se escribe en la misma transacción que el cambio (patrón outbox).
+    """
+
+    _table_ = "outbox_eventos"
+
+    id = PrimaryKey(int, auto=True, size=64)
+    entidad = Required(str)  # "ingreso", "egreso", "activo", "pasivo" o "presupuesto"
+    entidad_id = Required(int)
+    operacion = Required(str)  # "crear", "actualizar", "eliminar" o "alerta"
+    usuario_id = Required(int)  # Sin FK: el evento sobrevive al usuario
+    datos = Optional(Json, nullable=True)  # Fila después del cambio (o la borrada)
+    anterior = Optional(Json, nullable=True)  # Fila antes del cambio (solo en "actualizar")
+    creado = Required(datetime, default=datetime.now)
+
+
+class OffsetConsumidor(db.Entity):
+    """Último evento procesado por cada consumidor del outbox"""
+
+    _table_ = "outbox_offsets"
+
+    consumidor = PrimaryKey(str)
+    ultimo_id = Required(int, size=64, default=0)
+    actualizado = Required(datetime, default=datetime.now)
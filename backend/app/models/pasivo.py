@@ -1,6 +1,6 @@
 # app/models/ingreso.py
 # Modelo ORM que representa la tabla 'pasivos' en la base de datos
-from pony.orm import PrimaryKey, Required
+from pony.orm import PrimaryKey, Required, Optional
 from app.database.database import db
 from datetime import date  
 
@@ -21,5 +21,6 @@ class Pasivo(db.Entity):
     monto_total = Required(float)
     pago_mensual = Required(float)
     fecha_vencimiento = Required(date)
+    tasa_interes = Optional(float)  # Tasa nominal anual en % (ej: 45.0)
     fk_usuarios = Required("Usuario")  # Relación con usuarios, (clave foránea)
     
\ No newline at end of file
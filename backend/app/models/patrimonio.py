@@ -0,0 +1,22 @@
+# app/models/patrimonio.py
+from pony.orm import PrimaryKey, Required
+from app.database.database import db
+from datetime import date
+
+
+class PatrimonioDiario(db.Entity):
+    """
+    Foto diaria de los totales de un usuario.
+    Los activos y pasivos son el saldo del día; ingresos y egresos son los
+    movimientos con fecha de ese día.
+    """
+
+    _table_ = "patrimonio_diario"
+
+    fk_usuarios = Required("Usuario")
+    fecha = Required(date)
+    total_activos = Required(float)
+    total_pasivos = Required(float)
+    ingresos = Required(float)
+    egresos = Required(float)
+    PrimaryKey(fk_usuarios, fecha)
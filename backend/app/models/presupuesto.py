@@ -0,0 +1,21 @@
+# app/models/presupuesto.py
+from pony.orm import PrimaryKey, Required
+from app.database.database import db
+from datetime import datetime
+
+
+class Presupuesto(db.Entity):
+    """
+    Cuánto quiere gastar un usuario por mes en una categoría de egresos.
+    Lo consumido en cada mes está en consumos_presupuesto (ver
+    app/services/presupuestoService.py).
+    """
+
+    _table_ = "presupuestos"
+
+    id = PrimaryKey(int, auto=True)
+    fk_usuarios = Required("Usuario")
+    categoria = Required(str)  # En minúsculas (clave_categoria)
+    monto_mensual = Required(float)
+    umbral_alerta = Required(float, default=0.8)  # Fracción del monto que dispara el aviso
+    creado = Required(datetime, default=datetime.now)
@@ -0,0 +1,30 @@
+# app/models/sesion.py
+from pony.orm import PrimaryKey, Required, Optional
+from app.database.database import db
+from datetime import datetime
+
+
+class RefreshToken(db.Entity):
+    """
+    Refresh token emitido para una sesión. Sirve una sola vez (rotación):
+    al usarlo se marca `usado` y se emite otro de la misma sesión.
+    """
+
+    _table_ = "refresh_tokens"
+
+    jti = PrimaryKey(str)
+    sesion = Required(str)
+    usuario_id = Required(int)  # Sin FK: se borra junto con el usuario a mano
+    expira = Required(datetime)
+    usado = Optional(datetime, nullable=True)
+    creado = Required(datetime, default=datetime.now)
+
+
+class SesionRevocada(db.Entity):
+    """Sesión cerrada antes de que venzan sus tokens"""
+
+    _table_ = "sesiones_revocadas"
+
+    sesion = PrimaryKey(str)
+    expira = Required(datetime)
+    creado = Required(datetime, default=datetime.now)
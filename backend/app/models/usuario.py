@@ -17,3 +17,5 @@ class Usuario(db.Entity):
     egresos = Set("Egreso")
     pasivos = Set("Pasivo")
     activos = Set("Activo")
+    patrimonios = Set("PatrimonioDiario")  # Fotos diarias de totales
+    presupuestos = Set("Presupuesto")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from typing import List
+from typing import List, Optional
 from app.controllers.activoControllers import (
     get_activos_controller,
     get_activo_controller,
@@ -8,21 +8,43 @@ from app.controllers.activoControllers import (
     delete_activo_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import (
+    enrutar_base_datos,
+    campos_parciales,
+    presupuesto_consultas,
+)
+from app.services.activoService import CAMPOS_ACTIVO
 from app.schemas.activo import ActivoCreate, ActivoUpdate, ActivoOut
+from app.middleware.serverTiming import RutaMedida
 
-router = APIRouter(prefix="/activos", tags=["Activos"])
+router = APIRouter(
+    prefix="/activos",
+    tags=["Activos"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
 
 
-@router.get("/", response_model=List[ActivoOut])
-def listar_activos(usuario: dict = Depends(obtener_usuario_autenticado)):
-    return get_activos_controller(usuario)
+# Una consulta (más una si hay que confirmar en la BD que la sesión no fue revocada)
+@router.get(
+    "/",
+    response_model=List[ActivoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_activos(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_ACTIVO)),
+):
+    return get_activos_controller(usuario, campos)
 
 
 @router.get("/{activo_id}", response_model=ActivoOut)
 def obtener_activo(
-    activo_id: int, usuario: dict = Depends(obtener_usuario_autenticado)
+    activo_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_ACTIVO)),
 ):
-    return get_activo_controller(activo_id, usuario)
+    return get_activo_controller(activo_id, usuario, campos)
 
 
 @router.post("/", response_model=ActivoOut, status_code=201)
@@ -0,0 +1,147 @@
+# app/routes/adminRoutes.py
+# Herramientas de diagnóstico. Piden el header X-Admin-Token (ADMIN_TOKEN).
+from typing import Optional
+from fastapi import APIRouter, Depends, Path, Query
+from app.controllers.adminControllers import (
+    listar_perfiles_controller,
+    obtener_perfil_controller,
+    perfilador_continuo_controller,
+    estado_perfilador_controller,
+    estado_memoria_controller,
+    iniciar_tracemalloc_controller,
+    detener_tracemalloc_controller,
+    tomar_snapshot_controller,
+    borrar_snapshot_controller,
+    comparar_snapshots_controller,
+    picos_requests_controller,
+    reconstruir_libros_controller,
+    obtener_eliminacion_controller,
+)
+from app.routes.dependencias import verificar_admin
+from app.services.perfilesService import ORDENES_PSTATS
+from app.services.memoriaService import AGRUPACIONES
+from app.middleware.serverTiming import RutaMedida
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(verificar_admin)],
+    route_class=RutaMedida,
+)
+
+
+@router.get("/perfiles")
+def listar_perfiles():
+    """Perfiles guardados de requests con X-Perfilar, del más nuevo al más viejo"""
+    return listar_perfiles_controller()
+
+
+@router.get("/perfiles/{request_id}")
+def obtener_perfil(
+    request_id: str,
+    crudo: bool = Query(False, description="Bajar el archivo .pstats (para snakeviz)"),
+    orden: str = Query("cumulative", description=f"Opciones: {', '.join(ORDENES_PSTATS)}"),
+    limite: int = Query(60, ge=1, le=1000, description="Funciones a mostrar"),
+):
+    """
+    Perfil de un request: pstats como texto (o el archivo con ?crudo=true)
+    o las pilas colapsadas ("a;b;c cantidad"), según cómo se pidió.
+    """
+    return obtener_perfil_controller(request_id, crudo, orden, limite)
+
+
+@router.get("/perfilador")
+def perfilador_continuo(
+    reiniciar: bool = Query(False, description="Empezar a acumular de cero"),
+):
+    """
+    Pilas colapsadas ("a;b;c cantidad") acumuladas por el perfilador
+    continuo (PERFILADOR_CONTINUO=1). Se abren con speedscope o flamegraph.pl.
+    """
+    return perfilador_continuo_controller(reiniciar)
+
+
+@router.get("/perfilador/estado")
+def estado_perfilador():
+    """Muestras acumuladas y costo medido del perfilador continuo"""
+    return estado_perfilador_controller()
+
+
+# ========== MEMORIA (tracemalloc) ==========
+
+NOMBRE_SNAPSHOT = Path(..., pattern=r"^[A-Za-z0-9._-]{1,40}$")
+
+
+@router.get("/memoria")
+def estado_memoria():
+    """Si tracemalloc está activo, memoria anotada y snapshots guardados"""
+    return estado_memoria_controller()
+
+
+@router.post("/memoria/iniciar")
+def iniciar_tracemalloc(
+    marcos: int = Query(1, ge=1, le=50, description="Niveles de pila por reserva"),
+):
+    """Prende tracemalloc (hace más lento el proceso mientras esté activo)"""
+    return iniciar_tracemalloc_controller(marcos)
+
+
+@router.post("/memoria/detener")
+def detener_tracemalloc():
+    """Apaga tracemalloc y descarta los snapshots"""
+    return detener_tracemalloc_controller()
+
+
+@router.post("/memoria/snapshots/{nombre}")
+def tomar_snapshot(nombre: str = NOMBRE_SNAPSHOT):
+    """Guarda un snapshot de la memoria con ese nombre"""
+    return tomar_snapshot_controller(nombre)
+
+
+@router.delete("/memoria/snapshots/{nombre}")
+def borrar_snapshot(nombre: str = NOMBRE_SNAPSHOT):
+    return borrar_snapshot_controller(nombre)
+
+
+@router.get("/memoria/snapshots/{nombre}/diferencias")
+def comparar_snapshots(
+    nombre: str = NOMBRE_SNAPSHOT,
+    contra: Optional[str] = Query(
+        None, description="Otro snapshot (si se omite, la memoria de ahora)"
+    ),
+    agrupar: str = Query("lineno", description=f"Opciones: {', '.join(AGRUPACIONES)}"),
+    limite: int = Query(30, ge=1, le=500),
+):
+    """Las líneas (o archivos) cuya memoria más creció desde el snapshot"""
+    return comparar_snapshots_controller(nombre, contra, agrupar, limite)
+
+
+@router.get("/memoria/requests")
+def picos_requests(limite: int = Query(20, ge=1, le=200)):
+    """
+    Pico de memoria de los requests medidos (una muestra, MEMORIA_MUESTREO,
+    mientras tracemalloc está activo): por ruta y los últimos.
+    """
+    return picos_requests_controller(limite)
+
+
+# ========== MANTENIMIENTO ==========
+
+
+@router.post("/usuarios/{usuario_id}/libros/reconstruir")
+def reconstruir_libros(usuario_id: int):
+    """
+    Arma de cero los libros del usuario (libro diario, estadísticas de
+    egresos y consumos de presupuestos) a partir de sus ingresos y egresos.
+    Para cuando se cargaron o corrigieron datos por fuera de los services.
+    """
+    return reconstruir_libros_controller(usuario_id)
+
+
+@router.get("/usuarios/{usuario_id}/eliminacion")
+def obtener_eliminacion(usuario_id: int):
+    """
+    Avance de la baja de cuenta del usuario. Al pedir la baja se cierran sus
+    sesiones, así que desde ese momento el avance se consulta por acá.
+    """
+    return obtener_eliminacion_controller(usuario_id)
@@ -1,30 +1,56 @@
 # app/routes/authRoutes.py
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 from app.controllers.authControllers import (
     login_controller,
     registrar_controller,
     cambiar_contraseña_controller,
+    renovar_tokens_controller,
+    logout_controller,
 )
-from app.schemas.auth import LoginRequest, LoginResponse, RegisterRequest
+from app.schemas.auth import (
+    LoginRequest,
+    LoginResponse,
+    RegisterRequest,
+    RefreshRequest,
+    RefreshResponse,
+)
+from app.routes.dependencias import ip_cliente
+from app.services.auth_service import obtener_usuario_autenticado
+from app.middleware.serverTiming import RutaMedida
 
-router = APIRouter(prefix="/auth", tags=["Autenticación"])
+router = APIRouter(
+    prefix="/auth",
+    tags=["Autenticación"],
+    route_class=RutaMedida,
+)
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(datos: LoginRequest):
-    return login_controller(datos.email, datos.password)
+def login(datos: LoginRequest, ip: str = Depends(ip_cliente)):
+    return login_controller(datos.email, datos.password, ip)
 
 
 @router.post("/register")  # POST - Usuario
-def register(datos: RegisterRequest):
+def register(datos: RegisterRequest, ip: str = Depends(ip_cliente)):
     return registrar_controller(
         nombre_completo=datos.nombre_completo,
         email=datos.email,
         username=datos.username,
         password=datos.password,
+        ip=ip,
     )
 
 
+@router.post("/refresh", response_model=RefreshResponse)
+def refresh(datos: RefreshRequest):
+    return renovar_tokens_controller(datos.refresh_token)
+
+
+@router.post("/logout")
+def logout(usuario: dict = Depends(obtener_usuario_autenticado)):
+    return logout_controller(usuario)
+
+
 '''
 @router.post("/login-form")
 def login_form(email: str = Form(...), password: str = Form(...)):
@@ -42,7 +68,12 @@ def login_form(email: str = Form(...), password: str = Form(...)):
 
 
 @router.post("/cambiar-contraseña")
-def cambiar_contraseña(usuario_id: int, contraseña_actual: str, contraseña_nueva: str):
+def cambiar_contraseña(
+    usuario_id: int,
+    contraseña_actual: str,
+    contraseña_nueva: str,
+    ip: str = Depends(ip_cliente),
+):
     return cambiar_contraseña_controller(
-        usuario_id, contraseña_actual, contraseña_nueva
+        usuario_id, contraseña_actual, contraseña_nueva, ip
     )
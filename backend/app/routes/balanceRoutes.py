@@ -0,0 +1,31 @@
+# app/routes/balanceRoutes.py
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.controllers.balanceControllers import obtener_balance_controller
+from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import enrutar_base_datos, presupuesto_consultas
+from app.middleware.serverTiming import RutaMedida
+
+router = APIRouter(
+    prefix="/balance",
+    tags=["Balance"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+# Un acumulado de ingresos y uno de egresos
+@router.get("/", dependencies=[Depends(presupuesto_consultas(2))])
+def obtener_balance(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    fecha: Optional[date] = Query(
+        None, description="Fecha (AAAA-MM-DD), hoy si se omite"
+    ),
+):
+    """
+    Ingresos y egresos acumulados del usuario hasta la fecha (inclusive) y el
+    saldo resultante. Se lee del libro diario acumulado, sin recorrer los
+    movimientos.
+    """
+    return obtener_balance_controller(usuario, fecha)
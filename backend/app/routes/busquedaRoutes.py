@@ -0,0 +1,33 @@
+# app/routes/busquedaRoutes.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from app.controllers.busquedaControllers import buscar_controller
+from app.services.auth_service import obtener_usuario_autenticado
+from app.services.busquedaService import FUENTES
+from app.routes.dependencias import enrutar_base_datos, presupuesto_consultas
+from app.middleware.serverTiming import RutaMedida
+
+
+router = APIRouter(
+    prefix="/busqueda",
+    tags=["Búsqueda"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+@router.get("/", dependencies=[Depends(presupuesto_consultas(2))])
+def buscar(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    q: str = Query(..., min_length=1, max_length=100, description="Texto a buscar"),
+    tipos: Optional[List[str]] = Query(
+        None, description=f"Dónde buscar: {', '.join(FUENTES)} (todos si se omite)"
+    ),
+    pagina: int = Query(1, ge=1, le=50),
+    limite: int = Query(20, ge=1, le=100),
+):
+    """
+    Busca por parte del nombre en activos y pasivos y por categoría en
+    ingresos y egresos. Los resultados vienen ordenados por parecido.
+    """
+    return buscar_controller(usuario, q, tipos, pagina, limite)
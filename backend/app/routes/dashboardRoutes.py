@@ -0,0 +1,37 @@
+# app/routes/dashboardRoutes.py
+from fastapi import APIRouter, Depends, Query
+from app.controllers.dashboardControllers import obtener_dashboard_controller
+from app.services.auth_service import obtener_usuario_autenticado
+from app.services.dashboardService import SECCIONES
+from app.routes.dependencias import enrutar_base_datos, presupuesto_consultas
+from app.middleware.serverTiming import RutaMedida
+
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+# Una consulta por bloque de datos (agregados, recientes y pronóstico), más la de sesión
+@router.get("/{usuario_id}", dependencies=[Depends(presupuesto_consultas(7))])
+def obtener_dashboard(
+    usuario_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    secciones: str = Query(
+        ",".join(SECCIONES),
+        description=f"Secciones separadas por coma: {', '.join(SECCIONES)}",
+    ),
+    dias: int = Query(30, description="Período de análisis en días", ge=1, le=365),
+    limite_recientes: int = Query(10, ge=1, le=100),
+):
+    """
+    Devuelve en una sola respuesta el análisis, la distribución de gastos,
+    los últimos movimientos, el balance y el pronóstico de egresos del mes.
+    """
+    lista = [s.strip() for s in secciones.split(",") if s.strip()]
+    return obtener_dashboard_controller(
+        usuario_id, usuario, lista, dias, limite_recientes
+    )
@@ -0,0 +1,116 @@
+# app/routes/dependencias.py
+# Dependencias de FastAPI compartidas por varios routers
+import os
+from typing import List, Optional
+from fastapi import Depends, Header, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from app.database.database import (
+    hay_replica,
+    usar_replica,
+    registrar_escritura,
+    escribio_recientemente,
+)
+from app.services.auth_service import obtener_usuario_autenticado
+from app.services.adminService import es_token_admin
+from app.services.proyeccionService import parsear_campos
+from app.database.registroConsultas import registro_del_request
+
+# Solo si la API está detrás de un proxy propio (si no, el cliente podría
+# mandar cualquier IP en el header y esquivar el límite de intentos)
+CONFIAR_X_FORWARDED_FOR = os.getenv("CONFIAR_X_FORWARDED_FOR", "0") == "1"
+
+
+async def enrutar_base_datos(
+    request: Request, usuario: dict = Depends(obtener_usuario_autenticado)
+):
+    """
+    Decide si el request lee desde la réplica o desde la primaria.
+
+    - GET: va a la réplica, salvo que el usuario haya escrito hace poco
+      (ventana de lectura propia), en ese caso sigue en la primaria.
+    - POST/PUT/DELETE: van a la primaria y registran la escritura para abrir
+      la ventana de lectura propia del usuario.
+
+    Es async para que el destino quede en el contexto del request y lo vea
+    el endpoint (que FastAPI ejecuta en un hilo aparte).
+    Las escrituras se registran en la primaria (tabla escrituras_recientes),
+    así la ventana vale aunque el siguiente request lo atienda otro worker.
+    """
+    # Sin réplica todo va a la primaria y no hay nada que registrar
+    if not hay_replica():
+        yield
+        return
+
+    usuario_id = usuario["usuario_id"]
+
+    if request.method == "GET":
+        if not await run_in_threadpool(escribio_recientemente, usuario_id):
+            usar_replica()
+        yield
+        return
+
+    # Se registra antes del endpoint: lo que sigue al yield puede correr
+    # después de mandar la respuesta, y un GET del cliente justo después
+    # ya tiene que encontrar la ventana abierta
+    await run_in_threadpool(registrar_escritura, usuario_id)
+    try:
+        yield
+    finally:
+        # Para que la ventana cuente desde el final (el endpoint pudo tardar)
+        await run_in_threadpool(registrar_escritura, usuario_id)
+
+
+def campos_parciales(disponibles: List[str]):
+    """
+    Crea la dependencia del parámetro ?fields=id,monto,fecha.
+
+    Devuelve la lista de columnas pedidas (o None si no se pidió ninguna)
+    y responde 400 si hay campos que no existen.
+    """
+
+    def dependencia(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Campos separados por coma: {', '.join(disponibles)}",
+        )
+    ) -> Optional[List[str]]:
+        try:
+            return parsear_campos(fields, disponibles)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependencia
+
+
+def ip_cliente(request: Request) -> str:
+    """IP de quien hace el request (para el límite de intentos)"""
+    if CONFIAR_X_FORWARDED_FOR:
+        reenviada = request.headers.get("X-Forwarded-For")
+        if reenviada:
+            # El primero de la lista es el cliente original
+            return reenviada.split(",")[0].strip()
+    return request.client.host if request.client else "desconocida"
+
+
+def presupuesto_consultas(limite: int):
+    """
+    Crea una dependencia que fija cuántas consultas SQL puede hacer el
+    endpoint. Si se pasa se avisa en el log (o falla, con
+    SQL_PRESUPUESTO_ESTRICTO=1, pensado para pruebas).
+
+    Uso: @router.get("/", dependencies=[Depends(presupuesto_consultas(2))])
+    """
+
+    def dependencia():
+        registro = registro_del_request()
+        if registro is not None:
+            registro.limite = limite
+
+    return dependencia
+
+
+def verificar_admin(x_admin_token: Optional[str] = Header(None)):
+    """Las rutas de diagnóstico (/admin) piden el token de ADMIN_TOKEN"""
+    if not es_token_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Token de administrador inválido")
@@ -1,33 +1,88 @@
 # app/routes/egresoRoutes.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
 from app.controllers.egresoControllers import (
     get_egresos_controller,
     get_egreso_controller,
     post_egreso_controller,
     put_egreso_controller,
     delete_egreso_controller,
+    get_anomalias_controller,
+    get_recurrentes_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
-from app.schemas.egreso import EgresoCreate, EgresoUpdate, EgresoOut
+from app.routes.dependencias import (
+    enrutar_base_datos,
+    campos_parciales,
+    presupuesto_consultas,
+)
+from app.services.egresoService import CAMPOS_EGRESO
+from app.schemas.egreso import (
+    EgresoCreate,
+    EgresoUpdate,
+    EgresoOut,
+    EgresoCreadoOut,
+    AnomaliaEgresoOut,
+)
+from app.middleware.serverTiming import RutaMedida
+
+
+router = APIRouter(
+    prefix="/egresos",
+    tags=["Egresos"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+# Una consulta (más una si hay que confirmar en la BD que la sesión no fue revocada)
+@router.get(
+    "/",
+    response_model=List[EgresoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_egresos(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_EGRESO)),
+):
+    return get_egresos_controller(usuario, campos)
 
 
-router = APIRouter(prefix="/egresos", tags=["Egresos"])
+# Antes de /{egreso_id} para que "anomalias" y "recurrentes" no se tomen como un ID
+@router.get(
+    "/anomalias",
+    response_model=List[AnomaliaEgresoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_anomalias(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    limite: int = Query(20, ge=1, le=100),
+):
+    """Egresos que al crearse quedaron muy por encima de la media de su categoría"""
+    return get_anomalias_controller(usuario, limite)
 
 
-@router.get("/", response_model=List[EgresoOut])
-def listar_egresos(usuario: dict = Depends(obtener_usuario_autenticado)):
-    return get_egresos_controller(usuario)
+# Sin consultas si no cambiaron los egresos desde la última vez
+@router.get("/recurrentes", dependencies=[Depends(presupuesto_consultas(2))])
+def listar_recurrentes(usuario: dict = Depends(obtener_usuario_autenticado)):
+    """
+    Egresos que se repiten cada semana, mes o año (suscripciones, alquiler,
+    seguros), con lo que suman por año los que siguen vigentes.
+    """
+    return get_recurrentes_controller(usuario)
 
 
 @router.get("/{egreso_id}", response_model=EgresoOut)
 def obtener_egreso(
-    egreso_id: int, usuario: dict = Depends(obtener_usuario_autenticado)
+    egreso_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_EGRESO)),
 ):
-    return get_egreso_controller(egreso_id, usuario)
+    return get_egreso_controller(egreso_id, usuario, campos)
 
 
-@router.post("/", response_model=EgresoOut, status_code=201)
+# `anomalia` viene con datos si el monto es inusualmente alto para la categoría
+@router.post("/", response_model=EgresoCreadoOut, status_code=201)
 def crear_egreso(
     egreso: EgresoCreate, usuario: dict = Depends(obtener_usuario_autenticado)
 ):
@@ -1,6 +1,6 @@
 # app/routes/ingresoRoutes.py
 from fastapi import APIRouter, Depends
-from typing import List
+from typing import List, Optional
 from app.controllers.ingresoControllers import (
     get_ingresos_controller,
     get_ingreso_controller,
@@ -9,22 +9,44 @@ from app.controllers.ingresoControllers import (
     delete_ingreso_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import (
+    enrutar_base_datos,
+    campos_parciales,
+    presupuesto_consultas,
+)
+from app.services.ingresoService import CAMPOS_INGRESO
 from app.schemas.ingreso import IngresoCreate, IngresoUpdate, IngresoOut
+from app.middleware.serverTiming import RutaMedida
 
 
-router = APIRouter(prefix="/ingresos", tags=["Ingresos"])
+router = APIRouter(
+    prefix="/ingresos",
+    tags=["Ingresos"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
 
 
-@router.get("/", response_model=List[IngresoOut])
-def listar_ingresos(usuario: dict = Depends(obtener_usuario_autenticado)):
-    return get_ingresos_controller(usuario)
+# Una consulta (más una si hay que confirmar en la BD que la sesión no fue revocada)
+@router.get(
+    "/",
+    response_model=List[IngresoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_ingresos(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_INGRESO)),
+):
+    return get_ingresos_controller(usuario, campos)
 
 
 @router.get("/{ingreso_id}", response_model=IngresoOut)
 def obtener_ingreso(
-    ingreso_id: int, usuario: dict = Depends(obtener_usuario_autenticado)
+    ingreso_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_INGRESO)),
 ):
-    return get_ingreso_controller(ingreso_id, usuario)
+    return get_ingreso_controller(ingreso_id, usuario, campos)
 
 
 @router.post("/", response_model=IngresoOut, status_code=201)
@@ -1,7 +1,9 @@
 # app/routes/motorInferenciaRoutes.py
+from typing import List
 from fastapi import APIRouter, Depends, Query
 from app.controllers.motorInferenciaControllers import (
     evaluar_salud_financiera_controller,
+    evaluar_salud_financiera_ventanas_controller,
     evaluar_regla_50_30_20_controller,
     evaluar_limite_endeudamiento_controller,
     evaluar_gasta_mas_que_gana_controller,
@@ -11,11 +13,20 @@ from app.controllers.motorInferenciaControllers import (
     evaluar_lujos_vs_educacion_controller,
     evaluar_reserva_imprevistos_controller,
     obtener_distribucion_gastos,
+    obtener_historial_patrimonio_controller,
+    obtener_pronostico_egresos_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import enrutar_base_datos, presupuesto_consultas
+from app.middleware.serverTiming import RutaMedida
 
 
-router = APIRouter(prefix="/analisis", tags=["Motor de Inferencia"])
+router = APIRouter(
+    prefix="/analisis",
+    tags=["Motor de Inferencia"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
 
 
 @router.get("/salud-financiera/{usuario_id}")
@@ -30,6 +41,23 @@ def obtener_salud_financiera(
     return evaluar_salud_financiera_controller(usuario_id, usuario, dias)
 
 
+@router.get("/salud-financiera/{usuario_id}/ventanas")
+def obtener_salud_financiera_ventanas(
+    usuario_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    dias: List[int] = Query(
+        [30, 90, 365],
+        description="Períodos a comparar, en días (?dias=30&dias=90&dias=365)",
+    ),
+):
+    """
+    Evalúa todas las reglas en varios períodos a la vez, con una sola pasada
+    por los movimientos (para comparar 30, 90 y 365 días sin un request por
+    período).
+    """
+    return evaluar_salud_financiera_ventanas_controller(usuario_id, usuario, dias)
+
+
 @router.get("/50-30-20/{usuario_id}")
 def evaluar_regla_50_30_20(
     usuario_id: int,
@@ -155,3 +183,39 @@ def obtener_distribucion_gastos_route(
     Obtiene la distribución de gastos por categoría para un usuario.
     """
     return obtener_distribucion_gastos(usuario_id, usuario, dias)
+
+
+@router.get("/patrimonio/{usuario_id}")
+def obtener_historial_patrimonio(
+    usuario_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    resolucion: str = Query(
+        "diaria", description="diaria, semanal o mensual", pattern="^(diaria|semanal|mensual)$"
+    ),
+    dias: int = Query(365, ge=1, le=3650),
+):
+    """
+    Serie histórica de patrimonio neto (activos - pasivos) con los ingresos y
+    egresos de cada período. Se lee de las fotos diarias, no de los movimientos.
+    """
+    return obtener_historial_patrimonio_controller(usuario_id, usuario, resolucion, dias)
+
+
+@router.get(
+    "/pronostico/{usuario_id}", dependencies=[Depends(presupuesto_consultas(2))]
+)
+def obtener_pronostico_egresos(
+    usuario_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    meses: int = Query(12, description="Meses de historia a usar", ge=2, le=60),
+    horizonte: int = Query(1, description="Meses a pronosticar", ge=1, le=12),
+    nivel: int = Query(80, description="Nivel del intervalo (80, 90 o 95)"),
+):
+    """
+    Egresos esperados por categoría para el mes en curso (y los siguientes,
+    según `horizonte`), con intervalo, agrupados también como la regla
+    50/30/20. Todas las categorías se ajustan juntas con NumPy.
+    """
+    return obtener_pronostico_egresos_controller(
+        usuario_id, usuario, meses, horizonte, nivel
+    )
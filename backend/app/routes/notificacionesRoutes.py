@@ -0,0 +1,31 @@
+# app/routes/notificacionesRoutes.py
+# Router aparte porque el stream se autentica también con ?token=
+# (EventSource no permite mandar el header Authorization)
+from fastapi import APIRouter, Depends, Query
+from app.controllers.notificacionesControllers import stream_analisis_controller
+from app.services.auth_service import obtener_usuario_autenticado_stream
+from app.middleware.serverTiming import RutaMedida
+
+router = APIRouter(
+    prefix="/analisis",
+    tags=["Notificaciones"],
+    route_class=RutaMedida,
+)
+
+
+@router.get("/stream/{usuario_id}")
+async def stream_analisis(
+    usuario_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado_stream),
+    dias: int = Query(30, ge=1, le=365),
+    modo: str = Query(
+        "resumen",
+        description="resumen: manda el análisis completo, cambio: solo el aviso",
+        pattern="^(resumen|cambio)$",
+    ),
+):
+    """
+    Server-Sent Events: avisa cuando cambian los datos del usuario para que
+    el dashboard se actualice sin consultar periódicamente.
+    """
+    return await stream_analisis_controller(usuario_id, usuario, dias, modo)
@@ -1,31 +1,88 @@
 # app/routes/pasivoRoutes.py
 # Define los endpoints HTTP para operaciones CRUD de pasivos
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
 from app.controllers.pasivoControllers import (
     get_pasivos_controller,
     get_pasivo_controller,
     post_pasivo_controller,
     put_pasivo_controller,
     delete_pasivo_controller,
+    get_amortizacion_controller,
+    get_estrategias_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import (
+    enrutar_base_datos,
+    campos_parciales,
+    presupuesto_consultas,
+)
+from app.services.pasivoService import CAMPOS_PASIVO
 from app.schemas.pasivo import PasivoCreate, PasivoUpdate, PasivoOut
+from app.middleware.serverTiming import RutaMedida
+
+
+router = APIRouter(
+    prefix="/pasivos",
+    tags=["Pasivos"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+# Una consulta (más una si hay que confirmar en la BD que la sesión no fue revocada)
+@router.get(
+    "/",
+    response_model=List[PasivoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_pasivos(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_PASIVO)),
+):
+    return get_pasivos_controller(usuario, campos)
 
 
-router = APIRouter(prefix="/pasivos", tags=["Pasivos"])
+# Va antes de "/{pasivo_id}" para que "amortizacion" no se tome como un ID
+@router.get("/amortizacion")
+def obtener_amortizacion(
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    meses_max: int = Query(360, description="Horizonte en meses", ge=1, le=600),
+    detalle: bool = Query(True, description="Incluir el cronograma mes a mes"),
+):
+    """
+    Cronograma de amortización de todos los pasivos del usuario:
+    fecha de cancelación, interés total y detalle mensual de cada deuda.
+    """
+    return get_amortizacion_controller(usuario, meses_max, detalle)
 
 
-@router.get("/", response_model=List[PasivoOut])
-def listar_pasivos(usuario: dict = Depends(obtener_usuario_autenticado)):
-    return get_pasivos_controller(usuario)
+@router.get("/estrategias")
+def comparar_estrategias(
+    presupuesto_mensual: float = Query(
+        ..., description="Monto disponible por mes para pagar deudas", gt=0
+    ),
+    orden: Optional[List[int]] = Query(
+        None, description="IDs de pasivos en el orden de pago personalizado"
+    ),
+    meses_max: int = Query(360, ge=1, le=600),
+    usuario: dict = Depends(obtener_usuario_autenticado),
+):
+    """
+    Compara estrategias para cancelar las deudas con un presupuesto mensual:
+    avalancha (mayor tasa primero), bola de nieve (menor saldo primero) y,
+    si se envía `orden`, una estrategia personalizada.
+    """
+    return get_estrategias_controller(usuario, presupuesto_mensual, orden, meses_max)
 
 
 @router.get("/{pasivo_id}", response_model=PasivoOut)
 def obtener_pasivo(
-    pasivo_id: int, usuario: dict = Depends(obtener_usuario_autenticado)
+    pasivo_id: int,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_PASIVO)),
 ):
-    return get_pasivo_controller(pasivo_id, usuario)
+    return get_pasivo_controller(pasivo_id, usuario, campos)
 
 
 @router.post("/", response_model=PasivoOut, status_code=201)
@@ -0,0 +1,58 @@
+# app/routes/presupuestoRoutes.py
+from typing import List
+from fastapi import APIRouter, Depends
+from app.controllers.presupuestoControllers import (
+    get_presupuestos_controller,
+    post_presupuesto_controller,
+    put_presupuesto_controller,
+    delete_presupuesto_controller,
+)
+from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import enrutar_base_datos, presupuesto_consultas
+from app.schemas.presupuesto import PresupuestoCreate, PresupuestoUpdate, PresupuestoOut
+from app.middleware.serverTiming import RutaMedida
+
+router = APIRouter(
+    prefix="/presupuestos",
+    tags=["Presupuestos"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
+
+
+# Una consulta: lee los contadores, no suma egresos
+@router.get(
+    "/",
+    response_model=List[PresupuestoOut],
+    dependencies=[Depends(presupuesto_consultas(2))],
+)
+def listar_presupuestos(usuario: dict = Depends(obtener_usuario_autenticado)):
+    """
+    Presupuestos del usuario con lo consumido y lo que queda en el mes en
+    curso. `estado` es "alerta" desde el umbral de aviso y "excedido" al
+    pasarse del monto.
+    """
+    return get_presupuestos_controller(usuario)
+
+
+@router.post("/", response_model=PresupuestoOut, status_code=201)
+def crear_presupuesto(
+    presupuesto: PresupuestoCreate, usuario: dict = Depends(obtener_usuario_autenticado)
+):
+    return post_presupuesto_controller(presupuesto, usuario)
+
+
+@router.put("/{presupuesto_id}", response_model=PresupuestoOut)
+def actualizar_presupuesto(
+    presupuesto_id: int,
+    presupuesto: PresupuestoUpdate,
+    usuario: dict = Depends(obtener_usuario_autenticado),
+):
+    return put_presupuesto_controller(presupuesto_id, presupuesto, usuario)
+
+
+@router.delete("/{presupuesto_id}")
+def eliminar_presupuesto(
+    presupuesto_id: int, usuario: dict = Depends(obtener_usuario_autenticado)
+):
+    return delete_presupuesto_controller(presupuesto_id, usuario)
@@ -1,28 +1,42 @@
 # app/routes/usuarioRoutes.py
 from fastapi import APIRouter, Depends
-from typing import List
+from typing import List, Optional
 from app.controllers.usuarioControllers import (
     get_usuarios_controller,
     get_usuario_controller,
     put_usuario_controller,
     delete_usuario_controller,
+    get_eliminacion_usuario_controller,
 )
 from app.services.auth_service import obtener_usuario_autenticado
+from app.routes.dependencias import enrutar_base_datos, campos_parciales
+from app.services.usuarioService import CAMPOS_USUARIO
 from app.schemas.usuario import UsuarioUpdate, UsuarioOut
+from app.middleware.serverTiming import RutaMedida
 
-router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
+router = APIRouter(
+    prefix="/usuarios",
+    tags=["Usuarios"],
+    dependencies=[Depends(enrutar_base_datos)],
+    route_class=RutaMedida,
+)
 
 
 @router.get("/", response_model=List[UsuarioOut])
-def listar_usuarios(usuario_auth: dict = Depends(obtener_usuario_autenticado)):
-    return get_usuarios_controller(usuario_auth)
+def listar_usuarios(
+    usuario_auth: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_USUARIO)),
+):
+    return get_usuarios_controller(usuario_auth, campos)
 
 
 @router.get("/{usuario_id}", response_model=UsuarioOut)
 def obtener_usuario(
-    usuario_id: int, usuario_auth: dict = Depends(obtener_usuario_autenticado)
+    usuario_id: int,
+    usuario_auth: dict = Depends(obtener_usuario_autenticado),
+    campos: Optional[List[str]] = Depends(campos_parciales(CAMPOS_USUARIO)),
 ):
-    return get_usuario_controller(usuario_id, usuario_auth)
+    return get_usuario_controller(usuario_id, usuario_auth, campos)
 
 
 @router.put("/{usuario_id}", response_model=UsuarioOut)
@@ -34,8 +48,16 @@ def actualizar_usuario(
     return put_usuario_controller(usuario_id, usuario, usuario_auth)
 
 
-@router.delete("/{usuario_id}")
+# La baja se procesa en segundo plano: responde 202 con el trabajo
+@router.delete("/{usuario_id}", status_code=202)
 def eliminar_usuario(
     usuario_id: int, usuario_auth: dict = Depends(obtener_usuario_autenticado)
 ):
     return delete_usuario_controller(usuario_id, usuario_auth)
+
+
+@router.get("/{usuario_id}/eliminacion")
+def obtener_eliminacion_usuario(
+    usuario_id: int, usuario_auth: dict = Depends(obtener_usuario_autenticado)
+):
+    return get_eliminacion_usuario_controller(usuario_id, usuario_auth)
@@ -12,6 +12,7 @@ class ActivoCreate(BaseModel):
     valor: float
     nombre: str
     flujo_mensual: Optional[float] = None
+    moneda: Optional[str] = None  # Sin moneda: la de reporte (MONEDA_REPORTE)
     # fk_usuarios: int # Se elimina este campo ya que se tomará del token
 
 
@@ -21,6 +22,7 @@ class ActivoUpdate(BaseModel):
     valor: Optional[float] = None
     nombre: Optional[str] = None
     flujo_mensual: Optional[float] = None
+    moneda: Optional[str] = None
 
 
 # Modelo para devolver datos (Output)
@@ -30,4 +32,5 @@ class ActivoOut(BaseModel):
     valor: float
     nombre: str
     flujo_mensual: Optional[float] = None
+    moneda: str
     fk_usuarios: int  # devuelve el ID del usuario, no el objeto
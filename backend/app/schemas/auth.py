@@ -12,6 +12,7 @@ class LoginRequest(BaseModel):  # Para la solicitud del login
 
 class LoginResponse(BaseModel):  # Para la respuesta de login exitoso
     access_token: str
+    refresh_token: str
     token_type: str
     usuario_id: int
     email: str
@@ -33,6 +34,16 @@ class RegisterRequest(BaseModel):  # Para el registro de un nuevo usuario
         }
 
 
+class RefreshRequest(BaseModel):  # Para pedir tokens nuevos
+    refresh_token: str
+
+
+class RefreshResponse(BaseModel):  # Tokens nuevos (el refresh token anterior ya no sirve)
+    access_token: str
+    refresh_token: str
+    token_type: str
+
+
 class TokenData(BaseModel):  # Para los datos del token decodificado
     usuario_id: int
     email: str
@@ -1,13 +1,15 @@
 # app/schemas/egreso.py
 from pydantic import BaseModel
-from typing import Optional
-from datetime import date
+from typing import List, Optional
+from datetime import date, datetime
+from app.schemas.presupuesto import PresupuestoOut
 
 
 class EgresoCreate(BaseModel):
     monto: float
     categoria: str
     fecha: date
+    moneda: Optional[str] = None  # Sin moneda: la de reporte (MONEDA_REPORTE)
     # fk_usuarios: int  # Se elimina este campo ya que se tomará del token
 
 
@@ -15,6 +17,7 @@ class EgresoUpdate(BaseModel):
     monto: Optional[float] = None
     categoria: Optional[str] = None
     fecha: Optional[date] = None
+    moneda: Optional[str] = None
 
 
 class EgresoOut(BaseModel):
@@ -22,4 +25,29 @@ class EgresoOut(BaseModel):
     monto: float
     categoria: str
     fecha: date
+    moneda: str
     fk_usuarios: int
+
+
+class AnomaliaEgreso(BaseModel):
+    """Egreso muy por encima de la media de su categoría (montos en la moneda de reporte)"""
+
+    categoria: str
+    monto: float
+    media: float  # De la categoría, antes de este egreso
+    desvio: float
+    puntaje_z: float  # (monto - media) / desvio
+    muestras: int  # Egresos de la categoría con los que se comparó
+
+
+class EgresoCreadoOut(EgresoOut):
+    anomalia: Optional[AnomaliaEgreso] = None
+    # Presupuestos que con este egreso pasaron el umbral de aviso o el monto
+    alertas_presupuesto: List[PresupuestoOut] = []
+
+
+class AnomaliaEgresoOut(AnomaliaEgreso):
+    id: int
+    egreso_id: int
+    fecha: date
+    creado: datetime
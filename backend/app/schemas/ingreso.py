@@ -9,6 +9,7 @@ class IngresoCreate(BaseModel):
     monto: float
     categoria: str
     fecha: date
+    moneda: Optional[str] = None  # Sin moneda: la de reporte (MONEDA_REPORTE)
     # fk_usuarios: int # Se elimina este campo ya que se tomará del token
 
 
@@ -17,6 +18,7 @@ class IngresoUpdate(BaseModel):
     monto: Optional[float] = None
     categoria: Optional[str] = None
     fecha: Optional[date] = None
+    moneda: Optional[str] = None
 
 
 # Modelo para devolver datos (Output)
@@ -25,4 +27,5 @@ class IngresoOut(BaseModel):
     monto: float
     categoria: str
     fecha: date
+    moneda: str
     fk_usuarios: int  # devuelve el ID del usuario, no el objeto
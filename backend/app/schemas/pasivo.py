@@ -17,6 +17,7 @@ class PasivoCreate(BaseModel):
     monto_total: float
     pago_mensual: float
     fecha_vencimiento: date
+    tasa_interes: Optional[float] = None  # Tasa nominal anual en %
 
 # Modelo para actualizaciones (input)
 class PasivoUpdate(BaseModel):
@@ -31,6 +32,7 @@ class PasivoUpdate(BaseModel):
     monto_total: Optional[float] = None
     pago_mensual: Optional[float] = None
     fecha_vencimiento: Optional[date] = None
+    tasa_interes: Optional[float] = None
 
 # Modelo para devolver datos (Output)
 class PasivoOut(BaseModel):
@@ -46,4 +48,5 @@ class PasivoOut(BaseModel):
     monto_total: float
     pago_mensual: float
     fecha_vencimiento: date
+    tasa_interes: Optional[float] = None
     fk_usuarios: int
\ No newline at end of file
@@ -0,0 +1,29 @@
+# app/schemas/presupuesto.py
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+
+class PresupuestoCreate(BaseModel):
+    categoria: str
+    monto_mensual: float
+    umbral_alerta: float = 0.8  # Avisa al consumir esta fracción del monto
+
+
+class PresupuestoUpdate(BaseModel):
+    categoria: Optional[str] = None
+    monto_mensual: Optional[float] = None
+    umbral_alerta: Optional[float] = None
+
+
+# Estado del presupuesto en el mes
+class PresupuestoOut(BaseModel):
+    id: int
+    categoria: str
+    mes: date
+    monto_mensual: float
+    umbral_alerta: float
+    consumido: float
+    restante: float
+    porcentaje: float
+    estado: str  # "ok", "alerta" o "excedido"
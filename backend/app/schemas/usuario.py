@@ -23,6 +23,5 @@ class UsuarioUpdate(BaseModel):
 class UsuarioOut(BaseModel):
     id: int
     nombre_completo: str
-    password: str
     email: str
     username: str
@@ -1,34 +1,36 @@
-from typing import List
+from typing import List, Optional
 from pony.orm import db_session, commit
 from app.models.activo import Activo
 from app.models.usuario import Usuario
+from app.services.outboxService import registrar_evento
+from app.services.proyeccionService import seleccionar_campos
+from app.services.tiposCambioService import validar_moneda
 from app.schemas.activo import ActivoCreate, ActivoUpdate
 
 
+# Columnas que se pueden pedir con ?fields= (las mismas que ActivoOut)
+CAMPOS_ACTIVO = [
+    "id",
+    "valor",
+    "tipo",
+    "nombre",
+    "flujo_mensual",
+    "moneda",
+    "fk_usuarios",
+]
+
+
 # GET ACTIVOS - Devuelve la lista de activos
 @db_session
-def get_activos_service(usuario_id: int) -> List[dict]:
-    """Obtiene todos los activos del usuario autenticado"""
+def get_activos_service(usuario_id: int, campos: Optional[List[str]] = None) -> List[dict]:
+    """Obtiene todos los activos del usuario autenticado (solo las columnas pedidas)"""
     try:
-
-        # Traer todos y filtrar manualmente
-        todos_activos = list(Activo.select().order_by(Activo.id))
-        activos = [p for p in todos_activos if p.fk_usuarios.id == usuario_id]
-
-        resultado = []
-        for activo in activos:
-            resultado.append(
-                {
-                    "id": activo.id,
-                    "valor": activo.valor,
-                    "tipo": activo.tipo,
-                    "nombre": activo.nombre,
-                    "flujo_mensual": activo.flujo_mensual,
-                    "fk_usuarios": activo.fk_usuarios.id,
-                }
-            )
-
-        return resultado
+        return seleccionar_campos(
+            "activos",
+            campos or CAMPOS_ACTIVO,
+            "fk_usuarios = $usuario_id",
+            {"usuario_id": usuario_id},
+        )
 
     except Exception as e:
         print(f"❌ Error en get_activos_service: {e}")
@@ -37,25 +39,19 @@ def get_activos_service(usuario_id: int) -> List[dict]:
 
 # GET ACTIVO - Obtener un activo por ID
 @db_session
-def get_activo_service(activo_id: int) -> dict:
+def get_activo_service(activo_id: int, campos: Optional[List[str]] = None) -> dict:
     """
     Obtiene un activo específico por ID.
     """
     try:
-        activo = Activo.get(id=activo_id)
+        filas = seleccionar_campos(
+            "activos", campos or CAMPOS_ACTIVO, "id = $activo_id", {"activo_id": activo_id}
+        )
 
-        if not activo:
+        if not filas:
             raise ValueError(f"Activo con ID {activo_id} no encontrado")
 
-        return {
-            "id": activo.id,
-            "valor": activo.valor,
-            "tipo": activo.tipo,
-            "nombre": activo.nombre,
-            "flujo_mensual": activo.flujo_mensual,
-            "fk_usuarios": activo.fk_usuarios.id,  # Extraer el ID del usuario
-        }
-
+        return filas[0]
     except ValueError:
         raise
     except Exception as e:
@@ -86,9 +82,12 @@ def post_activo_service(activo_data: ActivoCreate, usuario_id: int):
             tipo=activo_data.tipo,
             nombre=activo_data.nombre,
             flujo_mensual=activo_data.flujo_mensual,
+            moneda=validar_moneda(activo_data.moneda),
             fk_usuarios=usuario,
         )
 
+        registrar_evento("activo", "crear", nuevo_activo)
+
         commit()
 
         return {
@@ -97,6 +96,7 @@ def post_activo_service(activo_data: ActivoCreate, usuario_id: int):
             "tipo": nuevo_activo.tipo,
             "nombre": nuevo_activo.nombre,
             "flujo_mensual": nuevo_activo.flujo_mensual,
+            "moneda": nuevo_activo.moneda,
             "fk_usuarios": nuevo_activo.fk_usuarios.id,
         }
 
@@ -136,10 +136,16 @@ def put_activo_service(
         if "flujo_mensual" in datos and datos["flujo_mensual"] < 0:
             raise ValueError("El flujo mensual no puede ser negativo")
 
-        # Actualizar campos
+        if "moneda" in datos:
+            datos["moneda"] = validar_moneda(datos["moneda"])
+
+        # Actualizar campos (guardando cómo estaba para el outbox)
+        anterior = activo.to_dict()
         for campo, valor in datos.items():
             setattr(activo, campo, valor)
 
+        registrar_evento("activo", "actualizar", activo, anterior)
+
         commit()
 
         return {
@@ -148,6 +154,7 @@ def put_activo_service(
             "tipo": activo.tipo,
             "nombre": activo.nombre,
             "flujo_mensual": activo.flujo_mensual,
+            "moneda": activo.moneda,
             "fk_usuarios": activo.fk_usuarios.id,
         }
 
@@ -174,6 +181,7 @@ def delete_activo_service(activo_id: int, usuario_id: int):
         if activo.fk_usuarios.id != usuario_id:
             raise ValueError("No tienes permiso para eliminar este activo")
 
+        registrar_evento("activo", "eliminar", activo)
         activo.delete()
 
         commit()
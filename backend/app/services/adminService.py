@@ -0,0 +1,18 @@
+# app/services/adminService.py
+# Acceso a las herramientas de diagnóstico (/admin, perfilado de requests).
+#
+# No hay usuarios administradores: se usa un token compartido que se manda en
+# el header X-Admin-Token. Sin ADMIN_TOKEN definido, todo lo de admin queda
+# deshabilitado.
+import hmac
+import os
+from typing import Optional
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def es_token_admin(valor: Optional[str]) -> bool:
+    if not ADMIN_TOKEN or not valor:
+        return False
+    # compare_digest tarda lo mismo acierte o no (no da pistas del token)
+    return hmac.compare_digest(valor.encode(), ADMIN_TOKEN.encode())
@@ -0,0 +1,182 @@
+# app/services/amortizacionService.py
+# Cronogramas de amortización de los pasivos de un usuario.
+# Todos los pasivos se calculan juntos con NumPy: cada fila es un pasivo y
+# cada columna un mes, así no hay un bucle de Python por pasivo ni por mes.
+import calendar
+from datetime import date
+from typing import List
+import numpy as np
+from pony.orm import db_session
+from app.models.pasivo import Pasivo
+
+
+def sumar_meses(fecha: date, meses: int) -> date:
+    """Suma meses a una fecha ajustando el día al último día del mes si hace falta"""
+    total = fecha.month - 1 + meses
+    anio, mes = fecha.year + total // 12, total % 12 + 1
+    dia = min(fecha.day, calendar.monthrange(anio, mes)[1])
+    return date(anio, mes, dia)
+
+
+def calcular_cronogramas(saldos, pagos, tasas_anuales, meses: int) -> dict:
+    """
+    Calcula mes a mes el cronograma de varios pasivos a la vez.
+
+    Recibe arrays de igual largo (uno por pasivo):
+    - saldos: deuda pendiente hoy
+    - pagos: cuota mensual
+    - tasas_anuales: tasa nominal anual en % (0 si no tiene interés)
+
+    Usa la fórmula cerrada del saldo de un préstamo con cuota fija:
+        saldo_k = P * (1 + r)^k - M * ((1 + r)^k - 1) / r
+    evaluada para todos los pasivos y todos los meses en una matriz.
+
+    Devuelve matrices (pasivos x meses) de saldo, pago, interés y capital,
+    y por pasivo: meses para cancelar (-1 si no se cancela en el horizonte),
+    interés total y total pagado.
+    """
+    saldos = np.asarray(saldos, dtype=float)
+    pagos = np.asarray(pagos, dtype=float)
+    tasas = np.asarray(tasas_anuales, dtype=float) / 100 / 12
+
+    k = np.arange(meses + 1, dtype=float)  # mes 0 = hoy
+    factor = (1 + tasas[:, None]) ** k[None, :]
+
+    # Con tasa 0 la fórmula se vuelve P - k*M (se evita dividir por 0)
+    con_tasa = tasas[:, None] > 0
+    tasas_seguras = np.where(tasas > 0, tasas, 1.0)[:, None]
+    cuotas_acumuladas = np.where(
+        con_tasa, (factor - 1) / tasas_seguras, k[None, :]
+    )
+    saldo = saldos[:, None] * factor - pagos[:, None] * cuotas_acumuladas
+    saldo = np.maximum(saldo, 0.0)
+
+    saldo_anterior = saldo[:, :-1]
+    saldo_actual = saldo[:, 1:]
+    interes = saldo_anterior * tasas[:, None]
+    capital = saldo_anterior - saldo_actual
+    pago = capital + interes  # la última cuota puede ser menor a la mensual
+
+    cancelado = saldo_actual <= 0.005
+    se_cancela = cancelado.any(axis=1)
+    meses_para_cancelar = np.where(se_cancela, cancelado.argmax(axis=1) + 1, -1)
+
+    return {
+        "saldo": saldo_actual,
+        "pago": pago,
+        "interes": interes,
+        "capital": capital,
+        "meses_para_cancelar": meses_para_cancelar,
+        "interes_total": interes.sum(axis=1),
+        "total_pagado": pago.sum(axis=1),
+    }
+
+
+def cargar_pasivos_usuario(usuario_id: int) -> List[Pasivo]:
+    """Trae los pasivos del usuario filtrando en la BD (no en Python)"""
+    return list(
+        Pasivo.select_by_sql(
+            "SELECT * FROM pasivos WHERE fk_usuarios = $usuario_id ORDER BY id"
+        )
+    )
+
+
+# GET AMORTIZACIÓN - Cronograma de todos los pasivos del usuario
+@db_session
+def obtener_amortizacion_service(
+    usuario_id: int, meses_max: int = 360, detalle: bool = True
+) -> dict:
+    """
+    Calcula el cronograma de amortización de todos los pasivos del usuario.
+
+    El cronograma se devuelve por columnas (listas por mes) para que la
+    respuesta sea compacta aunque haya cientos de pasivos.
+    """
+    try:
+        pasivos = cargar_pasivos_usuario(usuario_id)
+        hoy = date.today()
+        fechas = [sumar_meses(hoy, m) for m in range(1, meses_max + 1)]
+
+        if not pasivos:
+            return {
+                "usuario_id": usuario_id,
+                "meses": fechas if detalle else [],
+                "pasivos": [],
+                "resumen": {
+                    "deuda_total": 0.0,
+                    "interes_total": 0.0,
+                    "fecha_ultima_cancelacion": None,
+                    "pasivos_sin_cancelar": 0,
+                },
+            }
+
+        resultado = calcular_cronogramas(
+            [p.monto_total for p in pasivos],
+            [p.pago_mensual for p in pasivos],
+            [p.tasa_interes or 0.0 for p in pasivos],
+            meses_max,
+        )
+
+        meses_para_cancelar = resultado["meses_para_cancelar"].tolist()
+        interes_total = np.round(resultado["interes_total"], 2).tolist()
+        total_pagado = np.round(resultado["total_pagado"], 2).tolist()
+        if detalle:
+            columnas = {
+                nombre: np.round(resultado[nombre], 2).tolist()
+                for nombre in ("pago", "interes", "capital", "saldo")
+            }
+
+        salida = []
+        for i, pasivo in enumerate(pasivos):
+            meses = meses_para_cancelar[i]
+            fecha_cancelacion = fechas[meses - 1] if meses > 0 else None
+
+            item = {
+                "pasivo_id": pasivo.id,
+                "nombre": pasivo.nombre,
+                "tipo": pasivo.tipo,
+                "saldo_inicial": pasivo.monto_total,
+                "pago_mensual": pasivo.pago_mensual,
+                "tasa_interes": pasivo.tasa_interes,
+                "meses_para_cancelar": meses if meses > 0 else None,
+                "fecha_cancelacion": fecha_cancelacion,
+                "cancela_antes_del_vencimiento": (
+                    fecha_cancelacion is not None
+                    and fecha_cancelacion <= pasivo.fecha_vencimiento
+                ),
+                "interes_total": interes_total[i],
+                "total_pagado": total_pagado[i],
+            }
+
+            if detalle:
+                # Se corta el cronograma en el mes en que se cancela la deuda
+                hasta = meses if meses > 0 else meses_max
+                item["cronograma"] = {
+                    nombre: valores[i][:hasta] for nombre, valores in columnas.items()
+                }
+
+            salida.append(item)
+
+        fechas_cancelacion = [
+            p["fecha_cancelacion"] for p in salida if p["fecha_cancelacion"]
+        ]
+
+        return {
+            "usuario_id": usuario_id,
+            "meses": fechas if detalle else [],
+            "pasivos": salida,
+            "resumen": {
+                "deuda_total": float(sum(p.monto_total for p in pasivos)),
+                "interes_total": round(float(resultado["interes_total"].sum()), 2),
+                "fecha_ultima_cancelacion": (
+                    max(fechas_cancelacion) if fechas_cancelacion else None
+                ),
+                "pasivos_sin_cancelar": sum(
+                    1 for p in salida if p["fecha_cancelacion"] is None
+                ),
+            },
+        }
+
+    except Exception as e:
+        print(f"❌ Error en obtener_amortizacion_service: {e}")
+        raise ValueError(str(e))
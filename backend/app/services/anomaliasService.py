@@ -0,0 +1,167 @@
+# app/services/anomaliasService.py
+# Egresos inusualmente altos para su categoría (ver
+# sql/008_anomalias_egresos.sql).
+#
+# Por usuario y categoría se guardan cantidad, media y m2 (algoritmo de
+# Welford), que se actualizan con cada alta, cambio o baja sin recorrer los
+# egresos. Un egreso nuevo es anomalía si, comparado con los anteriores de su
+# categoría, su puntaje z ((monto - media) / desvío) llega a ANOMALIAS_UMBRAL_Z.
+#
+# Lo llama egresoService antes de su commit(), en la misma transacción. Los
+# montos se comparan convertidos a la moneda de reporte.
+import os
+from typing import List, Optional
+from pony.orm import db_session
+from app.database.database import db
+from app.services.saldosService import SIN_CATEGORIA, clave_categoria
+from app.services.tiposCambioService import monto_en_reporte
+
+UMBRAL_Z = float(os.getenv("ANOMALIAS_UMBRAL_Z", "3"))
+# Con menos egresos anteriores en la categoría no se evalúa
+MIN_MUESTRAS = int(os.getenv("ANOMALIAS_MIN_MUESTRAS", "5"))
+# Piso del desvío (fracción de la media): con montos casi siempre iguales
+# (una suscripción) unos centavos de más no son una anomalía
+DESVIO_MINIMO = 0.05
+
+
+def _agregar(usuario_id: int, categoria: str, monto: float):
+    """Suma el monto a la categoría y devuelve (cantidad, media, m2) nuevos"""
+    return db.execute(
+        """
+        INSERT INTO estadisticas_egresos AS e (fk_usuarios, categoria, cantidad, media, m2)
+        VALUES ($usuario_id, $categoria, 1, $monto, 0)
+        ON CONFLICT (fk_usuarios, categoria) DO UPDATE
+        SET cantidad = e.cantidad + 1,
+            media = e.media + ($monto - e.media) / (e.cantidad + 1),
+            m2 = e.m2 + ($monto - e.media) * ($monto - e.media - ($monto - e.media) / (e.cantidad + 1))
+        RETURNING cantidad, media, m2
+        """
+    ).fetchone()
+
+
+def _quitar(usuario_id: int, categoria: str, monto: float):
+    """Welford al revés: saca el monto de la categoría"""
+    db.execute(
+        """
+        UPDATE estadisticas_egresos
+        SET cantidad = cantidad - 1,
+            media = CASE WHEN cantidad <= 1 THEN 0
+                         ELSE (cantidad * media - $monto) / (cantidad - 1) END,
+            m2 = CASE WHEN cantidad <= 2 THEN 0
+                      ELSE GREATEST(m2 - ($monto - media)
+                                    * ($monto - (cantidad * media - $monto) / (cantidad - 1)), 0) END
+        WHERE fk_usuarios = $usuario_id AND categoria = $categoria AND cantidad > 0
+        """
+    )
+
+
+def evaluar_egreso(usuario_id: int, egreso_id: int, datos: dict) -> Optional[dict]:
+    """
+    Suma un egreso nuevo a las estadísticas de su categoría y lo compara con
+    los anteriores. Si es anomalía la registra y la devuelve; si no, None.
+
+    IMPORTANTE: no hace commit (se llama antes del commit() del servicio).
+    """
+    categoria = clave_categoria(datos["categoria"])
+    monto = monto_en_reporte(datos)
+    cantidad, media, m2 = _agregar(usuario_id, categoria, monto)
+
+    # El upsert es una sola sentencia (no hay carreras entre altas
+    # simultáneas) y devuelve los valores nuevos: los de antes del egreso se
+    # despejan de las fórmulas de Welford
+    muestras = cantidad - 1
+    if muestras < max(MIN_MUESTRAS, 2):
+        return None
+    media_anterior = media - (monto - media) / muestras
+    m2_anterior = m2 - (monto - media_anterior) * (monto - media)
+    desvio = max(
+        (max(m2_anterior, 0.0) / (muestras - 1)) ** 0.5,
+        abs(media_anterior) * DESVIO_MINIMO,
+    )
+    if desvio == 0:
+        return None
+
+    puntaje_z = (monto - media_anterior) / desvio
+    if puntaje_z < UMBRAL_Z:
+        return None
+
+    anomalia = {
+        "categoria": categoria,
+        "monto": monto,
+        "media": round(media_anterior, 2),
+        "desvio": round(desvio, 2),
+        "puntaje_z": round(puntaje_z, 2),
+        "muestras": muestras,
+    }
+    db.execute(
+        """
+        INSERT INTO anomalias_egresos
+            (fk_usuarios, fk_egresos, categoria, monto, media, desvio, puntaje_z, muestras)
+        VALUES ($usuario_id, $egreso_id, $categoria, $monto, $media_anterior, $desvio,
+                $puntaje_z, $muestras)
+        """
+    )
+    return anomalia
+
+
+def actualizar_estadisticas(usuario_id: int, anterior: Optional[dict], nuevo: Optional[dict]):
+    """
+    Actualiza las estadísticas por la modificación o la baja (nuevo=None)
+    de un egreso, sin evaluarlo. Las altas van por evaluar_egreso().
+
+    IMPORTANTE: no hace commit (se llama antes del commit() del servicio).
+    """
+    if anterior is not None:
+        _quitar(usuario_id, clave_categoria(anterior["categoria"]), monto_en_reporte(anterior))
+    if nuevo is not None:
+        _agregar(usuario_id, clave_categoria(nuevo["categoria"]), monto_en_reporte(nuevo))
+
+
+def reconstruir_estadisticas(usuario_id: int):
+    """
+    Arma de cero las estadísticas del usuario a partir de sus egresos (igual
+    que la carga inicial de la migración). No hace commit.
+    """
+    sin_categoria = SIN_CATEGORIA
+    db.execute("DELETE FROM estadisticas_egresos WHERE fk_usuarios = $usuario_id")
+    db.execute(
+        """
+        INSERT INTO estadisticas_egresos (fk_usuarios, categoria, cantidad, media, m2)
+        SELECT $usuario_id, COALESCE(NULLIF(lower(trim(categoria)), ''), $sin_categoria),
+               count(*), avg(monto * tasa_cambio),
+               COALESCE(var_pop(monto * tasa_cambio) * count(*), 0)
+        FROM egresos
+        WHERE fk_usuarios = $usuario_id
+        GROUP BY 2
+        """
+    )
+
+
+@db_session
+def listar_anomalias(usuario_id: int, limite: int = 20) -> List[dict]:
+    """Las últimas anomalías del usuario, de la más nueva a la más vieja"""
+    filas = db.select(
+        """SELECT a.id, a.fk_egresos, a.categoria, a.monto, a.media, a.desvio,
+               a.puntaje_z, a.muestras, e.fecha, a.creado
+        FROM anomalias_egresos a
+        JOIN egresos e ON e.id = a.fk_egresos
+        WHERE a.fk_usuarios = $usuario_id
+        ORDER BY a.id DESC
+        LIMIT $limite
+        """
+    )
+    return [
+        {
+            "id": fila[0],
+            "egreso_id": fila[1],
+            "categoria": fila[2],
+            "monto": fila[3],
+            "media": round(fila[4], 2),
+            "desvio": round(fila[5], 2),
+            "puntaje_z": round(fila[6], 2),
+            "muestras": fila[7],
+            "fecha": fila[8],
+            "creado": fila[9],
+        }
+        for fila in filas
+    ]
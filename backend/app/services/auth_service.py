@@ -2,11 +2,20 @@
 # app/services/auth_service.py
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import uuid
 import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends
 from pony.orm import db_session
 from app.models.usuario import Usuario
+from app.models.sesion import RefreshToken
+from app.database.database import db
+from app.middleware.serverTiming import medir_etapa
+from app.services.revocacionService import (
+    esta_revocada,
+    lista_revocacion,
+    revocar_sesiones,
+)
 import os
 from dotenv import load_dotenv
 from pony.orm import commit
@@ -33,6 +42,10 @@ SECRET_KEY = os.getenv(
 # Duración del token (en minutos)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Duración del refresh token (en días). Con él se piden access tokens nuevos
+# sin volver a mandar la contraseña (y sin correr bcrypt)
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
 # Algoritmo JWT
 ALGORITHM = "HS256"  # Es el algoritmo estándar para firmar JWT
 
@@ -67,13 +80,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 # ========== FUNCIONES JWT ==========
 
 
-def create_access_token(usuario_id: int, email: str) -> str:
+def create_access_token(usuario_id: int, email: str, sesion: Optional[str] = None) -> str:
     """
     Crea un JWT token con información del usuario.
 
     ¿Qué contiene el token?
     - usuario_id: ID del usuario (para identificarlo)
     - email: Email del usuario (información adicional)
+    - sid: Sesión a la que pertenece (para poder revocarlo con logout)
     - exp: Fecha de expiración (token válido solo 30 minutos)
     - iat: Fecha de creación
 
@@ -93,6 +107,8 @@ def create_access_token(usuario_id: int, email: str) -> str:
         "exp": expire,
         "iat": datetime.now(timezone.utc),
     }
+    if sesion is not None:
+        to_encode["sid"] = sesion
 
     # Codificar y firmar el token
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -100,6 +116,29 @@ def create_access_token(usuario_id: int, email: str) -> str:
     return encoded_jwt
 
 
+def create_refresh_token(usuario_id: int, sesion: str) -> str:
+    """
+    Crea un refresh token de la sesión y lo guarda en la BD.
+
+    A diferencia del access token, se guarda: cada refresh token sirve una
+    sola vez (se "rota" en cada uso) y así se puede detectar si alguien usa
+    uno viejo. Se llama dentro de una db_session (no hace commit).
+    """
+    jti = uuid.uuid4().hex
+    expira = datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    RefreshToken(jti=jti, sesion=sesion, usuario_id=usuario_id, expira=expira)
+
+    to_encode = {
+        "tipo": "refresh",
+        "jti": jti,
+        "sid": sesion,
+        "usuario_id": usuario_id,
+        "exp": datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "iat": datetime.now(timezone.utc),
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
 def verify_token(token: str) -> dict:
     """
     Verifica que un token JWT sea válido y devuelve su contenido.
@@ -120,10 +159,16 @@ def verify_token(token: str) -> dict:
         )  # Extrae los datos del token decodificado
         email: str = payload.get("email")
 
-        if usuario_id is None or email is None:
+        # Un refresh token no sirve para entrar a los endpoints
+        if usuario_id is None or email is None or payload.get("tipo") == "refresh":
             raise HTTPException(status_code=401, detail="Token inválido")
 
-        return {"usuario_id": usuario_id, "email": email}
+        return {
+            "usuario_id": usuario_id,
+            "email": email,
+            "sesion": payload.get("sid"),
+            "expira": payload.get("exp"),  # Timestamp (segundos)
+        }
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
@@ -142,7 +187,8 @@ def login_usuario(email: str, password: str) -> dict:
     Proceso:
     1. Buscar el usuario por email en la BD
     2. Verificar que la contraseña coincida con el hash
-    3. Si todo es correcto, crear y devolver un token JWT
+    3. Si todo es correcto, abrir una sesión y devolver un token JWT
+       y un refresh token
     """
     try:
         usuario = Usuario.get(email=email)
@@ -156,11 +202,15 @@ def login_usuario(email: str, password: str) -> dict:
         if not verify_password(password, usuario.password):
             raise HTTPException(status_code=401, detail="Contraseña incorrecta")
 
-        # Crear token JWT
-        token = create_access_token(usuario.id, usuario.email)
+        # Crear token JWT y refresh token de una sesión nueva
+        sesion = uuid.uuid4().hex
+        token = create_access_token(usuario.id, usuario.email, sesion)
+        refresh_token = create_refresh_token(usuario.id, sesion)
+        commit()
 
         return {
             "access_token": token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "usuario_id": usuario.id,
             "email": usuario.email,
@@ -253,7 +303,17 @@ def cambiar_contraseña_usuario(
 
         # Actualizar en BD
         usuario.password = nueva_password_hasheada
+
+        # Cerrar todas las sesiones abiertas con la contraseña anterior
+        sesiones = revocar_sesiones(
+            db.select(
+                "SELECT DISTINCT sesion FROM refresh_tokens WHERE usuario_id = $usuario_id AND expira > $ahora",
+                {"usuario_id": usuario_id, "ahora": datetime.now()},
+            ),
+            _fin_de_sesion(),
+        )
         commit()
+        lista_revocacion.agregar(sesiones)
 
         return {
             "mensaje": "Contraseña cambiada correctamente",
@@ -268,6 +328,88 @@ def cambiar_contraseña_usuario(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ========== FUNCIONES DE SESIÓN (REFRESH Y LOGOUT) ==========
+
+
+def _fin_de_sesion() -> datetime:
+    # Ningún token de una sesión que se revoca ahora vive más que esto
+    return datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+@db_session
+def renovar_tokens(refresh_token: str) -> dict:
+    """
+    Cambia un refresh token por un access token y un refresh token nuevos
+    (rotación). El refresh token usado deja de servir.
+
+    Si llega un refresh token que YA se usó, alguien tiene una copia (el
+    dueño o un atacante, no se sabe cuál): se revoca la sesión entera y los
+    dos tienen que volver a hacer login.
+    """
+    try:
+        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise ValueError("Refresh token expirado")
+    except jwt.InvalidTokenError:
+        raise ValueError("Refresh token inválido")
+
+    jti, sesion = payload.get("jti"), payload.get("sid")
+    if payload.get("tipo") != "refresh" or not jti or not sesion:
+        raise ValueError("Refresh token inválido")
+    if esta_revocada(sesion):
+        raise ValueError("Sesión revocada, inicia sesión nuevamente")
+
+    # Marcarlo usado en un solo UPDATE: si llegan dos pedidos con el mismo
+    # token a la vez, solo uno lo consigue
+    ahora = datetime.now()
+    cursor = db.execute(
+        """
+        UPDATE refresh_tokens SET usado = $ahora
+        WHERE jti = $jti AND usado IS NULL AND expira > $ahora
+        RETURNING usuario_id
+        """
+    )
+    fila = cursor.fetchone()
+
+    if fila is None:
+        anterior = RefreshToken.get(jti=jti)
+        if anterior is not None and anterior.usado is not None:
+            sesiones = revocar_sesiones([sesion], _fin_de_sesion())
+            commit()
+            lista_revocacion.agregar(sesiones)
+            raise ValueError("Refresh token reutilizado, sesión revocada")
+        raise ValueError("Refresh token inválido")
+
+    usuario = Usuario.get(id=fila[0])
+    if usuario is None:
+        raise ValueError("Refresh token inválido")
+
+    nuevo_refresh = create_refresh_token(usuario.id, sesion)
+    commit()
+
+    return {
+        "access_token": create_access_token(usuario.id, usuario.email, sesion),
+        "refresh_token": nuevo_refresh,
+        "token_type": "bearer",
+    }
+
+
+@db_session
+def cerrar_sesion(sesion: Optional[str]) -> dict:
+    """
+    Logout: revoca la sesión del token. Sus access tokens dejan de servir
+    aunque no hayan vencido, y sus refresh tokens también.
+    """
+    if sesion is None:
+        raise ValueError("El token no pertenece a una sesión, no se puede revocar")
+
+    sesiones = revocar_sesiones([sesion], _fin_de_sesion())
+    commit()
+    lista_revocacion.agregar(sesiones)
+
+    return {"mensaje": "Sesión cerrada correctamente"}
+
+
 # ========== FUNCIONES PARA VALIDACIÓN DE TOKENS ==========
 
 
@@ -277,11 +419,16 @@ def obtener_usuario_del_token(token: str) -> dict:
     """
     try:
         datos_token = verify_token(token)
-        return datos_token
-
     except Exception as e:
         raise ValueError(f"Token inválido: {str(e)}")
 
+    # Logout, cambio de contraseña o refresh token robado. Casi siempre se
+    # resuelve en memoria (filtro de Bloom), sin ir a la BD
+    if esta_revocada(datos_token["sesion"]):
+        raise ValueError("Token inválido: la sesión fue cerrada")
+
+    return datos_token
+
 
 # Dependency de FastAPI para proteger rutas
 def obtener_usuario_autenticado(request: Request) -> dict:
@@ -306,9 +453,26 @@ def obtener_usuario_autenticado(request: Request) -> dict:
             raise HTTPException(status_code=403, detail="Token no proporcionado")
 
         token = auth_header.replace("Bearer ", "")
-        return obtener_usuario_del_token(token)
+        with medir_etapa("auth"):  # Para el header Server-Timing
+            return obtener_usuario_del_token(token)
 
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=403, detail="Token inválido o expirado")
+
+
+def obtener_usuario_autenticado_stream(
+    request: Request, token: Optional[str] = None
+) -> dict:
+    """
+    Igual que obtener_usuario_autenticado, pero también acepta el token como
+    parámetro ?token=... porque EventSource (SSE) no permite mandar headers.
+    """
+    if token and not request.headers.get("Authorization"):
+        try:
+            return obtener_usuario_del_token(token)
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+    return obtener_usuario_autenticado(request)
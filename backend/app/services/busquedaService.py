@@ -0,0 +1,128 @@
+# app/services/busquedaService.py
+# Búsqueda por texto en los nombres de activos y pasivos y en las categorías
+# de ingresos y egresos, con los índices de sql/004_busqueda_trigramas.sql:
+# - 3 letras o más: trigramas. El LIKE '%texto%' y el orden por parecido
+#   (<->) se resuelven con el índice GiST, sin recorrer todas las filas.
+# - 1 o 2 letras: los trigramas no sirven para ordenar, así que se buscan
+#   los textos que EMPIEZAN así, en orden alfabético (índice B-tree).
+from typing import List, Optional
+from pony.orm import db_session
+from app.database.database import db
+
+# tipo -> (tabla, columna donde se busca, columnas que se devuelven)
+FUENTES = {
+    "activo": ("activos", "nombre", "valor AS monto, NULL::date AS fecha"),
+    "pasivo": ("pasivos", "nombre", "monto_total AS monto, fecha_vencimiento AS fecha"),
+    "ingreso": ("ingresos", "categoria", "monto, fecha"),
+    "egreso": ("egresos", "categoria", "monto, fecha"),
+}
+
+# Con menos letras se busca por prefijo
+MINIMO_TRIGRAMAS = 3
+
+
+def _escapar_like(texto: str) -> str:
+    # Para que % y _ escritos por el usuario se busquen literalmente
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _consulta_fuente(tipo: str, por_prefijo: bool) -> str:
+    """
+    Consulta de una tabla, ya ordenada y cortada en $hasta filas.
+
+    Los ORDER BY repiten la expresión del índice para que PostgreSQL lo
+    recorra en orden y se detenga al llegar al LIMIT. Con trigramas hay
+    muchos empates (todos los egresos "comida" están a la misma distancia) y
+    desempatar por id obligaría a leerlos todos, por eso se numeran las filas
+    en el orden en que salen del índice (`posicion`) y la unión respeta ese
+    orden: así la página 2 continúa exactamente donde terminó la 1.
+    """
+    tabla, columna, extra = FUENTES[tipo]
+
+    if por_prefijo:
+        clave = f'lower({columna}) COLLATE "C"'
+        filtro, orden = f"{clave} LIKE $patron", f"{clave}, id"
+        distancia = "0.0::real"
+    else:
+        clave = "''"
+        filtro, orden = f"lower({columna}) LIKE $patron", f"lower({columna}) <-> $texto"
+        distancia = orden
+
+    return f"""(
+        SELECT s.*, row_number() OVER () AS posicion FROM (
+            SELECT '{tipo}' AS tipo, id, {columna} AS texto, {extra},
+                   {distancia} AS distancia, {clave} AS clave
+            FROM {tabla}
+            WHERE fk_usuarios = $usuario_id AND {filtro}
+            ORDER BY {orden}
+            LIMIT $hasta
+        ) s
+    )"""
+
+
+# GET BUSQUEDA - Resultados ordenados por parecido y paginados
+@db_session
+def buscar_service(
+    usuario_id: int,
+    q: str,
+    tipos: Optional[List[str]] = None,
+    pagina: int = 1,
+    limite: int = 20,
+) -> dict:
+    """
+    Busca `q` (sin distinguir mayúsculas) como parte del texto.
+    Los resultados más parecidos al texto buscado van primero.
+    """
+    texto = q.strip().lower()
+    if not texto:
+        raise ValueError("El texto a buscar no puede estar vacío")
+
+    tipos = tipos or list(FUENTES)
+    desconocidos = [t for t in tipos if t not in FUENTES]
+    if desconocidos:
+        raise ValueError(
+            f"Tipos inválidos: {', '.join(desconocidos)}. Opciones: {', '.join(FUENTES)}"
+        )
+
+    por_prefijo = len(texto) < MINIMO_TRIGRAMAS
+    patron = _escapar_like(texto) + "%"
+    if not por_prefijo:
+        patron = "%" + patron
+
+    desde = (pagina - 1) * limite
+    # Cada tabla trae hasta el final de la página pedida (+1 para saber si
+    # hay más); la unión se ordena igual y se corta la página
+    hasta = desde + limite + 1
+    por_pagina = limite + 1
+
+    union = "\n        UNION ALL\n        ".join(
+        _consulta_fuente(t, por_prefijo) for t in dict.fromkeys(tipos)
+    )
+    # Pony exige que la consulta empiece directamente con SELECT
+    filas = db.select(
+        f"""SELECT tipo, id, texto, monto, fecha, distancia
+        FROM (
+        {union}
+        ) t
+        ORDER BY distancia, clave, posicion, tipo
+        LIMIT $por_pagina OFFSET $desde
+        """
+    )
+
+    return {
+        "q": q,
+        "pagina": pagina,
+        "limite": limite,
+        "hay_mas": len(filas) > limite,
+        "resultados": [
+            {
+                "tipo": tipo,
+                "id": id,
+                "texto": contenido,
+                "monto": monto,
+                "fecha": fecha,
+                "puntaje": round(1 - distancia, 3),
+            }
+            for tipo, id, contenido, monto, fecha, distancia in filas[:limite]
+        ],
+    }
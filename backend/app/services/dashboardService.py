@@ -0,0 +1,117 @@
+# app/services/dashboardService.py
+# Todo lo que muestra el dashboard en una sola respuesta: análisis, gastos por
+# categoría, últimos movimientos, balance y pronóstico de egresos. Se calcula
+# en una sola db_session y a partir de los mismos agregados (cada tabla se
+# consulta una vez).
+from typing import Dict, List
+from pony.orm import db_session
+from app.database.database import db
+from app.services.motorInferenciaService import (
+    obtener_agregados_usuario,
+    evaluar_agregados,
+)
+from app.services.pronosticoService import pronosticar_egresos
+
+SECCIONES = ["analisis", "distribucion", "recientes", "balance", "pronostico"]
+
+# Secciones que salen de obtener_agregados_usuario
+SECCIONES_CON_AGREGADOS = {"analisis", "distribucion", "balance"}
+
+
+def obtener_movimientos_recientes(usuario_id: int, limite: int = 10) -> List[dict]:
+    """Últimos ingresos y egresos del usuario, mezclados y ordenados por fecha"""
+    # Pony exige que la consulta empiece directamente con SELECT
+    filas = db.select(
+        """SELECT tipo, id, monto, moneda, categoria, fecha FROM (
+            (SELECT 'ingreso' AS tipo, id, monto, moneda, categoria, fecha
+             FROM ingresos WHERE fk_usuarios = $usuario_id
+             ORDER BY fecha DESC, id DESC LIMIT $limite)
+            UNION ALL
+            (SELECT 'egreso' AS tipo, id, monto, moneda, categoria, fecha
+             FROM egresos WHERE fk_usuarios = $usuario_id
+             ORDER BY fecha DESC, id DESC LIMIT $limite)
+        ) t
+        ORDER BY fecha DESC, id DESC
+        LIMIT $limite
+        """
+    )
+    return [
+        {
+            "tipo": tipo,
+            "id": id,
+            "monto": monto,
+            "moneda": moneda,
+            "categoria": categoria,
+            "fecha": fecha,
+        }
+        for tipo, id, monto, moneda, categoria, fecha in filas
+    ]
+
+
+def _balance(agregados: Dict) -> dict:
+    activos = agregados["activos_por_tipo"]
+    pasivos = agregados["pasivos_por_tipo"]
+    total_activos = sum(a["valor"] for a in activos.values())
+    total_pasivos = sum(p["monto_total"] for p in pasivos.values())
+
+    return {
+        "activos": [
+            {"tipo": tipo, "valor": round(a["valor"], 2)} for tipo, a in activos.items()
+        ],
+        "pasivos": [
+            {"tipo": tipo, "monto_total": round(p["monto_total"], 2)}
+            for tipo, p in pasivos.items()
+        ],
+        "total_activos": round(total_activos, 2),
+        "total_pasivos": round(total_pasivos, 2),
+        "patrimonio_neto": round(total_activos - total_pasivos, 2),
+    }
+
+
+# GET DASHBOARD - Secciones pedidas por el cliente
+@db_session
+def obtener_dashboard_service(
+    usuario_id: int, secciones: List[str], dias: int = 30, limite_recientes: int = 10
+) -> dict:
+    """
+    Arma las secciones pedidas. Los agregados se calculan una sola vez y solo
+    si alguna sección los necesita.
+    """
+    desconocidas = [s for s in secciones if s not in SECCIONES]
+    if desconocidas:
+        raise ValueError(
+            f"Secciones inválidas: {', '.join(desconocidas)}. "
+            f"Opciones: {', '.join(SECCIONES)}"
+        )
+
+    agregados = None
+    if SECCIONES_CON_AGREGADOS & set(secciones):
+        agregados = obtener_agregados_usuario(usuario_id, dias)
+
+    resultado = {"usuario_id": usuario_id, "dias": dias}
+
+    if "analisis" in secciones:
+        resultado["analisis"] = evaluar_agregados(usuario_id, agregados)
+
+    if "distribucion" in secciones:
+        resultado["distribucion"] = [
+            {"categoria": categoria, "monto": monto}
+            for categoria, monto in agregados["egresos_por_categoria"].items()
+        ]
+
+    if "recientes" in secciones:
+        resultado["recientes"] = obtener_movimientos_recientes(
+            usuario_id, limite_recientes
+        )
+
+    if "balance" in secciones:
+        resultado["balance"] = _balance(agregados)
+
+    if "pronostico" in secciones:
+        # Egresos esperados del mes en curso; None si todavía no hay historia
+        try:
+            resultado["pronostico"] = pronosticar_egresos(usuario_id)["pronosticos"][0]
+        except ValueError:
+            resultado["pronostico"] = None
+
+    return resultado
@@ -1,34 +1,44 @@
 # app/services/egresoService.py
-from typing import List
+from typing import List, Optional
 from pony.orm import db_session, commit
 from app.models.egreso import Egreso
 from app.models.usuario import Usuario
+from app.services.outboxService import registrar_evento
+from app.services.saldosService import registrar_cambio
+from app.services.anomaliasService import (
+    evaluar_egreso,
+    actualizar_estadisticas,
+    listar_anomalias,
+)
+from app.services.recurrentesService import obtener_recurrentes, invalidar_recurrentes
+from app.services.presupuestoService import actualizar_consumos
+from app.services.proyeccionService import seleccionar_campos
+from app.services.tiposCambioService import tasa, validar_moneda
 from app.schemas.egreso import EgresoCreate, EgresoUpdate
 
 
+# Columnas que se pueden pedir con ?fields= (las mismas que EgresoOut)
+CAMPOS_EGRESO = [
+    "id",
+    "monto",
+    "categoria",
+    "fecha",
+    "moneda",
+    "fk_usuarios",
+]
+
+
 # GET EGRESOS - Devuelve la lista de egresos
 @db_session
-def get_egresos_service(usuario_id: int) -> List[dict]:
-    """Obtiene todos los egresos del usuario autenticado"""
+def get_egresos_service(usuario_id: int, campos: Optional[List[str]] = None) -> List[dict]:
+    """Obtiene todos los egresos del usuario autenticado (solo las columnas pedidas)"""
     try:
-
-        # Traer todos y filtrar manualmente
-        todos_egresos = list(Egreso.select().order_by(Egreso.id))
-        egresos = [p for p in todos_egresos if p.fk_usuarios.id == usuario_id]
-
-        resultado = []
-        for egreso in egresos:
-            resultado.append(
-                {
-                    "id": egreso.id,
-                    "monto": egreso.monto,
-                    "categoria": egreso.categoria,
-                    "fecha": egreso.fecha,
-                    "fk_usuarios": egreso.fk_usuarios.id,  # Extraer el ID del usuario
-                }
-            )
-
-        return resultado
+        return seleccionar_campos(
+            "egresos",
+            campos or CAMPOS_EGRESO,
+            "fk_usuarios = $usuario_id",
+            {"usuario_id": usuario_id},
+        )
 
     except Exception as e:
         print(f"❌ Error en get_egresos_service: {e}")
@@ -37,23 +47,19 @@ def get_egresos_service(usuario_id: int) -> List[dict]:
 
 # GET EGRESO - Obtener un egreso por ID
 @db_session
-def get_egreso_service(egreso_id: int) -> dict:
+def get_egreso_service(egreso_id: int, campos: Optional[List[str]] = None) -> dict:
     """
     Obtiene un egreso específico por su ID
     """
     try:
-        egreso = Egreso.get(id=egreso_id)
+        filas = seleccionar_campos(
+            "egresos", campos or CAMPOS_EGRESO, "id = $egreso_id", {"egreso_id": egreso_id}
+        )
 
-        if not egreso:
+        if not filas:
             raise ValueError("Egreso no encontrado")
 
-        return {
-            "id": egreso.id,
-            "monto": egreso.monto,
-            "categoria": egreso.categoria,
-            "fecha": egreso.fecha,
-            "fk_usuarios": egreso.fk_usuarios.id,  # Extraer el ID del usuario
-        }
+        return filas[0]
     except ValueError:
         raise
     except Exception as e:
@@ -75,22 +81,36 @@ def post_egreso_service(egreso_data: EgresoCreate, usuario_id: int):
         if not usuario:
             raise ValueError("Usuario no encontrado")
 
+        moneda = validar_moneda(egreso_data.moneda)
+
         # Crear el nuevo egreso
         nuevo_egreso = Egreso(
             monto=egreso_data.monto,
             categoria=egreso_data.categoria,
             fecha=egreso_data.fecha,
+            moneda=moneda,
+            tasa_cambio=tasa(moneda, egreso_data.fecha),
             fk_usuarios=usuario,  # Pasar el objeto usuario, no un ID
         )
 
+        registrar_evento("egreso", "crear", nuevo_egreso)
+        registrar_cambio("egreso", usuario_id, None, nuevo_egreso.to_dict())
+        # None salvo que el monto sea inusualmente alto para la categoría
+        anomalia = evaluar_egreso(usuario_id, nuevo_egreso.id, nuevo_egreso.to_dict())
+        alertas = actualizar_consumos(usuario_id, None, nuevo_egreso.to_dict())
+
         commit()
+        invalidar_recurrentes(usuario_id, None, nuevo_egreso.to_dict())
 
         return {
             "id": nuevo_egreso.id,
             "monto": nuevo_egreso.monto,
             "categoria": nuevo_egreso.categoria,
             "fecha": nuevo_egreso.fecha,
+            "moneda": nuevo_egreso.moneda,
             "fk_usuarios": nuevo_egreso.fk_usuarios.id,
+            "anomalia": anomalia,
+            "alertas_presupuesto": alertas,
         }
 
     except ValueError:
@@ -124,17 +144,30 @@ def put_egreso_service(egreso_id: int, data: EgresoUpdate, usuario_id: int) -> d
         if "monto" in datos and datos["monto"] <= 0:
             raise ValueError("El monto debe ser mayor a 0")
 
-        # Actualizar campos
+        if "moneda" in datos:
+            datos["moneda"] = validar_moneda(datos["moneda"])
+
+        # Actualizar campos (guardando cómo estaba para el outbox)
+        anterior = egreso.to_dict()
         for campo, valor in datos.items():
             setattr(egreso, campo, valor)
+        if "moneda" in datos or "fecha" in datos:
+            egreso.tasa_cambio = tasa(egreso.moneda, egreso.fecha)
+
+        registrar_evento("egreso", "actualizar", egreso, anterior)
+        registrar_cambio("egreso", usuario_id, anterior, egreso.to_dict())
+        actualizar_estadisticas(usuario_id, anterior, egreso.to_dict())
+        actualizar_consumos(usuario_id, anterior, egreso.to_dict())
 
         commit()
+        invalidar_recurrentes(usuario_id, anterior, egreso.to_dict())
 
         return {
             "id": egreso.id,
             "monto": egreso.monto,
             "categoria": egreso.categoria,
             "fecha": egreso.fecha,
+            "moneda": egreso.moneda,
             "fk_usuarios": egreso.fk_usuarios.id,
         }
 
@@ -161,9 +194,15 @@ def delete_egreso_service(egreso_id: int, usuario_id: int):
         if egreso.fk_usuarios.id != usuario_id:
             raise ValueError("No tienes permiso para eliminar este egreso")
 
+        eliminado = egreso.to_dict()
+        registrar_evento("egreso", "eliminar", egreso)
+        registrar_cambio("egreso", usuario_id, eliminado, None)
+        actualizar_estadisticas(usuario_id, eliminado, None)
+        actualizar_consumos(usuario_id, eliminado, None)
         egreso.delete()
 
         commit()
+        invalidar_recurrentes(usuario_id, eliminado, None)
 
         return {"mensaje": f"Egreso con ID {egreso_id} eliminado correctamente"}
 
@@ -172,3 +211,23 @@ def delete_egreso_service(egreso_id: int, usuario_id: int):
     except Exception as e:
         print("❌ Error en delete_egreso_service:", e)
         raise ValueError(f"Error al eliminar el egreso: {str(e)}")
+
+
+# GET ANOMALÍAS - Egresos inusualmente altos para su categoría
+def get_anomalias_service(usuario_id: int, limite: int = 20) -> List[dict]:
+    """Las últimas anomalías detectadas al crear egresos del usuario"""
+    try:
+        return listar_anomalias(usuario_id, limite)
+    except Exception as e:
+        print(f"❌ Error en get_anomalias_service: {e}")
+        raise ValueError(str(e))
+
+
+# GET RECURRENTES - Suscripciones, alquiler y demás egresos que se repiten
+def get_recurrentes_service(usuario_id: int) -> dict:
+    """Egresos recurrentes del usuario y su total anual"""
+    try:
+        return obtener_recurrentes(usuario_id)
+    except Exception as e:
+        print(f"❌ Error en get_recurrentes_service: {e}")
+        raise ValueError(str(e))
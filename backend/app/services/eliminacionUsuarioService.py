@@ -0,0 +1,227 @@
+# app/services/eliminacionUsuarioService.py
+# Baja de cuentas en segundo plano.
+#
+# usuario.delete() hace que Pony cargue en memoria TODOS los ingresos,
+# egresos, activos y pasivos del usuario y los borre de a uno, dentro de una
+# sola transacción: en una cuenta grande tarda mucho, usa mucha memoria y
+# deja las filas bloqueadas todo ese tiempo.
+#
+# Acá se borra con DELETE por conjuntos, en lotes de TAMANO_LOTE filas, cada
+# lote en su propia transacción corta (solo se bloquean las filas del lote,
+# que son todas del usuario que se va). El request solo registra el pedido;
+# el trabajo lo hace app/tareas/eliminacionUsuarios.py.
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from pony.orm import db_session, commit, desc
+from app.database.database import db
+from app.models.usuario import Usuario
+from app.models.eliminacion import EliminacionUsuario
+from app.services.auth_service import REFRESH_TOKEN_EXPIRE_DAYS
+from app.services.revocacionService import lista_revocacion, revocar_sesiones
+
+TAMANO_LOTE = int(os.getenv("ELIMINACION_TAMANO_LOTE", "5000"))
+
+# Si un trabajo "en_curso" no avanza en este tiempo, el proceso que lo tenía
+# se cayó y otro lo puede retomar
+TRABAJO_VENCIDO = timedelta(
+    seconds=int(os.getenv("ELIMINACION_TRABAJO_VENCIDO_SEGUNDOS", "300"))
+)
+
+# (tabla, columna con el ID del usuario), en el orden en que se borran.
+# Al agregar una tabla con datos de usuario hay que sumarla acá.
+TABLAS_USUARIO = [
+    ("ingresos", "fk_usuarios"),
+    ("anomalias_egresos", "fk_usuarios"),
+    ("egresos", "fk_usuarios"),
+    ("pasivos", "fk_usuarios"),
+    ("activos", "fk_usuarios"),
+    ("patrimonio_diario", "fk_usuarios"),
+    ("saldos_diarios", "fk_usuarios"),
+    ("estadisticas_egresos", "fk_usuarios"),
+    ("presupuestos", "fk_usuarios"),  # Sus consumos se borran en cascada
+    ("refresh_tokens", "usuario_id"),
+    ("escrituras_recientes", "fk_usuarios"),
+]
+
+# Avisa al trabajador que hay un pedido nuevo (para no esperar al intervalo)
+hay_trabajo = threading.Event()
+
+
+def _a_dict(trabajo: EliminacionUsuario) -> dict:
+    if trabajo.total:
+        progreso = round(min(trabajo.borradas, trabajo.total) / trabajo.total * 100, 1)
+    else:
+        progreso = 100.0 if trabajo.estado == "completado" else 0.0
+
+    return {
+        "id": trabajo.id,
+        "usuario_id": trabajo.usuario_id,
+        "estado": trabajo.estado,
+        "progreso": progreso,
+        "borradas": trabajo.borradas,
+        "total": trabajo.total,
+        "tabla": trabajo.tabla,
+        "error": trabajo.error,
+        "creado": trabajo.creado,
+        "actualizado": trabajo.actualizado,
+    }
+
+
+# DELETE USUARIO - Registra el pedido de baja
+@db_session
+def solicitar_eliminacion(usuario_id: int) -> dict:
+    """
+    Registra la baja de la cuenta y devuelve el trabajo (su avance se
+    consulta con obtener_eliminacion). Si ya hay una baja en curso para el
+    usuario, devuelve esa.
+    """
+    if not Usuario.exists(id=usuario_id):
+        raise ValueError(f"Usuario con ID {usuario_id} no encontrado")
+
+    activo = EliminacionUsuario.select(
+        lambda e: e.usuario_id == usuario_id and e.estado in ("pendiente", "en_curso")
+    ).first()
+    if activo is not None:
+        return _a_dict(activo)
+
+    trabajo = EliminacionUsuario(usuario_id=usuario_id)
+    # Desde ya se cierran las sesiones de la cuenta (los access tokens y los
+    # streams abiertos dejan de servir) y no se pueden renovar, así nada
+    # vuelve a escribir datos del usuario mientras se borran
+    ahora = datetime.now()
+    sesiones = revocar_sesiones(
+        db.select(
+            "SELECT DISTINCT sesion FROM refresh_tokens WHERE usuario_id = $usuario_id AND expira > $ahora"
+        ),
+        ahora + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    db.execute("DELETE FROM refresh_tokens WHERE usuario_id = $usuario_id")
+    commit()
+    lista_revocacion.agregar(sesiones)
+
+    hay_trabajo.set()
+    return _a_dict(trabajo)
+
+
+# GET ELIMINACION - Avance de la última baja pedida
+@db_session
+def obtener_eliminacion(usuario_id: int) -> dict:
+    trabajo = (
+        EliminacionUsuario.select(lambda e: e.usuario_id == usuario_id)
+        .order_by(desc(EliminacionUsuario.id))
+        .first()
+    )
+    if trabajo is None:
+        raise ValueError(f"Baja de cuenta del usuario {usuario_id} no encontrada")
+    return _a_dict(trabajo)
+
+
+# ========== PASOS DEL TRABAJO (los usa app/tareas/eliminacionUsuarios.py) ==========
+
+
+@db_session
+def tomar_trabajo() -> Optional[Tuple[int, int]]:
+    """
+    Toma el pedido pendiente más viejo (o uno abandonado) y lo marca
+    "en_curso". Devuelve (trabajo_id, usuario_id) o None.
+
+    FOR UPDATE SKIP LOCKED: si hay varios procesos, cada uno toma un
+    pedido distinto sin esperarse entre ellos.
+    """
+    ahora = datetime.now()
+    vencido = ahora - TRABAJO_VENCIDO
+    fila = db.execute(
+        """
+        UPDATE eliminaciones_usuario SET estado = 'en_curso', actualizado = $ahora
+        WHERE id = (
+            SELECT id FROM eliminaciones_usuario
+            WHERE estado = 'pendiente' OR (estado = 'en_curso' AND actualizado < $vencido)
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, usuario_id
+        """
+    ).fetchone()
+    return (fila[0], fila[1]) if fila else None
+
+
+@db_session
+def contar_filas(trabajo_id: int, usuario_id: int) -> int:
+    """Cuenta las filas a borrar (solo la primera vez, al retomar se conservan)"""
+    trabajo = EliminacionUsuario[trabajo_id]
+    if trabajo.total or trabajo.borradas:
+        return trabajo.total
+
+    total = 0
+    for tabla, columna in TABLAS_USUARIO:
+        total += db.select(
+            f"SELECT count(*) FROM {tabla} WHERE {columna} = $usuario_id"
+        )[0]
+    trabajo.total = total
+    trabajo.actualizado = datetime.now()
+    return trabajo.total
+
+
+@db_session
+def borrar_lote(trabajo_id: int, usuario_id: int, tabla: str, columna: str) -> int:
+    """
+    Borra hasta TAMANO_LOTE filas del usuario en la tabla y suma el avance
+    (en la misma transacción, así el avance nunca miente). Devuelve cuántas
+    borró.
+
+    `ctid = ANY(ARRAY(...))` borra por ubicación física de la fila: funciona
+    en cualquier tabla (tenga o no columna id) y PostgreSQL lo resuelve
+    yendo directo a cada fila, sin recorrer la tabla.
+    """
+    lote = TAMANO_LOTE
+    cursor = db.execute(
+        f"""
+        DELETE FROM {tabla}
+        WHERE ctid = ANY(ARRAY(
+            SELECT ctid FROM {tabla} WHERE {columna} = $usuario_id LIMIT $lote
+        ))
+        """
+    )
+    borradas = cursor.rowcount
+    ahora = datetime.now()
+    db.execute(
+        """
+        UPDATE eliminaciones_usuario
+        SET borradas = borradas + $borradas, tabla = $tabla, actualizado = $ahora
+        WHERE id = $trabajo_id
+        """
+    )
+    return borradas
+
+
+@db_session
+def finalizar_eliminacion(trabajo_id: int, usuario_id: int):
+    """
+    Último paso, en una sola transacción: borra lo que el usuario haya
+    cargado mientras tanto (pocas filas) y al usuario.
+    """
+    restantes = 0
+    for tabla, columna in TABLAS_USUARIO:
+        restantes += db.execute(
+            f"DELETE FROM {tabla} WHERE {columna} = $usuario_id"
+        ).rowcount
+    db.execute("DELETE FROM usuarios WHERE id = $usuario_id")
+
+    trabajo = EliminacionUsuario[trabajo_id]
+    trabajo.borradas += restantes
+    trabajo.total = max(trabajo.total, trabajo.borradas)
+    trabajo.estado = "completado"
+    trabajo.tabla = None
+    trabajo.actualizado = datetime.now()
+
+
+@db_session
+def marcar_trabajo(trabajo_id: int, estado: str, error: Optional[str] = None):
+    """Deja el trabajo en `estado` ("pendiente" para que se retome, o "error")"""
+    trabajo = EliminacionUsuario[trabajo_id]
+    trabajo.estado = estado
+    trabajo.error = error
+    trabajo.actualizado = datetime.now()
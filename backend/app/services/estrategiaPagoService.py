@@ -0,0 +1,215 @@
+# app/services/estrategiaPagoService.py
+# Compara estrategias para cancelar deudas con un presupuesto mensual fijo:
+# - avalancha: primero la deuda con mayor tasa de interés
+# - bola de nieve: primero la deuda con menor saldo
+# - personalizada: el orden que elija el usuario
+# Todas las estrategias se simulan juntas con NumPy (estrategias x pasivos).
+from datetime import date
+from typing import List, Optional
+import numpy as np
+from pony.orm import db_session
+from app.services.amortizacionService import cargar_pasivos_usuario, sumar_meses
+
+
+def simular_estrategias(
+    saldos, pagos_minimos, tasas_anuales, presupuesto: float, ordenes, meses: int
+) -> dict:
+    """
+    Simula mes a mes varias estrategias de pago al mismo tiempo.
+
+    - ordenes: una lista de prioridades por estrategia (índices de pasivos,
+      el primero es el que recibe el excedente antes). Un orden None significa
+      "pagar solo los mínimos" y sirve como referencia.
+
+    Cada mes: se suma el interés, se pagan los mínimos de todas las deudas y
+    lo que sobra del presupuesto va a las deudas en el orden de prioridad.
+    Cuando una deuda se cancela, su cuota queda libre para las siguientes.
+
+    Devuelve arrays por estrategia: pagos (meses x estrategias x pasivos),
+    mes de cancelación de cada pasivo (-1 si no se cancela) e interés total.
+    """
+    saldos = np.asarray(saldos, dtype=float)
+    pagos_minimos = np.asarray(pagos_minimos, dtype=float)
+    tasas = np.asarray(tasas_anuales, dtype=float) / 100 / 12
+    cantidad = len(ordenes)
+    n = saldos.size
+
+    # Prioridad de cada estrategia como permutación de los pasivos
+    solo_minimos = np.array([orden is None for orden in ordenes])
+    permutaciones = np.array(
+        [np.arange(n) if orden is None else np.asarray(orden) for orden in ordenes]
+    ).reshape(cantidad, n)
+    inversas = np.argsort(permutaciones, axis=1)
+
+    saldo = np.tile(saldos, (cantidad, 1))
+    pagos = np.zeros((meses, cantidad, n))
+    interes_total = np.zeros((cantidad, n))
+    mes_cancelacion = np.full((cantidad, n), -1)
+    ultimo_mes = 0
+
+    for mes in range(meses):
+        activos = saldo > 0.005
+        if not activos.any():
+            break
+        ultimo_mes = mes + 1
+
+        interes = saldo * tasas
+        interes_total += interes
+        saldo += interes
+
+        minimo = np.minimum(pagos_minimos, saldo)
+        excedente = presupuesto - minimo.sum(axis=1)
+        excedente[solo_minimos] = 0.0
+        restante = saldo - minimo
+
+        # Repartir el excedente en orden de prioridad con una suma acumulada
+        restante_ordenado = np.take_along_axis(restante, permutaciones, axis=1)
+        acumulado = np.cumsum(restante_ordenado, axis=1)
+        extra_ordenado = np.clip(
+            excedente[:, None] - (acumulado - restante_ordenado),
+            0.0,
+            restante_ordenado,
+        )
+        extra = np.take_along_axis(extra_ordenado, inversas, axis=1)
+
+        pago = minimo + extra
+        saldo -= pago
+        pagos[mes] = pago
+
+        recien_canceladas = activos & (saldo <= 0.005)
+        mes_cancelacion[recien_canceladas] = mes + 1
+        saldo[saldo <= 0.005] = 0.0
+
+    return {
+        "pagos": pagos[:ultimo_mes],
+        "mes_cancelacion": mes_cancelacion,
+        "interes_total": interes_total,
+    }
+
+
+def _orden_avalancha(pasivos) -> List[int]:
+    return sorted(
+        range(len(pasivos)),
+        key=lambda i: (-(pasivos[i].tasa_interes or 0.0), pasivos[i].monto_total),
+    )
+
+
+def _orden_bola_de_nieve(pasivos) -> List[int]:
+    return sorted(
+        range(len(pasivos)),
+        key=lambda i: (pasivos[i].monto_total, -(pasivos[i].tasa_interes or 0.0)),
+    )
+
+
+# GET ESTRATEGIAS - Compara avalancha, bola de nieve y orden personalizado
+@db_session
+def comparar_estrategias_service(
+    usuario_id: int,
+    presupuesto_mensual: float,
+    orden_personalizado: Optional[List[int]] = None,
+    meses_max: int = 360,
+) -> dict:
+    """
+    Simula las estrategias de pago sobre los pasivos del usuario y devuelve,
+    para cada una, el interés total, las fechas de cancelación y cuánto se
+    paga a cada pasivo mes a mes.
+    """
+    try:
+        pasivos = cargar_pasivos_usuario(usuario_id)
+        if not pasivos:
+            raise ValueError("El usuario no tiene pasivos registrados")
+
+        pagos_minimos = [p.pago_mensual for p in pasivos]
+        if presupuesto_mensual < sum(pagos_minimos):
+            raise ValueError(
+                f"El presupuesto mensual no alcanza para cubrir los pagos mínimos "
+                f"(${sum(pagos_minimos):,.2f})"
+            )
+
+        estrategias = {
+            "avalancha": _orden_avalancha(pasivos),
+            "bola_de_nieve": _orden_bola_de_nieve(pasivos),
+        }
+
+        if orden_personalizado:
+            posiciones = {p.id: i for i, p in enumerate(pasivos)}
+            desconocidos = [i for i in orden_personalizado if i not in posiciones]
+            if desconocidos:
+                raise ValueError(f"Pasivos no encontrados: {desconocidos}")
+            # Los pasivos que no se mencionan van al final, en orden avalancha
+            elegidos = list(dict.fromkeys(posiciones[i] for i in orden_personalizado))
+            resto = [i for i in estrategias["avalancha"] if i not in elegidos]
+            estrategias["personalizada"] = elegidos + resto
+
+        nombres = list(estrategias) + ["solo_minimos"]
+        resultado = simular_estrategias(
+            [p.monto_total for p in pasivos],
+            pagos_minimos,
+            [p.tasa_interes or 0.0 for p in pasivos],
+            presupuesto_mensual,
+            list(estrategias.values()) + [None],
+            meses_max,
+        )
+
+        hoy = date.today()
+        meses_simulados = resultado["pagos"].shape[0]
+        fechas = [sumar_meses(hoy, m) for m in range(1, meses_simulados + 1)]
+        interes_minimos = float(resultado["interes_total"][-1].sum())
+        # Si pagando solo los mínimos alguna deuda no se cancela, el ahorro
+        # de intereses no es comparable (depende del horizonte elegido)
+        minimos_cancelan = bool((resultado["mes_cancelacion"][-1] > 0).all())
+
+        salida = []
+        for e, nombre in enumerate(nombres):
+            cancelacion = resultado["mes_cancelacion"][e].tolist()
+            interes = resultado["interes_total"][e]
+            se_cancela_todo = min(cancelacion) > 0
+            meses_total = max(cancelacion) if se_cancela_todo else None
+
+            estrategia = {
+                "estrategia": nombre,
+                "orden": (
+                    [pasivos[i].id for i in estrategias[nombre]]
+                    if nombre in estrategias
+                    else None
+                ),
+                "interes_total": round(float(interes.sum()), 2),
+                "ahorro_vs_solo_minimos": (
+                    round(interes_minimos - float(interes.sum()), 2)
+                    if minimos_cancelan
+                    else None
+                ),
+                "meses_para_cancelar_todo": meses_total,
+                "fecha_fin": fechas[meses_total - 1] if meses_total else None,
+                "pasivos": [
+                    {
+                        "pasivo_id": p.id,
+                        "nombre": p.nombre,
+                        "meses_para_cancelar": cancelacion[i] if cancelacion[i] > 0 else None,
+                        "fecha_cancelacion": (
+                            fechas[cancelacion[i] - 1] if cancelacion[i] > 0 else None
+                        ),
+                        "interes_total": round(float(interes[i]), 2),
+                    }
+                    for i, p in enumerate(pasivos)
+                ],
+                # Filas = meses, columnas = pasivos (en el orden de "pasivo_ids")
+                "asignacion_mensual": np.round(
+                    resultado["pagos"][: meses_total or meses_simulados, e], 2
+                ).tolist(),
+            }
+            salida.append(estrategia)
+
+        return {
+            "usuario_id": usuario_id,
+            "presupuesto_mensual": presupuesto_mensual,
+            "pasivo_ids": [p.id for p in pasivos],
+            "meses": fechas,
+            "estrategias": salida,
+        }
+
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"❌ Error en comparar_estrategias_service: {e}")
+        raise ValueError(str(e))
@@ -1,34 +1,37 @@
 # app/services/ingresoService.py
-from typing import List
+from typing import List, Optional
 from pony.orm import db_session, commit
 from app.models.ingreso import Ingreso
 from app.models.usuario import Usuario
+from app.services.outboxService import registrar_evento
+from app.services.saldosService import registrar_cambio
+from app.services.proyeccionService import seleccionar_campos
+from app.services.tiposCambioService import tasa, validar_moneda
 from app.schemas.ingreso import IngresoCreate, IngresoUpdate
 
 
+# Columnas que se pueden pedir con ?fields= (las mismas que IngresoOut)
+CAMPOS_INGRESO = [
+    "id",
+    "monto",
+    "categoria",
+    "fecha",
+    "moneda",
+    "fk_usuarios",
+]
+
+
 # GET INGRESOS - Devuelve la lista de ingresos
 @db_session
-def get_ingresos_service(usuario_id: int) -> List[dict]:
-    """Obtiene todos los ingresos del usuario autenticado"""
+def get_ingresos_service(usuario_id: int, campos: Optional[List[str]] = None) -> List[dict]:
+    """Obtiene todos los ingresos del usuario autenticado (solo las columnas pedidas)"""
     try:
-
-        # Traer todos y filtrar manualmente
-        todos_ingresos = list(Ingreso.select().order_by(Ingreso.id))
-        ingresos = [p for p in todos_ingresos if p.fk_usuarios.id == usuario_id]
-
-        resultado = []
-        for ingreso in ingresos:
-            resultado.append(
-                {
-                    "id": ingreso.id,
-                    "monto": ingreso.monto,
-                    "categoria": ingreso.categoria,
-                    "fecha": ingreso.fecha,
-                    "fk_usuarios": ingreso.fk_usuarios.id,  # Extraer el ID del usuario
-                }
-            )
-
-        return resultado
+        return seleccionar_campos(
+            "ingresos",
+            campos or CAMPOS_INGRESO,
+            "fk_usuarios = $usuario_id",
+            {"usuario_id": usuario_id},
+        )
 
     except Exception as e:
         print(f"❌ Error en get_ingresos_service: {e}")
@@ -37,23 +40,19 @@ def get_ingresos_service(usuario_id: int) -> List[dict]:
 
 # GET INGRESO - Obtener un ingreso por ID
 @db_session
-def get_ingreso_service(ingreso_id: int) -> dict:
+def get_ingreso_service(ingreso_id: int, campos: Optional[List[str]] = None) -> dict:
     """
     Obtiene un ingreso específico por su ID
     """
     try:
-        ingreso = Ingreso.get(id=ingreso_id)
+        filas = seleccionar_campos(
+            "ingresos", campos or CAMPOS_INGRESO, "id = $ingreso_id", {"ingreso_id": ingreso_id}
+        )
 
-        if not ingreso:
+        if not filas:
             raise ValueError("Ingreso no encontrado")
 
-        return {
-            "id": ingreso.id,
-            "monto": ingreso.monto,
-            "categoria": ingreso.categoria,
-            "fecha": ingreso.fecha,
-            "fk_usuarios": ingreso.fk_usuarios.id,  # Extraer el ID del usuario
-        }
+        return filas[0]
     except ValueError:
         raise
     except Exception as e:
@@ -75,14 +74,21 @@ def post_ingreso_service(ingreso_data: IngresoCreate, usuario_id: int):
         if not usuario:
             raise ValueError("Usuario no encontrado")
 
+        moneda = validar_moneda(ingreso_data.moneda)
+
         # Crear el nuevo ingreso
         nuevo_ingreso = Ingreso(
             monto=ingreso_data.monto,
             categoria=ingreso_data.categoria,
             fecha=ingreso_data.fecha,
+            moneda=moneda,
+            tasa_cambio=tasa(moneda, ingreso_data.fecha),
             fk_usuarios=usuario,  # Pasar el objeto usuario, no un ID
         )
 
+        registrar_evento("ingreso", "crear", nuevo_ingreso)
+        registrar_cambio("ingreso", usuario_id, None, nuevo_ingreso.to_dict())
+
         commit()
 
         return {
@@ -90,6 +96,7 @@ def post_ingreso_service(ingreso_data: IngresoCreate, usuario_id: int):
             "monto": nuevo_ingreso.monto,
             "categoria": nuevo_ingreso.categoria,
             "fecha": nuevo_ingreso.fecha,
+            "moneda": nuevo_ingreso.moneda,
             "fk_usuarios": nuevo_ingreso.fk_usuarios.id,
         }
 
@@ -126,9 +133,18 @@ def put_ingreso_service(
         if "monto" in datos and datos["monto"] <= 0:
             raise ValueError("El monto debe ser mayor a 0")
 
-        # Actualizar campos
+        if "moneda" in datos:
+            datos["moneda"] = validar_moneda(datos["moneda"])
+
+        # Actualizar campos (guardando cómo estaba para el outbox)
+        anterior = ingreso.to_dict()
         for campo, valor in datos.items():
             setattr(ingreso, campo, valor)
+        if "moneda" in datos or "fecha" in datos:
+            ingreso.tasa_cambio = tasa(ingreso.moneda, ingreso.fecha)
+
+        registrar_evento("ingreso", "actualizar", ingreso, anterior)
+        registrar_cambio("ingreso", usuario_id, anterior, ingreso.to_dict())
 
         commit()
 
@@ -137,6 +153,7 @@ def put_ingreso_service(
             "monto": ingreso.monto,
             "categoria": ingreso.categoria,
             "fecha": ingreso.fecha,
+            "moneda": ingreso.moneda,
             "fk_usuarios": ingreso.fk_usuarios.id,
         }
 
@@ -163,6 +180,8 @@ def delete_ingreso_service(ingreso_id: int, usuario_id: int):
         if ingreso.fk_usuarios.id != usuario_id:
             raise ValueError("No tienes permiso para eliminar este ingreso")
 
+        registrar_evento("ingreso", "eliminar", ingreso)
+        registrar_cambio("ingreso", usuario_id, ingreso.to_dict(), None)
         ingreso.delete()
 
         commit()
@@ -0,0 +1,41 @@
+# app/services/librosService.py
+# Los libros que se mantienen con cada alta, cambio o baja de un movimiento,
+# en la misma transacción:
+# - saldos_diarios (saldosService): ingresos y egresos acumulados por día
+# - estadisticas_egresos (anomaliasService): media y desvío por categoría
+# - consumos_presupuesto (presupuestoService): lo gastado por mes
+#
+# Todos guardan montos en la moneda de reporte (monto * tasa_cambio). Si
+# cambia el tipo de cambio de movimientos que ya existen, o se cargaron
+# datos por fuera de los services, se arman de cero desde los movimientos.
+from typing import Set
+from pony.orm import db_session
+from app.services.saldosService import reconstruir_saldos
+from app.services.anomaliasService import reconstruir_estadisticas
+from app.services.presupuestoService import reconstruir_consumos
+from app.services.tiposCambioService import sincronizar_tipos_cambio
+
+
+@db_session
+def reconstruir_libros(usuario_id: int) -> dict:
+    """Arma de cero los libros del usuario. Devuelve las filas del libro diario"""
+    filas = reconstruir_saldos(usuario_id)
+    reconstruir_estadisticas(usuario_id)
+    # Los contadores se arman con el libro diario ya rearmado
+    reconstruir_consumos(usuario_id)
+    return {"usuario_id": usuario_id, "filas_saldos_diarios": filas}
+
+
+@db_session
+def aplicar_tipos_cambio() -> Set[int]:
+    """
+    Sincroniza la tabla tipos_cambio con el archivo (al arrancar) y, si
+    cambió el tipo de cambio de movimientos que ya existen, arma de cero los
+    libros de sus usuarios en la misma transacción. Devuelve esos usuarios.
+    """
+    usuarios = sincronizar_tipos_cambio()
+    for usuario_id in sorted(usuarios):
+        reconstruir_libros(usuario_id)
+    if usuarios:
+        print(f"💱 Tipos de cambio nuevos: libros rearmados de {len(usuarios)} usuarios")
+    return usuarios
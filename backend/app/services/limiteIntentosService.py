@@ -0,0 +1,134 @@
+# app/services/limiteIntentosService.py
+# Límite de intentos (rate limiting) para los endpoints de autenticación.
+#
+# Cada intento de login corre bcrypt, que es caro a propósito. Sin límite, una
+# ráfaga de intentos (credential stuffing) deja sin CPU a toda la API. Por eso
+# se controla ANTES de tocar la BD o hashear nada.
+#
+# Se usa un "balde de fichas" (token bucket) por clave (IP, email, ...):
+# - el balde tiene `capacidad` fichas y cada intento gasta una
+# - las fichas se recargan de a poco (capacidad / segundos)
+# - sin fichas, el intento se rechaza y se informa cuánto esperar
+#
+# Los baldes viven en memoria del proceso (con varios workers cada uno tiene
+# los suyos, el límite efectivo se multiplica por la cantidad de workers).
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Máximo de claves guardadas por limitador (para acotar la memoria)
+MAX_CLAVES = int(os.getenv("LIMITE_INTENTOS_MAX_CLAVES", "100000"))
+
+
+class LimiteExcedido(Exception):
+    """Se superó el límite de intentos. `reintentar_en` está en segundos."""
+
+    def __init__(self, mensaje: str, reintentar_en: float):
+        super().__init__(mensaje)
+        self.reintentar_en = reintentar_en
+
+
+class LimitadorTokens:
+    """
+    Baldes de fichas por clave, con memoria acotada.
+
+    Los baldes se guardan en un OrderedDict del menos al más usado:
+    - Un balde que no se usó en `segundos` ya se recargó entero, así que
+      es igual a uno nuevo y se puede borrar (expiración por tiempo).
+    - Si igual se llega a `max_claves`, se borra el menos usado.
+    """
+
+    def __init__(self, capacidad: int, segundos: float, max_claves: int = MAX_CLAVES):
+        self.capacidad = capacidad
+        self.segundos = segundos
+        self.por_segundo = capacidad / segundos
+        self.max_claves = max_claves
+        # clave -> [fichas, momento de la última recarga]
+        self._baldes: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, clave: str, ahora: Optional[float] = None) -> float:
+        """
+        Gasta una ficha de la clave. Devuelve 0 si se permite el intento o
+        los segundos que faltan para tener una ficha si se rechaza.
+        """
+        ahora = time.monotonic() if ahora is None else ahora
+
+        with self._lock:
+            balde = self._baldes.get(clave)
+            if balde is None:
+                self._liberar_espacio(ahora)
+                balde = self._baldes[clave] = [float(self.capacidad), ahora]
+            else:
+                self._baldes.move_to_end(clave)
+                balde[0] = min(
+                    self.capacidad, balde[0] + (ahora - balde[1]) * self.por_segundo
+                )
+                balde[1] = ahora
+
+            if balde[0] >= 1:
+                balde[0] -= 1
+                return 0.0
+            return (1 - balde[0]) / self.por_segundo
+
+    def _liberar_espacio(self, ahora: float):
+        # El primero es el que se usó hace más tiempo
+        while self._baldes:
+            clave, (_, ultima) = next(iter(self._baldes.items()))
+            if ahora - ultima < self.segundos and len(self._baldes) < self.max_claves:
+                break
+            del self._baldes[clave]
+
+    def __len__(self) -> int:
+        return len(self._baldes)
+
+
+def _leer_politica(variable: str, por_defecto: str) -> LimitadorTokens:
+    """Lee "intentos/segundos" de una variable de entorno (ej: "10/60")"""
+    intentos, segundos = os.getenv(variable, por_defecto).split("/")
+    return LimitadorTokens(int(intentos), float(segundos))
+
+
+# Políticas por ruta: qué claves se controlan y con qué límite.
+# Se pueden cambiar con variables de entorno con el formato "intentos/segundos".
+POLITICAS: Dict[str, Dict[str, LimitadorTokens]] = {
+    "login": {
+        "ip": _leer_politica("LIMITE_LOGIN_IP", "20/60"),
+        "email": _leer_politica("LIMITE_LOGIN_EMAIL", "5/60"),
+    },
+    "registro": {
+        "ip": _leer_politica("LIMITE_REGISTRO_IP", "5/300"),
+    },
+    "cambiar_contraseña": {
+        "ip": _leer_politica("LIMITE_CAMBIO_CLAVE_IP", "10/60"),
+        "usuario": _leer_politica("LIMITE_CAMBIO_CLAVE_USUARIO", "5/300"),
+    },
+}
+
+
+def verificar_limite_intentos(politica: str, **claves) -> None:
+    """
+    Gasta una ficha en cada limitador de la política. Lanza LimiteExcedido
+    si alguno no tiene fichas.
+
+    Uso:
+    verificar_limite_intentos("login", ip="1.2.3.4", email="a@b.com")
+    """
+    for nombre, limitador in POLITICAS[politica].items():
+        valor = claves.get(nombre)
+        if valor is None:
+            continue
+        espera = limitador.consumir(str(valor).lower())
+        if espera:
+            raise LimiteExcedido(
+                "Demasiados intentos. Intenta de nuevo más tarde.",
+                reintentar_en=espera,
+            )
+
+
+def segundos_para_reintentar(error: LimiteExcedido) -> str:
+    """Valor del header Retry-After (segundos enteros, redondeando hacia arriba)"""
+    return str(max(1, math.ceil(error.reintentar_en)))
@@ -0,0 +1,220 @@
+# app/services/memoriaService.py
+# Diagnóstico de memoria con tracemalloc.
+#
+# La memoria de los workers crece después de listados o análisis grandes
+# (tablas enteras cargadas como listas de entidades y dicts). Con esto se
+# puede ver desde /admin dónde se reserva:
+#
+# 1. iniciar_tracemalloc() (o arrancar el proceso con PYTHONTRACEMALLOC=1)
+# 2. tomar_snapshot("antes"), hacer los requests sospechosos,
+#    tomar_snapshot("despues")
+# 3. comparar("antes", "despues") -> las líneas (o archivos) que más
+#    crecieron
+#
+# Mientras tracemalloc está prendido, además se mide el pico de memoria de
+# una muestra de los requests (ver app/middleware/memoria.py).
+#
+# tracemalloc hace más lento todo el proceso (cada reserva de memoria se
+# anota), así que solo se prende para diagnosticar.
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+MAX_SNAPSHOTS = int(os.getenv("MEMORIA_MAX_SNAPSHOTS", "10"))
+AGRUPACIONES = ("lineno", "filename", "traceback")
+
+# Lo que reserva el propio tracemalloc (y las importaciones) no interesa
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_snapshots: "OrderedDict[str, tuple]" = OrderedDict()  # nombre -> (creado, snapshot)
+_lock = threading.Lock()
+
+# Picos de los requests medidos
+_picos_recientes: deque = deque(
+    maxlen=int(os.getenv("MEMORIA_REQUESTS_RECIENTES", "200"))
+)
+_pico_por_ruta: Dict[str, dict] = {}
+# Solo se mide un request a la vez (el pico de tracemalloc es uno solo)
+_midiendo = threading.Lock()
+
+
+def _mb(cantidad_bytes: int) -> float:
+    return round(cantidad_bytes / (1024 * 1024), 3)
+
+
+# ========== TRACEMALLOC Y SNAPSHOTS ==========
+
+
+def iniciar_tracemalloc(marcos: int = 1) -> dict:
+    """
+    Empieza a anotar las reservas de memoria. `marcos` es cuántos niveles de
+    la pila se guardan por reserva (más = más detalle y más lento).
+    """
+    if not 1 <= marcos <= 50:
+        raise ValueError("marcos debe estar entre 1 y 50")
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(marcos)
+    return estado_memoria()
+
+
+def detener_tracemalloc() -> dict:
+    """Apaga tracemalloc y descarta los snapshots (ya no se pueden comparar)"""
+    tracemalloc.stop()
+    with _lock:
+        _snapshots.clear()
+    return estado_memoria()
+
+
+def estado_memoria() -> dict:
+    actual, pico = tracemalloc.get_traced_memory()
+    with _lock:
+        snapshots = [
+            {"nombre": nombre, "creado": creado}
+            for nombre, (creado, _) in _snapshots.items()
+        ]
+    return {
+        "activo": tracemalloc.is_tracing(),
+        "marcos": tracemalloc.get_traceback_limit(),
+        "actual_mb": _mb(actual),
+        "pico_mb": _mb(pico),
+        "overhead_mb": _mb(tracemalloc.get_tracemalloc_memory()),
+        "snapshots": snapshots,
+    }
+
+
+def tomar_snapshot(nombre: str) -> dict:
+    """Guarda un snapshot con ese nombre (reemplaza si ya existía)"""
+    if not tracemalloc.is_tracing():
+        raise ValueError("tracemalloc no está activo")
+    snapshot = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+    with _lock:
+        _snapshots.pop(nombre, None)
+        _snapshots[nombre] = (time.time(), snapshot)
+        # Cada snapshot ocupa bastante: se conservan los últimos MAX_SNAPSHOTS
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    total = sum(estadistica.size for estadistica in snapshot.statistics("filename"))
+    return {"nombre": nombre, "total_mb": _mb(total)}
+
+
+def borrar_snapshot(nombre: str):
+    with _lock:
+        if _snapshots.pop(nombre, None) is None:
+            raise ValueError(f"Snapshot {nombre} no encontrado")
+
+
+def _snapshot(nombre: str):
+    with _lock:
+        if nombre not in _snapshots:
+            raise ValueError(f"Snapshot {nombre} no encontrado")
+        return _snapshots[nombre][1]
+
+
+def comparar_snapshots(
+    antes: str,
+    despues: Optional[str] = None,
+    agrupar: str = "lineno",
+    limite: int = 30,
+) -> dict:
+    """
+    Las `limite` ubicaciones cuya memoria más creció entre `antes` y
+    `despues` (si no se indica, contra la memoria de ahora).
+    """
+    if agrupar not in AGRUPACIONES:
+        raise ValueError(f"Agrupación inválida. Opciones: {', '.join(AGRUPACIONES)}")
+
+    inicial = _snapshot(antes)
+    if despues is None:
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc no está activo")
+        final = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+    else:
+        final = _snapshot(despues)
+
+    diferencias = final.compare_to(inicial, agrupar)
+    return {
+        "antes": antes,
+        "despues": despues or "ahora",
+        "diferencia_total_mb": _mb(sum(d.size_diff for d in diferencias)),
+        "top": [
+            {
+                "ubicacion": _ubicacion(d.traceback, agrupar),
+                "diferencia_kb": round(d.size_diff / 1024, 1),
+                "total_kb": round(d.size / 1024, 1),
+                "diferencia_bloques": d.count_diff,
+                "bloques": d.count,
+            }
+            for d in diferencias[:limite]
+        ],
+    }
+
+
+def _ubicacion(traceback, agrupar: str) -> str:
+    if agrupar == "filename":
+        return traceback[0].filename
+    if agrupar == "lineno":
+        return f"{traceback[0].filename}:{traceback[0].lineno}"
+    # La pila completa, de la llamada más externa a la reserva
+    return " <- ".join(f"{marco.filename}:{marco.lineno}" for marco in traceback)
+
+
+# ========== PICO POR REQUEST ==========
+
+
+def empezar_medicion() -> Optional[int]:
+    """
+    Si tracemalloc está activo y no se está midiendo otro request, reinicia el
+    pico y devuelve la memoria actual (si no, None y el request no se mide).
+    El pico es del proceso: con requests simultáneos incluye lo de los demás.
+    """
+    if not tracemalloc.is_tracing() or not _midiendo.acquire(blocking=False):
+        return None
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def terminar_medicion(inicial: int, metodo: str, ruta: str) -> int:
+    """Anota el pico del request (en bytes, sobre lo que había al empezar)"""
+    try:
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        _midiendo.release()
+    pico = max(0, pico - inicial)
+
+    clave = f"{metodo} {ruta}"
+    with _lock:
+        _picos_recientes.append(
+            {"ruta": clave, "pico_kb": round(pico / 1024, 1), "fecha": time.time()}
+        )
+        datos = _pico_por_ruta.setdefault(
+            clave, {"requests": 0, "pico_max_kb": 0.0, "suma_kb": 0.0}
+        )
+        datos["requests"] += 1
+        datos["suma_kb"] += pico / 1024
+        datos["pico_max_kb"] = max(datos["pico_max_kb"], round(pico / 1024, 1))
+    return pico
+
+
+def picos_requests(limite: int = 20) -> dict:
+    """Las rutas con mayor pico de memoria y los últimos requests medidos"""
+    with _lock:
+        rutas = [
+            {
+                "ruta": ruta,
+                "requests": datos["requests"],
+                "pico_max_kb": datos["pico_max_kb"],
+                "pico_promedio_kb": round(datos["suma_kb"] / datos["requests"], 1),
+            }
+            for ruta, datos in _pico_por_ruta.items()
+        ]
+        recientes: List[dict] = list(_picos_recientes)[-limite:]
+    rutas.sort(key=lambda r: r["pico_max_kb"], reverse=True)
+    return {"rutas": rutas[:limite], "recientes": recientes[::-1]}
@@ -1,9 +1,12 @@
 # app/services/motorInferenciaService.py
 from typing import List, Dict
 from pony.orm import db_session
+from app.database.database import db
+from app.middleware.serverTiming import etapa
+from app.services.saldosService import total_periodo, totales_por_categoria
+from app.services.tiposCambioService import expresion_tasa
 from app.models.ingreso import Ingreso
 from app.models.egreso import Egreso
-from app.models.activo import Activo
 from app.models.pasivo import Pasivo
 from datetime import datetime, timedelta
 import re
@@ -83,26 +86,19 @@ def obtener_evolucion_mensual(usuario_id: int, dias: int = 365) -> List[Dict]:
     return resultado
 
 
+# Los totales de un período salen del libro diario acumulado
+# (app/services/saldosService.py): dos búsquedas por índice, sin recorrer
+# los movimientos
 @db_session
 def obtener_ingresos_totales_usuario(usuario_id: int, dias: int = 30) -> float:
     fecha_inicio = datetime.now().date() - timedelta(days=dias)
-    ingresos = [
-        i
-        for i in list(Ingreso.select().order_by(Ingreso.id))
-        if i.fk_usuarios.id == usuario_id and i.fecha >= fecha_inicio
-    ]
-    return float(sum(i.monto for i in ingresos))
+    return total_periodo(usuario_id, "ingreso", fecha_inicio)
 
 
 @db_session
 def obtener_egresos_totales_usuario(usuario_id: int, dias: int = 30) -> float:
     fecha_inicio = datetime.now().date() - timedelta(days=dias)
-    egresos = [
-        e
-        for e in list(Egreso.select().order_by(Egreso.id))
-        if e.fk_usuarios.id == usuario_id and e.fecha >= fecha_inicio
-    ]
-    return float(sum(e.monto for e in egresos))
+    return total_periodo(usuario_id, "egreso", fecha_inicio)
 
 
 @db_session
@@ -110,35 +106,45 @@ def obtener_egresos_por_categoria(
     usuario_id: int, categoria: str, dias: int = 30
 ) -> float:
     fecha_inicio = datetime.now().date() - timedelta(days=dias)
-    categoria_lower = categoria.lower()
-    egresos = [
-        e
-        for e in list(Egreso.select().order_by(Egreso.id))
-        if e.fk_usuarios.id == usuario_id
-        and e.fecha >= fecha_inicio
-        and e.categoria.lower() == categoria_lower
-    ]
-    return float(sum(e.monto for e in egresos))
+    return total_periodo(usuario_id, "egreso", fecha_inicio, categoria=categoria)
+
+
+@db_session
+def obtener_egresos_de_categorias(
+    usuario_id: int, categorias: List[List[str]], dias: int = 30
+) -> List[float]:
+    """
+    Total de egresos de cada grupo de categorías, con una sola consulta:
+    [[vivienda, comida], [lujos]] -> [total de vivienda + comida, total de lujos]
+    """
+    fecha_inicio = datetime.now().date() - timedelta(days=dias)
+    totales = totales_por_categoria(usuario_id, "egreso", fecha_inicio)
+    return [float(sum(totales.get(c.lower(), 0.0) for c in grupo)) for grupo in categorias]
+
+
+# Los activos se suman convertidos a la moneda de reporte (al tipo de cambio
+# de hoy) en la misma consulta (la tabla va con el alias "a")
+_TASA_ACTIVO = expresion_tasa("a.moneda", "CURRENT_DATE")
 
 
 @db_session
 def obtener_valor_total_activos(usuario_id: int) -> float:
-    activos = [
-        a
-        for a in list(Activo.select().order_by(Activo.id))
-        if a.fk_usuarios.id == usuario_id
-    ]
-    return float(sum(a.valor for a in activos))
+    return float(
+        db.select(
+            f"""SELECT COALESCE(SUM(a.valor * {_TASA_ACTIVO}), 0)
+            FROM activos a WHERE a.fk_usuarios = $usuario_id"""
+        )[0]
+    )
 
 
 @db_session
 def obtener_flujo_mensual_activos(usuario_id: int) -> float:
-    activos = [
-        a
-        for a in list(Activo.select().order_by(Activo.id))
-        if a.fk_usuarios.id == usuario_id and a.flujo_mensual is not None
-    ]
-    return float(sum(a.flujo_mensual for a in activos if a.flujo_mensual))
+    return float(
+        db.select(
+            f"""SELECT COALESCE(SUM(a.flujo_mensual * {_TASA_ACTIVO}), 0)
+            FROM activos a WHERE a.fk_usuarios = $usuario_id"""
+        )[0]
+    )
 
 
 @db_session
@@ -163,17 +169,170 @@ def obtener_total_deuda_pendiente(usuario_id: int) -> float:
 
 @db_session
 def obtener_categorias_usuario(usuario_id: int, dias: int = 30) -> List[Dict]:
+    """
+    Egresos del período por categoría (tal como se cargaron), en la moneda
+    de reporte: lo mismo que la sección distribucion del dashboard
+    """
     fecha_inicio = datetime.now().date() - timedelta(days=dias)
-    egresos = [
-        e
-        for e in list(Egreso.select().order_by(Egreso.id))
-        if e.fk_usuarios.id == usuario_id and e.fecha >= fecha_inicio
-    ]
-    categorias = {}
-    for egreso in egresos:
-        cat = egreso.categoria
-        categorias[cat] = categorias.get(cat, 0) + egreso.monto
-    return [{"categoria": k, "monto": v} for k, v in categorias.items()]
+    filas = db.select(
+        """SELECT categoria, SUM(monto * tasa_cambio)
+        FROM egresos
+        WHERE fk_usuarios = $usuario_id AND fecha >= $fecha_inicio
+        GROUP BY categoria
+        ORDER BY categoria
+        """
+    )
+    return [{"categoria": categoria, "monto": monto} for categoria, monto in filas]
+
+
+# ============================================================
+# AGREGADOS DEL USUARIO (una consulta agrupada por tabla)
+# ============================================================
+
+# Categorías de egresos de cada grupo de la regla 50/30/20
+CATEGORIAS_NECESIDADES = ["vivienda", "comida", "transporte", "salud", "servicios", "deudas"]
+CATEGORIAS_DESEOS = ["entretenimiento", "restaurantes", "viajes", "lujos"]
+CATEGORIAS_AHORROS = ["ahorro", "inversión", "educación"]
+
+
+# Máximo de ventanas que se calculan juntas
+MAX_VENTANAS = 6
+
+
+@db_session
+def obtener_agregados_usuario(usuario_id: int, dias: int = 30) -> Dict:
+    """
+    Calcula en la BD todos los totales que usan el análisis y el dashboard:
+    - ingresos del período
+    - egresos del período por categoría (tal como se cargaron)
+    - ingresos y egresos por mes (para la evolución mensual)
+    - activos y pasivos agrupados por tipo
+    """
+    return obtener_agregados_ventanas(usuario_id, [dias])[dias]
+
+
+@db_session
+def obtener_agregados_ventanas(usuario_id: int, ventanas: List[int]) -> Dict[int, Dict]:
+    """
+    Los agregados de obtener_agregados_usuario para varios períodos a la vez
+    ({30: {...}, 90: {...}, 365: {...}}), con las mismas consultas que para
+    uno solo:
+
+    - ingresos y egresos: una consulta que recorre una vez el período más
+      largo y suma cada ventana con SUM(...) FILTER (WHERE fecha >= inicio)
+    - activos y pasivos: no dependen del período, se consultan una vez y se
+      comparten
+
+    Los montos se convierten a la moneda de reporte dentro de las sumas:
+    ingresos y egresos con el tipo de cambio guardado en cada uno (el mismo
+    que usa el libro diario), activos al de hoy.
+    """
+    ventanas = sorted(set(ventanas))
+    hoy = datetime.now().date()
+
+    # db.select toma los $parámetros de este diccionario
+    parametros = {
+        "usuario_id": usuario_id,
+        "desde": hoy - timedelta(days=ventanas[-1]),
+    }
+    sumas = []
+    for i, dias in enumerate(ventanas):
+        parametros[f"inicio_{i}"] = hoy - timedelta(days=dias)
+        sumas.append(f"SUM(monto * tasa_cambio) FILTER (WHERE fecha >= $inicio_{i})")
+    sumas = ", ".join(sumas)
+
+    # Pony exige que la consulta empiece directamente con SELECT
+    movimientos = db.select(
+        f"""SELECT 'ingreso' AS tipo, to_char(fecha, 'YYYY-MM') AS mes,
+               NULL AS categoria, {sumas}
+        FROM ingresos
+        WHERE fk_usuarios = $usuario_id AND fecha >= $desde
+        GROUP BY mes
+        UNION ALL
+        SELECT 'egreso' AS tipo, to_char(fecha, 'YYYY-MM') AS mes, categoria, {sumas}
+        FROM egresos
+        WHERE fk_usuarios = $usuario_id AND fecha >= $desde
+        GROUP BY mes, categoria
+        """,
+        parametros,
+    )
+    activos = db.select(
+        f"""SELECT a.tipo, SUM(a.valor * {_TASA_ACTIVO}),
+               COALESCE(SUM(a.flujo_mensual * {_TASA_ACTIVO}), 0)
+        FROM activos a
+        WHERE a.fk_usuarios = $usuario_id
+        GROUP BY a.tipo
+        ORDER BY a.tipo
+        """
+    )
+    pasivos = db.select(
+        """SELECT tipo, SUM(monto_total), SUM(pago_mensual)
+        FROM pasivos
+        WHERE fk_usuarios = $usuario_id
+        GROUP BY tipo
+        ORDER BY tipo
+        """
+    )
+
+    activos_por_tipo = {
+        tipo: {"valor": valor, "flujo_mensual": flujo} for tipo, valor, flujo in activos
+    }
+    pasivos_por_tipo = {
+        tipo: {"monto_total": monto, "pago_mensual": pago}
+        for tipo, monto, pago in pasivos
+    }
+
+    resultado = {}
+    for i, dias in enumerate(ventanas):
+        ingresos = 0.0
+        evolucion: Dict[str, list] = {}
+        egresos_por_categoria: Dict[str, float] = {}
+
+        for fila in movimientos:
+            tipo, mes, categoria, monto = fila[0], fila[1], fila[2], fila[3 + i]
+            if monto is None:  # Nada de ese mes/categoría dentro de la ventana
+                continue
+            if tipo == "ingreso":
+                ingresos += monto
+                evolucion.setdefault(mes, [0.0, 0.0])[0] += monto
+            else:
+                evolucion.setdefault(mes, [0.0, 0.0])[1] += monto
+                egresos_por_categoria[categoria] = (
+                    egresos_por_categoria.get(categoria, 0) + monto
+                )
+
+        resultado[dias] = {
+            "ingresos": float(ingresos),
+            "egresos_por_categoria": egresos_por_categoria,
+            "evolucion": evolucion,
+            "activos_por_tipo": activos_por_tipo,
+            "pasivos_por_tipo": pasivos_por_tipo,
+        }
+    return resultado
+
+
+def _egresos_de(agregados: Dict, categorias: List[str]) -> float:
+    """Suma los egresos de las categorías dadas (sin distinguir mayúsculas)"""
+    buscadas = set(categorias)
+    return float(
+        sum(
+            monto
+            for categoria, monto in agregados["egresos_por_categoria"].items()
+            if categoria.lower() in buscadas
+        )
+    )
+
+
+def _evolucion_mensual(agregados: Dict) -> List[Dict]:
+    resultado = []
+    for mes_key in sorted(agregados["evolucion"]):
+        ingresos, egresos = agregados["evolucion"][mes_key]
+        # Formatear mes (e.g., "2024-11" -> "Nov 2024")
+        mes_nombre = datetime.strptime(mes_key, "%Y-%m").strftime("%b %Y")
+        resultado.append(
+            {"mes": mes_nombre, "ingresos": round(ingresos, 2), "gastos": round(egresos, 2)}
+        )
+    return resultado
 
 
 # ============================================================
@@ -181,6 +340,7 @@ def obtener_categorias_usuario(usuario_id: int, dias: int = 30) -> List[Dict]:
 # ============================================================
 
 
+@etapa("reglas")
 def regla_50_30_20(
     ingresos, egresos_necesidades, egresos_deseos, egresos_ahorros
 ) -> Dict:
@@ -249,6 +409,7 @@ def regla_50_30_20(
     }
 
 
+@etapa("reglas")
 def regla_limite_endeudamiento(ingresos, deudas_mensuales) -> Dict:
     if ingresos == 0:
         return {
@@ -270,6 +431,7 @@ def regla_limite_endeudamiento(ingresos, deudas_mensuales) -> Dict:
     }
 
 
+@etapa("reglas")
 def regla_gasta_mas_que_gana(ingresos, egresos) -> Dict:
     if ingresos == 0:
         return {
@@ -292,6 +454,7 @@ def regla_gasta_mas_que_gana(ingresos, egresos) -> Dict:
     }
 
 
+@etapa("reglas")
 def regla_fondo_emergencia(ingresos, ahorro_total) -> Dict:
     if ingresos == 0 or ahorro_total == 0:  # Validación para evitar datos vacíos
         return {
@@ -333,6 +496,7 @@ def regla_fondo_emergencia(ingresos, ahorro_total) -> Dict:
     }
 
 
+@etapa("reglas")
 def regla_sin_inversiones(valor_activos, flujo_mensual) -> Dict:
     tiene = valor_activos > 0
     return {
@@ -344,6 +508,7 @@ def regla_sin_inversiones(valor_activos, flujo_mensual) -> Dict:
     }
 
 
+@etapa("reglas")
 def regla_inversion_educacion(gastos_educacion, ingresos) -> Dict:
     if ingresos == 0:
         return {"cumple": False, "mensaje": "No hay ingresos", "severidad": "warning"}
@@ -361,6 +526,7 @@ def regla_inversion_educacion(gastos_educacion, ingresos) -> Dict:
     }
 
 
+@etapa("reglas")
 def regla_lujos_vs_educacion(gastos_lujos, gastos_educacion, valor_activos) -> Dict:
     # Si no hay datos, no se puede evaluar correctamente
     if gastos_lujos == 0 and gastos_educacion == 0 and valor_activos == 0:
@@ -382,6 +548,7 @@ def regla_lujos_vs_educacion(gastos_lujos, gastos_educacion, valor_activos) -> D
     }
 
 
+@etapa("reglas")
 def regla_reserva_imprevistos(ingresos, ahorro_liquido) -> Dict:
     if ingresos == 0 and ahorro_liquido == 0:
         return {
@@ -410,44 +577,56 @@ def regla_reserva_imprevistos(ingresos, ahorro_liquido) -> Dict:
 
 @db_session
 def evaluar_salud_financiera(usuario_id: int, dias: int = 30) -> Dict:
-    ingresos_totales = obtener_ingresos_totales_usuario(usuario_id, dias)
-    egresos_totales = obtener_egresos_totales_usuario(usuario_id, dias)
-
-    gastos_necesidades = sum(
-        [
-            obtener_egresos_por_categoria(usuario_id, c, dias)
-            for c in [
-                "vivienda",
-                "comida",
-                "transporte",
-                "salud",
-                "servicios",
-                "deudas",
-            ]
-        ]
-    )
-    gastos_deseos = sum(
-        [
-            obtener_egresos_por_categoria(usuario_id, c, dias)
-            for c in ["entretenimiento", "restaurantes", "viajes", "lujos"]
-        ]
-    )
-    gastos_ahorros = (
-        obtener_egresos_por_categoria(usuario_id, "ahorro", dias)
-        + obtener_egresos_por_categoria(usuario_id, "inversión", dias)
-        + obtener_egresos_por_categoria(usuario_id, "educación", dias)
-    )
+    return evaluar_agregados(usuario_id, obtener_agregados_usuario(usuario_id, dias))
+
+
+@db_session
+def evaluar_salud_financiera_ventanas(usuario_id: int, ventanas: List[int]) -> Dict:
+    """
+    Evalúa todas las reglas en varios períodos a la vez (por ejemplo 30, 90 y
+    365 días) para compararlos en un solo request.
+    """
+    ventanas = sorted(set(ventanas))
+    if not ventanas:
+        raise ValueError("Indicá al menos un período (dias)")
+    if len(ventanas) > MAX_VENTANAS:
+        raise ValueError(f"Como máximo {MAX_VENTANAS} períodos a la vez")
+    if ventanas[0] < 1 or ventanas[-1] > 365:
+        raise ValueError("Cada período debe estar entre 1 y 365 días")
+
+    agregados = obtener_agregados_ventanas(usuario_id, ventanas)
+    resultado = []
+    for dias in ventanas:
+        evaluacion = evaluar_agregados(usuario_id, agregados[dias])
+        del evaluacion["usuario_id"]
+        resultado.append({"dias": dias, **evaluacion})
+    return {"usuario_id": usuario_id, "ventanas": resultado}
+
+
+def evaluar_agregados(usuario_id: int, agregados: Dict) -> Dict:
+    """
+    Aplica todas las reglas sobre los totales de obtener_agregados_usuario.
+    No consulta la BD, así el dashboard reutiliza los mismos agregados.
+    """
+    ingresos_totales = agregados["ingresos"]
+    egresos_totales = float(sum(agregados["egresos_por_categoria"].values()))
+
+    gastos_necesidades = _egresos_de(agregados, CATEGORIAS_NECESIDADES)
+    gastos_deseos = _egresos_de(agregados, CATEGORIAS_DESEOS)
+    gastos_ahorros = _egresos_de(agregados, CATEGORIAS_AHORROS)
 
-    fondo_emergencia = obtener_egresos_por_categoria(usuario_id, "ahorro", dias)
+    fondo_emergencia = _egresos_de(agregados, ["ahorro"])
 
-    gastos_educacion = obtener_egresos_por_categoria(usuario_id, "educación", dias)
-    gastos_lujos = obtener_egresos_por_categoria(usuario_id, "lujos", dias)
-    ahorro_liquido = obtener_egresos_por_categoria(usuario_id, "ahorro", dias)
+    gastos_educacion = _egresos_de(agregados, ["educación"])
+    gastos_lujos = _egresos_de(agregados, ["lujos"])
+    ahorro_liquido = _egresos_de(agregados, ["ahorro"])
 
-    valor_activos = obtener_valor_total_activos(usuario_id)
-    flujo_activos = obtener_flujo_mensual_activos(usuario_id)
-    deudas_mensuales = obtener_total_deudas_mensuales(usuario_id)
-    deuda_total = obtener_total_deuda_pendiente(usuario_id)
+    activos = agregados["activos_por_tipo"].values()
+    pasivos = agregados["pasivos_por_tipo"].values()
+    valor_activos = float(sum(a["valor"] for a in activos))
+    flujo_activos = float(sum(a["flujo_mensual"] for a in activos))
+    deudas_mensuales = float(sum(p["pago_mensual"] for p in pasivos))
+    deuda_total = float(sum(p["monto_total"] for p in pasivos))
 
     reglas = {
         "regla_50_30_20": regla_50_30_20(
@@ -496,7 +675,7 @@ def evaluar_salud_financiera(usuario_id: int, dias: int = 30) -> Dict:
             "total": total,
             "porcentaje": round((reglas_cumplidas / total) * 100, 2),
         },
-        "evolucion_mensual": obtener_evolucion_mensual(usuario_id, dias),
+        "evolucion_mensual": _evolucion_mensual(agregados),
     }
 
 
@@ -0,0 +1,129 @@
+# app/services/notificacionesService.py
+# Avisos en tiempo real (Server-Sent Events) cuando cambian los movimientos
+# de un usuario. Los cambios llegan desde el outbox.
+import asyncio
+import os
+import threading
+from typing import Dict, List, Set
+from starlette.concurrency import run_in_threadpool
+from app.services.motorInferenciaService import evaluar_salud_financiera
+from app.tareas.despachadorOutbox import consumidor
+
+# Límite de conexiones abiertas (en este proceso) y por usuario
+MAX_STREAMS_TOTALES = int(os.getenv("SSE_MAX_STREAMS", "500"))
+MAX_STREAMS_POR_USUARIO = int(os.getenv("SSE_MAX_STREAMS_POR_USUARIO", "5"))
+
+# Espera para juntar varios cambios seguidos en un solo recálculo
+ESPERA_AGRUPAR_SEGUNDOS = float(os.getenv("SSE_ESPERA_AGRUPAR_SEGUNDOS", "0.5"))
+
+
+class LimiteStreamsExcedido(Exception):
+    """No se pueden abrir más streams (en total o para el usuario)"""
+
+
+class Suscripcion:
+    """
+    Una conexión SSE abierta.
+
+    La cola tiene lugar para UN solo aviso: si el cliente es lento y llegan
+    más cambios mientras tanto, se descartan porque el próximo resumen ya
+    los va a incluir. Así una conexión lenta nunca acumula memoria.
+    """
+
+    def __init__(self, usuario_id: int, loop: asyncio.AbstractEventLoop):
+        self.usuario_id = usuario_id
+        self.loop = loop
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.entidades: Set[str] = set()
+
+    def avisar(self, entidades: Set[str]):
+        # Se ejecuta en el event loop (ver notificar_cambios)
+        self.entidades |= entidades
+        if not self.cola.full():
+            self.cola.put_nowait(True)
+
+    def tomar_entidades(self) -> List[str]:
+        entidades, self.entidades = sorted(self.entidades), set()
+        return entidades
+
+
+_suscripciones: Dict[int, List[Suscripcion]] = {}
+_lock = threading.Lock()
+
+# Versión de los datos de cada usuario (sube con cada cambio) y último
+# resumen calculado, para no recalcular lo mismo en cada pestaña abierta
+_versiones: Dict[int, int] = {}
+_resumenes: Dict[tuple, tuple] = {}
+_locks_resumen: Dict[tuple, asyncio.Lock] = {}
+
+
+def suscribir(usuario_id: int) -> Suscripcion:
+    with _lock:
+        total = sum(len(s) for s in _suscripciones.values())
+        if total >= MAX_STREAMS_TOTALES:
+            raise LimiteStreamsExcedido("Se alcanzó el máximo de conexiones abiertas")
+
+        del_usuario = _suscripciones.setdefault(usuario_id, [])
+        if len(del_usuario) >= MAX_STREAMS_POR_USUARIO:
+            raise LimiteStreamsExcedido(
+                f"Máximo de {MAX_STREAMS_POR_USUARIO} conexiones abiertas por usuario"
+            )
+
+        suscripcion = Suscripcion(usuario_id, asyncio.get_running_loop())
+        del_usuario.append(suscripcion)
+        return suscripcion
+
+
+def desuscribir(suscripcion: Suscripcion):
+    with _lock:
+        del_usuario = _suscripciones.get(suscripcion.usuario_id, [])
+        if suscripcion in del_usuario:
+            del_usuario.remove(suscripcion)
+        if not del_usuario:
+            _suscripciones.pop(suscripcion.usuario_id, None)
+            # Sin conexiones no hace falta guardar resúmenes del usuario
+            for clave in [k for k in _resumenes if k[0] == suscripcion.usuario_id]:
+                _resumenes.pop(clave, None)
+                _locks_resumen.pop(clave, None)
+
+
+def notificar_cambios(usuario_id: int, entidades: Set[str]):
+    """Avisa a las conexiones del usuario (se puede llamar desde cualquier hilo)"""
+    with _lock:
+        _versiones[usuario_id] = _versiones.get(usuario_id, 0) + 1
+        suscripciones = list(_suscripciones.get(usuario_id, []))
+
+    for suscripcion in suscripciones:
+        suscripcion.loop.call_soon_threadsafe(suscripcion.avisar, set(entidades))
+
+
+@consumidor("notificaciones_sse", persistente=False)
+def notificar_desde_outbox(eventos: List[dict]):
+    """Agrupa el lote por usuario y manda un solo aviso a cada uno"""
+    por_usuario: Dict[int, Set[str]] = {}
+    for evento in eventos:
+        por_usuario.setdefault(evento["usuario_id"], set()).add(evento["entidad"])
+
+    for usuario_id, entidades in por_usuario.items():
+        if usuario_id in _suscripciones:
+            notificar_cambios(usuario_id, entidades)
+
+
+async def obtener_resumen(usuario_id: int, dias: int) -> dict:
+    """
+    Devuelve el análisis del usuario. Si varias conexiones lo piden para la
+    misma versión de los datos, se calcula una sola vez.
+    """
+    clave = (usuario_id, dias)
+    lock = _locks_resumen.setdefault(clave, asyncio.Lock())
+
+    async with lock:
+        version = _versiones.get(usuario_id, 0)
+        guardado = _resumenes.get(clave)
+        if guardado and guardado[0] == version:
+            return guardado[1]
+
+        resumen = await run_in_threadpool(evaluar_salud_financiera, usuario_id, dias)
+        if usuario_id in _suscripciones:
+            _resumenes[clave] = (version, resumen)
+        return resumen
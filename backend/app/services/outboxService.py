@@ -0,0 +1,146 @@
+# app/services/outboxService.py
+# Registro y lectura de eventos del outbox (cambios en el libro de movimientos)
+import json
+from datetime import datetime, timedelta
+from typing import List
+from pony.orm import db_session, flush
+from app.database.database import db
+from app.models.outbox import EventoOutbox, OffsetConsumidor
+
+
+def _a_json(datos: dict) -> dict:
+    # Las fechas no son serializables a JSON directamente
+    return json.loads(json.dumps(datos, default=str))
+
+
+def registrar_evento(entidad: str, operacion: str, instancia, anterior: dict = None):
+    """
+    Registra un evento para la entidad modificada.
+
+    IMPORTANTE: no hace commit. Se llama dentro de la db_session del servicio
+    justo antes de su commit(), así el evento y el cambio se guardan (o se
+    descartan) juntos.
+
+    - En "crear" se llama después de crear la entidad.
+    - En "actualizar" se pasa `anterior` (obtenido con to_dict() antes de modificar).
+    - En "eliminar" se llama ANTES de borrar la entidad.
+    """
+    flush()  # Asegura que las altas ya tengan ID
+
+    datos = instancia.to_dict()
+    EventoOutbox(
+        entidad=entidad,
+        entidad_id=instancia.id,
+        operacion=operacion,
+        usuario_id=datos["fk_usuarios"],
+        datos=_a_json(datos),
+        anterior=_a_json(anterior) if anterior is not None else None,
+    )
+
+
+def registrar_alerta(entidad: str, entidad_id: int, usuario_id: int, datos: dict):
+    """
+    Registra un aviso (operación "alerta") que no es un cambio de la entidad,
+    por ejemplo un presupuesto que se pasó del umbral. Igual que
+    registrar_evento, no hace commit.
+    """
+    EventoOutbox(
+        entidad=entidad,
+        entidad_id=entidad_id,
+        operacion="alerta",
+        usuario_id=usuario_id,
+        datos=_a_json(datos),
+    )
+
+
+@db_session
+def leer_eventos(desde_id: int, limite: int = 500) -> List[dict]:
+    """Eventos con ID mayor a `desde_id`, en orden"""
+    eventos = EventoOutbox.select_by_sql(
+        "SELECT * FROM outbox_eventos WHERE id > $desde_id ORDER BY id LIMIT $limite"
+    )
+    return [
+        {
+            "id": e.id,
+            "entidad": e.entidad,
+            "entidad_id": e.entidad_id,
+            "operacion": e.operacion,
+            "usuario_id": e.usuario_id,
+            "datos": e.datos,
+            "anterior": e.anterior,
+            "creado": e.creado,
+        }
+        for e in eventos
+    ]
+
+
+# Huecos en los IDs: nextval() no es transaccional, así que un ID que falta
+# puede ser de una transacción que todavía no hizo commit (y va a aparecer)
+# o de una que hizo rollback (no va a aparecer nunca). Para distinguirlos se
+# usan los snapshots de PostgreSQL: cuando terminaron todas las transacciones
+# que estaban abiertas al ver el hueco, si el ID sigue faltando no aparece más.
+# (La transacción que tomó el ID ya tiene xid: nextval() se evalúa en el
+# mismo INSERT que escribe la fila.)
+@db_session
+def marca_transacciones() -> int:
+    """xmax del snapshot actual: toda transacción abierta ahora tiene un xid menor"""
+    return int(db.select("SELECT pg_snapshot_xmax(pg_current_snapshot())::text::bigint")[0])
+
+
+@db_session
+def terminaron_transacciones(marca: int) -> bool:
+    """Si ya terminaron todas las transacciones anteriores a la marca"""
+    return bool(
+        db.select("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint >= $marca")[0]
+    )
+
+
+@db_session
+def hay_eventos_entre(desde_id: int, hasta_id: int) -> bool:
+    """Si ya es visible algún evento con ID entre desde_id y hasta_id (inclusive)"""
+    return bool(
+        db.select(
+            """SELECT EXISTS (
+                SELECT 1 FROM outbox_eventos WHERE id BETWEEN $desde_id AND $hasta_id
+            )"""
+        )[0]
+    )
+
+
+@db_session
+def obtener_ultimo_id() -> int:
+    """ID del último evento registrado (0 si no hay ninguno)"""
+    return db.select("SELECT COALESCE(MAX(id), 0) FROM outbox_eventos")[0]
+
+
+@db_session
+def obtener_offset(consumidor: str) -> int:
+    offset = OffsetConsumidor.get(consumidor=consumidor)
+    return offset.ultimo_id if offset else 0
+
+
+@db_session
+def guardar_offset(consumidor: str, ultimo_id: int):
+    """Checkpoint: el consumidor ya procesó todos los eventos hasta `ultimo_id`"""
+    offset = OffsetConsumidor.get(consumidor=consumidor)
+    if offset:
+        offset.ultimo_id = ultimo_id
+        offset.actualizado = datetime.now()
+    else:
+        OffsetConsumidor(consumidor=consumidor, ultimo_id=ultimo_id)
+
+
+@db_session
+def purgar_eventos(dias: int = 7) -> int:
+    """
+    Borra los eventos viejos que ya procesaron todos los consumidores.
+    Devuelve la cantidad de eventos borrados.
+    """
+    limite = datetime.now() - timedelta(days=dias)
+    return db.execute(
+        """
+        DELETE FROM outbox_eventos
+        WHERE creado < $limite
+          AND id <= (SELECT COALESCE(MIN(ultimo_id), 0) FROM outbox_offsets)
+        """
+    ).rowcount
@@ -1,39 +1,39 @@
 # app/services/pasivoService.py
 # Contiene la lógica CRUD y las validaciones de negocio antes de interactuar con la base de datos
-from typing import List
+from typing import List, Optional
 from pony.orm import db_session, commit
 from datetime import date
 from app.models.pasivo import Pasivo
 from app.models.usuario import Usuario
+from app.services.outboxService import registrar_evento
+from app.services.proyeccionService import seleccionar_campos
 from app.schemas.pasivo import PasivoCreate, PasivoUpdate
 
 
+# Columnas que se pueden pedir con ?fields= (las mismas que PasivoOut)
+CAMPOS_PASIVO = [
+    "id",
+    "nombre",
+    "tipo",
+    "monto_total",
+    "pago_mensual",
+    "fecha_vencimiento",
+    "tasa_interes",
+    "fk_usuarios",
+]
+
+
 # GET PASIVOS - Devuelve la lista de pasivos
 @db_session
-def get_pasivos_service(usuario_id: int) -> List[dict]:
-    """Obtiene todos los pasivos del usuario"""
-
+def get_pasivos_service(usuario_id: int, campos: Optional[List[str]] = None) -> List[dict]:
+    """Obtiene todos los pasivos del usuario (solo las columnas pedidas)"""
     try:
-
-        # Traer todos y filtrar manualmente ya que parece haber un bug, esto no da problema en BD pequeñas porque no lo hace lento por los pocos registros
-        todos_pasivos = list(Pasivo.select().order_by(Pasivo.id))
-        pasivos = [p for p in todos_pasivos if p.fk_usuarios.id == usuario_id]
-
-        resultado = []
-        for pasivo in pasivos:
-            resultado.append(
-                {
-                    "id": pasivo.id,
-                    "nombre": pasivo.nombre,
-                    "tipo": pasivo.tipo,
-                    "monto_total": pasivo.monto_total,
-                    "pago_mensual": pasivo.pago_mensual,
-                    "fecha_vencimiento": pasivo.fecha_vencimiento,
-                    "fk_usuarios": pasivo.fk_usuarios.id,  # Extraer el ID del usuario
-                }
-            )
-
-        return resultado
+        return seleccionar_campos(
+            "pasivos",
+            campos or CAMPOS_PASIVO,
+            "fk_usuarios = $usuario_id",
+            {"usuario_id": usuario_id},
+        )
 
     except Exception as e:
         print(f"❌ Error en get_pasivos_service: {e}")
@@ -42,24 +42,17 @@ def get_pasivos_service(usuario_id: int) -> List[dict]:
 
 # GET PASIVO - Obtener un pasivo por ID
 @db_session
-def get_pasivo_service(pasivo_id: int) -> dict:
+def get_pasivo_service(pasivo_id: int, campos: Optional[List[str]] = None) -> dict:
     """Obtiene un pasivo específico por su ID"""
-
     try:
-        pasivo = Pasivo.get(id=pasivo_id)
+        filas = seleccionar_campos(
+            "pasivos", campos or CAMPOS_PASIVO, "id = $pasivo_id", {"pasivo_id": pasivo_id}
+        )
 
-        if not pasivo:
+        if not filas:
             raise ValueError("Pasivo no encontrado")
 
-        return {
-            "id": pasivo.id,
-            "nombre": pasivo.nombre,
-            "tipo": pasivo.tipo,
-            "monto_total": pasivo.monto_total,
-            "pago_mensual": pasivo.pago_mensual,
-            "fecha_vencimiento": pasivo.fecha_vencimiento,
-            "fk_usuarios": pasivo.fk_usuarios.id,  # Extraer el ID del usuario
-        }
+        return filas[0]
     except ValueError:
         raise
     except Exception as e:
@@ -89,6 +82,10 @@ def post_pasivo_service(pasivo_data: PasivoCreate, usuario_id: int):
         if pasivo_data.fecha_vencimiento < date.today():
             raise ValueError("La fecha de vencimiento no puede ser en el pasado")
 
+        # 3.1 Validar tasa de interés (opcional)
+        if pasivo_data.tasa_interes is not None and pasivo_data.tasa_interes < 0:
+            raise ValueError("La tasa de interés no puede ser negativa")
+
         # 4. Validar tipo de pasivo
         tipos_validos = {"Deuda", "Tarjeta", "Préstamo", "Hipoteca"}
         if pasivo_data.tipo not in tipos_validos:
@@ -108,9 +105,12 @@ def post_pasivo_service(pasivo_data: PasivoCreate, usuario_id: int):
             tipo=pasivo_data.tipo,
             pago_mensual=pasivo_data.pago_mensual,
             fecha_vencimiento=pasivo_data.fecha_vencimiento,
+            tasa_interes=pasivo_data.tasa_interes,
             fk_usuarios=usuario,  # Pasar el objeto usuario, no un ID
         )
 
+        registrar_evento("pasivo", "crear", nuevo_pasivo)
+
         commit()
 
         return {
@@ -120,6 +120,7 @@ def post_pasivo_service(pasivo_data: PasivoCreate, usuario_id: int):
             "tipo": nuevo_pasivo.tipo,
             "pago_mensual": nuevo_pasivo.pago_mensual,
             "fecha_vencimiento": nuevo_pasivo.fecha_vencimiento,
+            "tasa_interes": nuevo_pasivo.tasa_interes,
             "fk_usuarios": nuevo_pasivo.fk_usuarios.id,
         }
 
@@ -166,6 +167,10 @@ def put_pasivo_service(pasivo_id: int, pasivo_data: PasivoUpdate, usuario_id) ->
             if datos["fecha_vencimiento"] < date.today():
                 raise ValueError("La fecha de vencimiento no puede ser en el pasado")
 
+        # 4.1 Validar tasa de interés
+        if datos.get("tasa_interes") is not None and datos["tasa_interes"] < 0:
+            raise ValueError("La tasa de interés no puede ser negativa")
+
         # 5. Validar tipo de pasivo
         tipos_validos = {"deuda", "tarjeta", "prestamo", "hipoteca"}
         if pasivo_data.tipo.lower() not in tipos_validos:
@@ -173,10 +178,13 @@ def put_pasivo_service(pasivo_id: int, pasivo_data: PasivoUpdate, usuario_id) ->
                 "Tipo de pasivo inválido. Tipos válidos: deuda, tarjeta, prestamo, hipoteca."
             )
 
-        # Actualizar campos
+        # Actualizar campos (guardando cómo estaba para el outbox)
+        anterior = pasivo.to_dict()
         for campo, valor in datos.items():
             setattr(pasivo, campo, valor)
 
+        registrar_evento("pasivo", "actualizar", pasivo, anterior)
+
         commit()
 
         return {
@@ -186,6 +194,7 @@ def put_pasivo_service(pasivo_id: int, pasivo_data: PasivoUpdate, usuario_id) ->
             "monto_total": pasivo.monto_total,
             "pago_mensual": pasivo.pago_mensual,
             "fecha_vencimiento": pasivo.fecha_vencimiento,
+            "tasa_interes": pasivo.tasa_interes,
             "fk_usuarios": pasivo.fk_usuarios.id,
         }
 
@@ -211,6 +220,7 @@ def delete_pasivo_service(pasivo_id: int, usuario_id: int):
         if pasivo.fk_usuarios.id != usuario_id:
             raise ValueError("No tienes permiso para eliminar este pasivo")
 
+        registrar_evento("pasivo", "eliminar", pasivo)
         pasivo.delete()
 
         commit()
@@ -0,0 +1,117 @@
+# app/services/patrimonioService.py
+# Fotos diarias del patrimonio de cada usuario y su historial
+from datetime import date, timedelta
+from typing import List, Optional
+from pony.orm import db_session
+from app.database.database import db
+from app.services.tiposCambioService import expresion_tasa
+
+
+# Resolución pedida por el endpoint -> unidad de date_trunc de PostgreSQL
+RESOLUCIONES = {"diaria": "day", "semanal": "week", "mensual": "month"}
+
+
+@db_session
+def generar_snapshot_patrimonio(fecha: Optional[date] = None) -> int:
+    """
+    Guarda la foto del día para TODOS los usuarios con un solo INSERT ... SELECT.
+
+    Los totales se calculan con GROUP BY en la BD (no hay un bucle por
+    usuario). Si ya existe la foto del día se reemplaza, así que se puede
+    correr más de una vez sin duplicar filas.
+
+    Los montos se suman convertidos a la moneda de reporte: ingresos y
+    egresos con el tipo de cambio guardado en cada uno, activos al del día
+    de la foto.
+
+    Devuelve la cantidad de usuarios procesados.
+    """
+    fecha = fecha or date.today()
+    tasa = expresion_tasa("a.moneda", "$fecha")
+
+    # Si otro proceso ya está generando la foto, no se repite el trabajo
+    if not db.select("SELECT pg_try_advisory_xact_lock(hashtext('patrimonio_diario'))")[0]:
+        return 0
+
+    db.execute(
+        f"""
+        INSERT INTO patrimonio_diario
+            (fk_usuarios, fecha, total_activos, total_pasivos, ingresos, egresos)
+        SELECT u.id, $fecha,
+               COALESCE(a.total, 0), COALESCE(p.total, 0),
+               COALESCE(i.total, 0), COALESCE(e.total, 0)
+        FROM usuarios u
+        LEFT JOIN (
+            SELECT a.fk_usuarios, SUM(a.valor * {tasa}) AS total FROM activos a GROUP BY 1
+        ) a ON a.fk_usuarios = u.id
+        LEFT JOIN (
+            SELECT fk_usuarios, SUM(monto_total) AS total FROM pasivos GROUP BY fk_usuarios
+        ) p ON p.fk_usuarios = u.id
+        LEFT JOIN (
+            SELECT fk_usuarios, SUM(monto * tasa_cambio) AS total FROM ingresos
+            WHERE fecha = $fecha GROUP BY fk_usuarios
+        ) i ON i.fk_usuarios = u.id
+        LEFT JOIN (
+            SELECT fk_usuarios, SUM(monto * tasa_cambio) AS total FROM egresos
+            WHERE fecha = $fecha GROUP BY fk_usuarios
+        ) e ON e.fk_usuarios = u.id
+        ON CONFLICT (fk_usuarios, fecha) DO UPDATE SET
+            total_activos = EXCLUDED.total_activos,
+            total_pasivos = EXCLUDED.total_pasivos,
+            ingresos = EXCLUDED.ingresos,
+            egresos = EXCLUDED.egresos
+        """
+    )
+
+    return db.select("SELECT COUNT(*) FROM usuarios")[0]
+
+
+@db_session
+def obtener_historial_patrimonio(
+    usuario_id: int, resolucion: str = "diaria", dias: int = 365
+) -> List[dict]:
+    """
+    Serie de patrimonio neto del usuario leída de las fotos diarias.
+
+    Para semanas y meses se toma la última foto del período (activos y
+    pasivos son saldos) y se suman los ingresos y egresos del período.
+    """
+    if resolucion not in RESOLUCIONES:
+        raise ValueError(
+            f"Resolución inválida. Opciones: {', '.join(RESOLUCIONES)}"
+        )
+
+    unidad = RESOLUCIONES[resolucion]
+    desde = date.today() - timedelta(days=dias)
+
+    # Pony exige que la consulta empiece directamente con SELECT
+    filas = db.select(
+        """SELECT periodo, total_activos, total_pasivos, ingresos, egresos
+        FROM (
+            SELECT date_trunc($unidad, fecha)::date AS periodo,
+                   total_activos, total_pasivos,
+                   SUM(ingresos) OVER periodo AS ingresos,
+                   SUM(egresos) OVER periodo AS egresos,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY date_trunc($unidad, fecha) ORDER BY fecha DESC
+                   ) AS orden
+            FROM patrimonio_diario
+            WHERE fk_usuarios = $usuario_id AND fecha >= $desde
+            WINDOW periodo AS (PARTITION BY date_trunc($unidad, fecha))
+        ) t
+        WHERE orden = 1
+        ORDER BY periodo
+        """
+    )
+
+    return [
+        {
+            "periodo": periodo,
+            "total_activos": round(activos, 2),
+            "total_pasivos": round(pasivos, 2),
+            "patrimonio_neto": round(activos - pasivos, 2),
+            "ingresos": round(ingresos, 2),
+            "egresos": round(egresos, 2),
+        }
+        for periodo, activos, pasivos, ingresos, egresos in filas
+    ]
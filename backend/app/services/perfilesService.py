@@ -0,0 +1,282 @@
+# app/services/perfilesService.py
+# Perfiles de CPU de requests puntuales (header X-Perfilar, ver
+# app/middleware/perfilado.py).
+#
+# Dos formatos:
+# - pstats: cProfile (todas las llamadas a funciones, con tiempos exactos).
+#   Se puede ver como texto acá o bajar el archivo y abrirlo con snakeviz.
+# - colapsado: muestras de la pila cada PERFIL_INTERVALO_MS, una línea por
+#   pila ("a;b;c cantidad"), el formato que usan flamegraph.pl y speedscope.
+#
+# Se guardan en disco (PERFILES_DIR) para que cualquier worker de la misma
+# máquina los pueda devolver, y se conservan los últimos PERFILES_MAX.
+#
+# Aparte está el perfilador continuo (PerfiladorContinuo): muestras de las
+# pilas de todos los hilos del proceso, todo el tiempo, acumuladas en memoria
+# (ver app/tareas/perfiladorContinuo.py).
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+DIRECTORIO = os.getenv(
+    "PERFILES_DIR", os.path.join(tempfile.gettempdir(), "finanzas-perfiles")
+)
+MAX_PERFILES = int(os.getenv("PERFILES_MAX", "200"))
+INTERVALO_MUESTREO = float(os.getenv("PERFIL_INTERVALO_MS", "1")) / 1000
+
+# formato -> extensión del archivo
+FORMATOS = {"pstats": "pstats", "colapsado": "txt"}
+ORDENES_PSTATS = ("cumulative", "tottime", "calls")
+
+_ID_VALIDO = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_lock = threading.Lock()
+
+
+# ========== PILAS COLAPSADAS ==========
+
+
+# Prefijos que se sacan de las rutas de archivo para que las pilas sean legibles
+_PREFIJOS = re.compile(r"^.*?/(?:site-packages|dist-packages|lib/python\d+\.\d+|backend)/")
+
+
+@lru_cache(maxsize=8192)
+def _nombre_funcion(codigo) -> str:
+    # "app/services/motorInferenciaService.py:evaluar_agregados"
+    ruta = _PREFIJOS.sub("", codigo.co_filename.replace("\\", "/"))
+    return f"{ruta}:{codigo.co_name}"
+
+
+def pila_colapsada(frame) -> str:
+    """La pila del frame, de la raíz a la hoja, separada por ';'"""
+    nombres = []
+    while frame is not None:
+        nombres.append(_nombre_funcion(frame.f_code))
+        frame = frame.f_back
+    nombres.reverse()
+    return ";".join(nombres)
+
+
+def texto_colapsado(muestras: Counter) -> str:
+    return "".join(f"{pila} {cantidad}\n" for pila, cantidad in muestras.most_common())
+
+
+class MuestreadorHilo:
+    """
+    Toma muestras de la pila de UN hilo cada `intervalo` segundos desde un
+    hilo aparte (sys._current_frames), hasta que se llama a detener().
+    """
+
+    def __init__(self, hilo_id: int, intervalo: float = INTERVALO_MUESTREO):
+        self.hilo_id = hilo_id
+        self.intervalo = intervalo
+        self.muestras: Counter = Counter()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(
+            target=self._muestrear, name="perfil-muestreo", daemon=True
+        )
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo_id)
+            if frame is not None:
+                self.muestras[pila_colapsada(frame)] += 1
+
+    def detener(self) -> Counter:
+        self._detener.set()
+        self._hilo.join()
+        return self.muestras
+
+
+# ========== PERFILADOR CONTINUO ==========
+
+# Funciones donde un hilo está esperando (sin usar CPU). Las muestras que
+# terminan en ellas se cuentan aparte para que no tapen el resto.
+_ESPERAS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+}
+
+# Tope del costo de muestrear: mientras recorre las pilas el muestreador
+# tiene el GIL, así que espera al menos 49 veces lo que tardó (<= 2%)
+_FACTOR_ESPERA = 49
+
+
+def _esperando(frame) -> bool:
+    codigo = frame.f_code
+    return (os.path.basename(codigo.co_filename), codigo.co_name) in _ESPERAS
+
+
+class PerfiladorContinuo:
+    """
+    Pilas colapsadas de todos los hilos, acumuladas desde el último reinicio.
+    Las toma app/tareas/perfiladorContinuo.py cada `intervalo` segundos.
+    """
+
+    def __init__(self, intervalo: float, max_pilas: int):
+        self.intervalo = intervalo
+        self.max_pilas = max_pilas
+        self.activo = False  # Lo prende la tarea al arrancar
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self) -> Counter:
+        """Empieza de cero y devuelve lo acumulado hasta ahora"""
+        with self._lock:
+            anteriores = getattr(self, "muestras", Counter())
+            self.muestras: Counter = Counter()
+            self.esperando = 0
+            self.rondas = 0
+            self.segundos_muestreando = 0.0
+            self.desde = time.time()
+            self._desde_monotonic = time.monotonic()
+        return anteriores
+
+    def muestrear(self, excluir: int) -> float:
+        """
+        Una ronda: la pila de cada hilo menos `excluir` (el del muestreador).
+        Devuelve cuánto esperar hasta la próxima.
+        """
+        inicio = time.perf_counter()
+        pilas = []
+        esperando = 0
+        for hilo_id, frame in sys._current_frames().items():
+            if hilo_id == excluir:
+                continue
+            if _esperando(frame):
+                esperando += 1
+            else:
+                pilas.append(pila_colapsada(frame))
+
+        with self._lock:
+            for pila in pilas:
+                if pila in self.muestras or len(self.muestras) < self.max_pilas:
+                    self.muestras[pila] += 1
+                else:
+                    self.muestras["(otras pilas)"] += 1
+            self.esperando += esperando
+            self.rondas += 1
+            duracion = time.perf_counter() - inicio
+            self.segundos_muestreando += duracion
+        return max(self.intervalo, duracion * _FACTOR_ESPERA)
+
+    def colapsado(self) -> str:
+        with self._lock:
+            return texto_colapsado(self.muestras)
+
+    def estado(self) -> dict:
+        with self._lock:
+            transcurrido = max(time.monotonic() - self._desde_monotonic, 1e-9)
+            return {
+                "activo": self.activo,
+                "desde": self.desde,
+                "segundos": round(transcurrido, 1),
+                "intervalo_ms": self.intervalo * 1000,
+                "rondas": self.rondas,
+                "muestras": sum(self.muestras.values()),
+                "muestras_esperando": self.esperando,
+                "pilas_distintas": len(self.muestras),
+                # Fracción del tiempo que el muestreador tuvo el GIL
+                "costo_porcentaje": round(
+                    self.segundos_muestreando / transcurrido * 100, 3
+                ),
+            }
+
+
+perfilador_continuo = PerfiladorContinuo(
+    intervalo=float(os.getenv("PERFILADOR_INTERVALO_MS", "10")) / 1000,
+    max_pilas=int(os.getenv("PERFILADOR_MAX_PILAS", "20000")),
+)
+
+
+# ========== ALMACENAMIENTO ==========
+
+
+def _ruta(request_id: str, extension: str) -> str:
+    return os.path.join(DIRECTORIO, f"{request_id}.{extension}")
+
+
+def guardar_perfil(request_id: str, formato: str, contenido: bytes, datos: dict):
+    """Guarda el perfil y sus datos (ruta, duración, ...) y borra los más viejos"""
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    with open(_ruta(request_id, FORMATOS[formato]), "wb") as archivo:
+        archivo.write(contenido)
+    datos = dict(datos, request_id=request_id, formato=formato, creado=time.time())
+    with open(_ruta(request_id, "json"), "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False)
+
+    with _lock:
+        guardados = sorted(
+            (e for e in os.scandir(DIRECTORIO) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        for entrada in guardados[: max(0, len(guardados) - MAX_PERFILES)]:
+            viejo = entrada.name[: -len(".json")]
+            for extension in list(FORMATOS.values()) + ["json"]:
+                try:
+                    os.remove(_ruta(viejo, extension))
+                except FileNotFoundError:
+                    pass
+
+
+def listar_perfiles() -> List[dict]:
+    """Los perfiles guardados, del más nuevo al más viejo"""
+    if not os.path.isdir(DIRECTORIO):
+        return []
+    perfiles = []
+    for entrada in os.scandir(DIRECTORIO):
+        if entrada.name.endswith(".json"):
+            try:
+                with open(entrada.path, encoding="utf-8") as archivo:
+                    perfiles.append(json.load(archivo))
+            except (OSError, ValueError):
+                continue
+    return sorted(perfiles, key=lambda p: p["creado"], reverse=True)
+
+
+def obtener_perfil(
+    request_id: str, crudo: bool = False, orden: str = "cumulative", limite: int = 60
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Devuelve (contenido, media_type, nombre de archivo o None).
+    Los pstats se devuelven como texto (las `limite` funciones más costosas
+    según `orden`) salvo que se pida el archivo crudo.
+    """
+    if not _ID_VALIDO.match(request_id):
+        raise ValueError("ID de request inválido")
+    if orden not in ORDENES_PSTATS:
+        raise ValueError(f"Orden inválido. Opciones: {', '.join(ORDENES_PSTATS)}")
+
+    ruta_pstats = _ruta(request_id, FORMATOS["pstats"])
+    ruta_colapsado = _ruta(request_id, FORMATOS["colapsado"])
+
+    if os.path.exists(ruta_colapsado):
+        with open(ruta_colapsado, "rb") as archivo:
+            return archivo.read(), "text/plain; charset=utf-8", None
+
+    if not os.path.exists(ruta_pstats):
+        raise ValueError(f"Perfil del request {request_id} no encontrado")
+
+    if crudo:
+        with open(ruta_pstats, "rb") as archivo:
+            return archivo.read(), "application/octet-stream", f"{request_id}.pstats"
+
+    salida = io.StringIO()
+    estadisticas = pstats.Stats(ruta_pstats, stream=salida)
+    estadisticas.strip_dirs().sort_stats(orden).print_stats(limite)
+    return salida.getvalue().encode(), "text/plain; charset=utf-8", None
@@ -0,0 +1,313 @@
+# app/services/presupuestoService.py
+# Presupuestos mensuales por categoría (ver sql/009_presupuestos.sql).
+#
+# Lo consumido de cada presupuesto en cada mes es un contador
+# (consumos_presupuesto) que egresoService actualiza con cada alta, cambio o
+# baja, en la misma transacción. Así el estado de los presupuestos es una
+# lectura de una fila por presupuesto, sin sumar egresos. Los presupuestos y
+# los contadores están en la moneda de reporte.
+#
+# Cuando un egreso hace que el consumo del mes en curso pase el umbral de
+# aviso o el monto del presupuesto, se registra una alerta en el outbox
+# (entidad "presupuesto", operación "alerta"): le llega a los consumidores
+# como cualquier otro evento (por ejemplo a las conexiones SSE del usuario).
+from datetime import date
+from typing import Dict, List, Optional
+from pony.orm import db_session, commit, flush
+from app.database.database import db
+from app.models.presupuesto import Presupuesto
+from app.models.usuario import Usuario
+from app.schemas.presupuesto import PresupuestoCreate, PresupuestoUpdate
+from app.services.amortizacionService import sumar_meses
+from app.services.outboxService import registrar_alerta
+from app.services.saldosService import clave_categoria, expresion_total
+from app.services.tiposCambioService import monto_en_reporte
+
+ESTADOS = ("ok", "alerta", "excedido")
+
+
+def _mes(fecha: date) -> date:
+    return fecha.replace(day=1)
+
+
+def _nivel(consumido: float, monto: float, umbral: float) -> int:
+    """0: dentro del presupuesto, 1: pasó el umbral de aviso, 2: se excedió"""
+    if consumido > monto:
+        return 2
+    if consumido >= monto * umbral:
+        return 1
+    return 0
+
+
+def _estado(presupuesto_id, categoria, monto, umbral, consumido, mes) -> dict:
+    return {
+        "id": presupuesto_id,
+        "categoria": categoria,
+        "mes": mes,
+        "monto_mensual": round(monto, 2),
+        "umbral_alerta": umbral,
+        "consumido": round(consumido, 2),
+        "restante": round(monto - consumido, 2),
+        "porcentaje": round(consumido / monto * 100, 1),
+        "estado": ESTADOS[_nivel(consumido, monto, umbral)],
+    }
+
+
+# ========== CONTADORES ==========
+
+
+def _inicializar_consumos(presupuesto_id: int, usuario_id: int, categoria: str):
+    """
+    Arma los contadores del presupuesto desde el mes en curso (incluye los
+    egresos con fecha futura) con los totales por mes del libro diario.
+    """
+    desde = _mes(date.today())
+    db.execute("DELETE FROM consumos_presupuesto WHERE fk_presupuestos = $presupuesto_id")
+    db.execute(
+        """
+        INSERT INTO consumos_presupuesto (fk_presupuestos, mes, consumido)
+        SELECT $presupuesto_id, date_trunc('month', fecha)::date, SUM(monto)
+        FROM saldos_diarios
+        WHERE fk_usuarios = $usuario_id AND tipo = 'egreso' AND categoria = $categoria
+          AND fecha >= $desde
+        GROUP BY 2
+        """
+    )
+
+
+def reconstruir_consumos(usuario_id: int):
+    """
+    Arma de cero los contadores de todos los presupuestos del usuario. No
+    hace commit, y va DESPUÉS de rearmar el libro diario.
+    """
+    for presupuesto_id, categoria in db.select(
+        "SELECT id, categoria FROM presupuestos WHERE fk_usuarios = $usuario_id"
+    ):
+        _inicializar_consumos(presupuesto_id, usuario_id, categoria)
+
+
+def _sumar_consumo(usuario_id: int, categoria: str, mes: date, delta: float) -> List[tuple]:
+    """
+    Suma `delta` al consumo del mes del presupuesto de la categoría (si hay).
+    Si el contador del mes todavía no existe, se crea con el total del mes
+    del libro diario, que ya incluye este cambio. Devuelve las filas
+    (id, monto_mensual, umbral_alerta, consumido nuevo).
+    """
+    antes = mes - date.resolution
+    hasta = sumar_meses(mes, 1) - date.resolution
+    total_mes = expresion_total("'egreso'", "p.categoria", "$antes", "$hasta")
+    return db.execute(
+        f"""
+        WITH consumo AS (
+            INSERT INTO consumos_presupuesto (fk_presupuestos, mes, consumido)
+            SELECT p.id, $mes, {total_mes}
+            FROM presupuestos p
+            WHERE p.fk_usuarios = $usuario_id AND p.categoria = $categoria
+            ON CONFLICT (fk_presupuestos, mes) DO UPDATE
+            SET consumido = consumos_presupuesto.consumido + $delta
+            RETURNING fk_presupuestos, consumido
+        )
+        SELECT p.id, p.monto_mensual, p.umbral_alerta, consumo.consumido
+        FROM consumo JOIN presupuestos p ON p.id = consumo.fk_presupuestos
+        """
+    ).fetchall()
+
+
+def actualizar_consumos(
+    usuario_id: int, anterior: Optional[dict], nuevo: Optional[dict]
+) -> List[dict]:
+    """
+    Actualiza los contadores por el alta (anterior=None), la modificación o
+    la baja (nuevo=None) de un egreso. Devuelve las alertas que disparó (el
+    consumo del mes en curso pasó el umbral o el monto de un presupuesto).
+
+    IMPORTANTE: no hace commit, y va DESPUÉS de saldosService.registrar_cambio
+    (un contador nuevo se arma con el libro diario ya actualizado).
+    """
+    # Un cambio que no mueve el egreso de categoría ni de mes es un solo delta
+    deltas: Dict[tuple, float] = {}
+    for datos, signo in ((anterior, -1), (nuevo, 1)):
+        if datos is not None:
+            clave = (clave_categoria(datos["categoria"]), _mes(datos["fecha"]))
+            deltas[clave] = deltas.get(clave, 0.0) + signo * monto_en_reporte(datos)
+
+    mes_actual = _mes(date.today())
+    alertas = []
+    for (categoria, mes), delta in deltas.items():
+        if delta == 0:
+            continue
+        for presupuesto_id, monto, umbral, consumido in _sumar_consumo(
+            usuario_id, categoria, mes, delta
+        ):
+            nivel = _nivel(consumido, monto, umbral)
+            # Solo avisa al subir de nivel, y solo por el mes en curso
+            if mes != mes_actual or nivel <= _nivel(consumido - delta, monto, umbral):
+                continue
+            alerta = _estado(presupuesto_id, categoria, monto, umbral, consumido, mes)
+            registrar_alerta("presupuesto", presupuesto_id, usuario_id, alerta)
+            alertas.append(alerta)
+    return alertas
+
+
+# ========== PRESUPUESTOS ==========
+
+
+# GET PRESUPUESTOS - Estado de los presupuestos en el mes en curso
+@db_session
+def get_presupuestos_service(usuario_id: int) -> List[dict]:
+    """Cada presupuesto con lo consumido y lo que queda este mes (una consulta)"""
+    try:
+        mes = _mes(date.today())
+        filas = db.select(
+            """SELECT p.id, p.categoria, p.monto_mensual, p.umbral_alerta,
+                   COALESCE(c.consumido, 0)
+            FROM presupuestos p
+            LEFT JOIN consumos_presupuesto c ON c.fk_presupuestos = p.id AND c.mes = $mes
+            WHERE p.fk_usuarios = $usuario_id
+            ORDER BY p.categoria
+            """
+        )
+        return [_estado(*fila, mes) for fila in filas]
+    except Exception as e:
+        print(f"❌ Error en get_presupuestos_service: {e}")
+        raise ValueError(str(e))
+
+
+def _validar(monto_mensual: Optional[float], umbral_alerta: Optional[float]):
+    if monto_mensual is not None and monto_mensual <= 0:
+        raise ValueError("El monto mensual debe ser mayor a 0")
+    if umbral_alerta is not None and not 0 < umbral_alerta <= 1:
+        raise ValueError("El umbral de alerta debe estar entre 0 y 1")
+
+
+def _existe(usuario_id: int, categoria: str) -> bool:
+    return Presupuesto.get(fk_usuarios=usuario_id, categoria=categoria) is not None
+
+
+def _consumido(presupuesto_id: int, mes: date) -> float:
+    filas = db.select(
+        """SELECT consumido FROM consumos_presupuesto
+        WHERE fk_presupuestos = $presupuesto_id AND mes = $mes"""
+    )
+    return filas[0] if filas else 0.0
+
+
+# POST PRESUPUESTO - Crea el presupuesto de una categoría
+@db_session
+def post_presupuesto_service(data: PresupuestoCreate, usuario_id: int) -> dict:
+    try:
+        _validar(data.monto_mensual, data.umbral_alerta)
+
+        usuario = Usuario.get(id=usuario_id)
+        if not usuario:
+            raise ValueError("Usuario no encontrado")
+
+        categoria = clave_categoria(data.categoria)
+        if _existe(usuario_id, categoria):
+            raise ValueError(f"Ya hay un presupuesto para la categoría {categoria}")
+
+        presupuesto = Presupuesto(
+            fk_usuarios=usuario,
+            categoria=categoria,
+            monto_mensual=data.monto_mensual,
+            umbral_alerta=data.umbral_alerta,
+        )
+        flush()  # Para tener el ID
+        _inicializar_consumos(presupuesto.id, usuario_id, categoria)
+
+        commit()
+
+        mes = _mes(date.today())
+        return _estado(
+            presupuesto.id,
+            categoria,
+            presupuesto.monto_mensual,
+            presupuesto.umbral_alerta,
+            _consumido(presupuesto.id, mes),
+            mes,
+        )
+
+    except ValueError:
+        raise
+    except Exception as e:
+        print("❌ Error en post_presupuesto_service:", e)
+        raise ValueError(f"Error al crear el presupuesto: {str(e)}")
+
+
+# PUT PRESUPUESTO - Cambia el monto, el umbral o la categoría
+@db_session
+def put_presupuesto_service(
+    presupuesto_id: int, data: PresupuestoUpdate, usuario_id: int
+) -> dict:
+    try:
+        presupuesto = Presupuesto.get(id=presupuesto_id)
+
+        if not presupuesto:
+            raise ValueError("Presupuesto no encontrado")
+
+        if presupuesto.fk_usuarios.id != usuario_id:
+            raise ValueError("No tienes permiso para modificar este presupuesto")
+
+        datos = data.dict(exclude_unset=True)
+        if not datos:
+            raise ValueError("No hay campos para actualizar")
+
+        _validar(datos.get("monto_mensual"), datos.get("umbral_alerta"))
+
+        if "categoria" in datos:
+            categoria = clave_categoria(datos["categoria"])
+            if categoria != presupuesto.categoria:
+                if _existe(usuario_id, categoria):
+                    raise ValueError(f"Ya hay un presupuesto para la categoría {categoria}")
+                presupuesto.categoria = categoria
+                flush()
+                # Los contadores eran de la otra categoría
+                _inicializar_consumos(presupuesto.id, usuario_id, categoria)
+            del datos["categoria"]
+
+        for campo, valor in datos.items():
+            setattr(presupuesto, campo, valor)
+
+        commit()
+
+        mes = _mes(date.today())
+        return _estado(
+            presupuesto.id,
+            presupuesto.categoria,
+            presupuesto.monto_mensual,
+            presupuesto.umbral_alerta,
+            _consumido(presupuesto.id, mes),
+            mes,
+        )
+
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"❌ Error en put_presupuesto_service: {e}")
+        raise ValueError(str(e))
+
+
+# DELETE PRESUPUESTO
+@db_session
+def delete_presupuesto_service(presupuesto_id: int, usuario_id: int) -> dict:
+    try:
+        presupuesto = Presupuesto.get(id=presupuesto_id)
+
+        if not presupuesto:
+            raise ValueError("Presupuesto no encontrado")
+
+        if presupuesto.fk_usuarios.id != usuario_id:
+            raise ValueError("No tienes permiso para eliminar este presupuesto")
+
+        # Los contadores se borran en cascada
+        presupuesto.delete()
+
+        commit()
+
+        return {"mensaje": f"Presupuesto con ID {presupuesto_id} eliminado correctamente"}
+
+    except ValueError:
+        raise
+    except Exception as e:
+        print("❌ Error en delete_presupuesto_service:", e)
+        raise ValueError(f"Error al eliminar el presupuesto: {str(e)}")
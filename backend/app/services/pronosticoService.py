@@ -0,0 +1,200 @@
+# app/services/pronosticoService.py
+# Pronóstico de los egresos de los próximos meses, por categoría.
+#
+# Todas las categorías se pronostican juntas con NumPy (como los cronogramas
+# de amortizacionService): la serie mensual es una matriz categorías x meses
+# y cada modelo se ajusta con operaciones sobre la matriz entera, sin un
+# bucle de Python por categoría.
+#
+# Modelos:
+# - suavizado exponencial simple: se prueba una grilla de alfas y cada
+#   categoría se queda con el de menor error cuadrático a un paso.
+# - estacional ingenuo (lo mismo que hace 12 meses): solo con más de un año
+#   de historia, y solo en las categorías donde se equivoca menos que el
+#   suavizado en los mismos meses.
+# Los intervalos salen del error de ajuste, suponiendo errores normales.
+from datetime import date
+from typing import Dict, List, Tuple
+import numpy as np
+from pony.orm import db_session
+from app.database.database import db
+from app.services.amortizacionService import sumar_meses
+from app.services.motorInferenciaService import (
+    CATEGORIAS_NECESIDADES,
+    CATEGORIAS_DESEOS,
+    CATEGORIAS_AHORROS,
+)
+
+ALFAS = np.linspace(0.05, 0.95, 19)
+ESTACIONALIDAD = 12
+# Nivel del intervalo (%) -> cuantil de la normal
+CUANTILES = {80: 1.2816, 90: 1.6449, 95: 1.96}
+
+GRUPOS = {
+    "necesidades": CATEGORIAS_NECESIDADES,
+    "deseos": CATEGORIAS_DESEOS,
+    "ahorros": CATEGORIAS_AHORROS,
+}
+
+
+def pronosticar_series(series, horizonte: int = 1, nivel: int = 80) -> dict:
+    """
+    Pronostica varias series mensuales a la vez.
+
+    Recibe una matriz (series x meses), del mes más viejo al más nuevo, con
+    al menos 2 meses. Devuelve matrices (series x horizonte) de pronóstico,
+    mínimo, máximo y varianza, y por serie el modelo elegido (True si es el
+    estacional) y el alfa del suavizado.
+    """
+    y = np.asarray(series, dtype=float)
+    cantidad, meses = y.shape
+    h = np.arange(1, horizonte + 1)
+
+    # Suavizado exponencial para todos los alfas y series a la vez (alfas x series)
+    nivel_actual = np.broadcast_to(y[:, 0], (len(ALFAS), cantidad)).copy()
+    errores = np.empty((len(ALFAS), cantidad, meses - 1))
+    for t in range(1, meses):
+        errores[:, :, t - 1] = y[:, t] - nivel_actual
+        nivel_actual += ALFAS[:, None] * errores[:, :, t - 1]
+
+    mejor = np.argmin((errores**2).sum(axis=2), axis=0)
+    filas = np.arange(cantidad)
+    alfa = ALFAS[mejor]
+    errores_ses = errores[mejor, filas]  # (series x meses - 1)
+    varianza_ses = (errores_ses**2).mean(axis=1)
+
+    pronostico = np.repeat(nivel_actual[mejor, filas][:, None], horizonte, axis=1)
+    # Varianza a h pasos del suavizado simple: sigma² (1 + (h - 1) alfa²)
+    varianza = varianza_ses[:, None] * (1 + (h[None, :] - 1) * alfa[:, None] ** 2)
+    estacional = np.zeros(cantidad, dtype=bool)
+
+    if meses > ESTACIONALIDAD:
+        errores_est = y[:, ESTACIONALIDAD:] - y[:, :-ESTACIONALIDAD]
+        varianza_est = (errores_est**2).mean(axis=1)
+        # Se comparan en los mismos meses (los que tienen un año antes)
+        comparables = errores_ses[:, ESTACIONALIDAD - 1 :]
+        estacional = varianza_est < (comparables**2).mean(axis=1)
+
+        indices = meses - ESTACIONALIDAD + (h - 1) % ESTACIONALIDAD
+        pronostico_est = y[:, indices]
+        varianza_h = varianza_est[:, None] * ((h[None, :] - 1) // ESTACIONALIDAD + 1)
+        pronostico = np.where(estacional[:, None], pronostico_est, pronostico)
+        varianza = np.where(estacional[:, None], varianza_h, varianza)
+
+    margen = CUANTILES[nivel] * np.sqrt(varianza)
+    pronostico = np.maximum(pronostico, 0.0)
+    return {
+        "pronostico": pronostico,
+        "minimo": np.maximum(pronostico - margen, 0.0),
+        "maximo": pronostico + margen,
+        "varianza": varianza,
+        "estacional": estacional,
+        "alfa": alfa,
+    }
+
+
+def serie_mensual_categorias(
+    usuario_id: int, meses: int
+) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Egresos por categoría de los últimos `meses` meses completos (sin el
+    actual), desde el primer mes con egresos. Una consulta al libro diario
+    (saldos_diarios). Devuelve (categorías, meses "YYYY-MM", matriz).
+    """
+    hasta = date.today().replace(day=1)
+    desde = sumar_meses(hasta, -meses)
+    filas = db.select(
+        """SELECT categoria, to_char(fecha, 'YYYY-MM'), SUM(monto)
+        FROM saldos_diarios
+        WHERE fk_usuarios = $usuario_id AND tipo = 'egreso' AND categoria <> ''
+          AND fecha >= $desde AND fecha < $hasta
+        GROUP BY 1, 2
+        """
+    )
+    todos = [sumar_meses(desde, i).strftime("%Y-%m") for i in range(meses)]
+    con_datos = {mes for _, mes, _ in filas}
+    etiquetas = [mes for mes in todos if mes >= min(con_datos, default="9999")]
+    categorias = sorted({categoria for categoria, _, _ in filas})
+
+    fila_de = {categoria: i for i, categoria in enumerate(categorias)}
+    columna_de = {mes: j for j, mes in enumerate(etiquetas)}
+    matriz = np.zeros((len(categorias), len(etiquetas)))
+    for categoria, mes, monto in filas:
+        matriz[fila_de[categoria], columna_de[mes]] = monto
+    return categorias, etiquetas, matriz
+
+
+def _agrupar(resultado: dict, indices: List[int], columna: int, nivel: int) -> dict:
+    """Suma de varias categorías (intervalo suponiendo errores independientes)"""
+    pronostico = float(resultado["pronostico"][indices, columna].sum())
+    desvio = float(np.sqrt(resultado["varianza"][indices, columna].sum()))
+    margen = CUANTILES[nivel] * desvio
+    return {
+        "pronostico": round(pronostico, 2),
+        "minimo": round(max(pronostico - margen, 0.0), 2),
+        "maximo": round(pronostico + margen, 2),
+    }
+
+
+@db_session
+def pronosticar_egresos(
+    usuario_id: int, meses: int = 12, horizonte: int = 1, nivel: int = 80
+) -> Dict:
+    """
+    Pronóstico de egresos por categoría para los `horizonte` meses que
+    siguen al último completo (el primero es el mes en curso), usando los
+    últimos `meses` meses. Incluye el total y los grupos de la regla
+    50/30/20.
+    """
+    if nivel not in CUANTILES:
+        raise ValueError(
+            f"Nivel inválido. Opciones: {', '.join(str(n) for n in CUANTILES)}"
+        )
+
+    categorias, etiquetas, matriz = serie_mensual_categorias(usuario_id, meses)
+    if len(etiquetas) < 2 or not categorias:
+        raise ValueError("Se necesitan al menos 2 meses completos de egresos para pronosticar")
+
+    resultado = pronosticar_series(matriz, horizonte, nivel)
+    inicio = date.today().replace(day=1)
+
+    pronosticos = []
+    for k in range(horizonte):
+        por_categoria = [
+            {
+                "categoria": categoria,
+                "pronostico": round(float(resultado["pronostico"][i, k]), 2),
+                "minimo": round(float(resultado["minimo"][i, k]), 2),
+                "maximo": round(float(resultado["maximo"][i, k]), 2),
+                "modelo": (
+                    "estacional_ingenuo"
+                    if resultado["estacional"][i]
+                    else "suavizado_exponencial"
+                ),
+            }
+            for i, categoria in enumerate(categorias)
+        ]
+        grupos = {
+            grupo: _agrupar(
+                resultado,
+                [i for i, c in enumerate(categorias) if c in incluidas],
+                k,
+                nivel,
+            )
+            for grupo, incluidas in GRUPOS.items()
+        }
+        pronosticos.append(
+            {
+                "mes": sumar_meses(inicio, k).strftime("%Y-%m"),
+                "total": _agrupar(resultado, list(range(len(categorias))), k, nivel),
+                "grupos_50_30_20": grupos,
+                "categorias": por_categoria,
+            }
+        )
+
+    return {
+        "usuario_id": usuario_id,
+        "historia": {"desde": etiquetas[0], "hasta": etiquetas[-1], "meses": len(etiquetas)},
+        "nivel": nivel,
+        "pronosticos": pronosticos,
+    }
@@ -0,0 +1,50 @@
+# app/services/proyeccionService.py
+# Campos parciales (?fields=id,monto,fecha) para los endpoints de listado y
+# detalle. Solo se leen de la BD las columnas pedidas y solo esas se devuelven.
+from typing import Dict, List, Optional
+from app.database.database import db
+
+
+def parsear_campos(fields: Optional[str], disponibles: List[str]) -> Optional[List[str]]:
+    """
+    Convierte "monto,fecha" en una lista de columnas válidas.
+    Devuelve None si no se pidieron campos (se devuelven todos).
+    """
+    if fields is None:
+        return None
+
+    pedidos = [c.strip() for c in fields.split(",") if c.strip()]
+    if not pedidos:
+        raise ValueError("El parámetro fields no puede estar vacío")
+
+    invalidos = [c for c in pedidos if c not in disponibles]
+    if invalidos:
+        raise ValueError(
+            f"Campos inválidos: {', '.join(invalidos)}. "
+            f"Opciones: {', '.join(disponibles)}"
+        )
+
+    # Sin repetidos y en el mismo orden que el esquema
+    return [c for c in disponibles if c in pedidos]
+
+
+def seleccionar_campos(
+    tabla: str, campos: List[str], condicion: str, parametros: Dict
+) -> List[dict]:
+    """
+    SELECT solo de las columnas pedidas, armando los dicts directamente desde
+    las tuplas (sin instanciar entidades de Pony).
+
+    IMPORTANTE: `tabla`, `campos` y `condicion` se insertan en el SQL, así que
+    deben venir del código (campos validados con parsear_campos), nunca del
+    usuario. Los valores van en `parametros` y se referencian con $nombre.
+    """
+    # Pony exige que la consulta empiece directamente con SELECT
+    filas = db.select(
+        f"SELECT {', '.join(campos)} FROM {tabla} WHERE {condicion} ORDER BY id",
+        dict(parametros),  # Pony toma los $parametros de este dict
+    )
+    if len(campos) == 1:
+        # Con una sola columna Pony devuelve los valores sueltos
+        return [{campos[0]: valor} for valor in filas]
+    return [dict(zip(campos, fila)) for fila in filas]
@@ -0,0 +1,218 @@
+# app/services/recurrentesService.py
+# Egresos que se repiten (suscripciones, alquiler, seguros...) y cuánto
+# suman por año.
+#
+# Detección (detectar_recurrentes), casi lineal en la cantidad de egresos:
+# 1. Se ordenan por (categoría, monto) y un barrido los agrupa en montos
+#    parecidos (hasta RECURRENTES_TOLERANCIA_MONTO de diferencia con el
+#    menor del grupo).
+# 2. Cada grupo se ordena por fecha y se miran los días entre uno y otro:
+#    si casi todos rondan una semana, un mes o un año, es recurrente.
+#
+# Los resultados se guardan en memoria por usuario y categoría. Las altas,
+# cambios y bajas de este proceso marcan en el momento qué categorías
+# cambiaron (invalidar_recurrentes) y el outbox avisa las de los demás
+# procesos (consumidor "egresos_recurrentes"); solo esas se vuelven a
+# calcular, con una consulta, la próxima vez que se piden.
+# Sin despachador del outbox (DESPACHADOR_OUTBOX=0) no hay avisos, así que
+# se calcula todo en cada pedido.
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from statistics import median
+from typing import Dict, List, Optional, Set
+from pony.orm import db_session
+from app.database.database import db
+from app.services.saldosService import SIN_CATEGORIA, clave_categoria
+from app.tareas.despachadorOutbox import HABILITADO as HAY_AVISOS, consumidor
+
+TOLERANCIA_MONTO = float(os.getenv("RECURRENTES_TOLERANCIA_MONTO", "0.1"))
+MAX_USUARIOS_CACHE = int(os.getenv("RECURRENTES_MAX_USUARIOS", "10000"))
+
+# periodicidad -> (días entre ocurrencias, tolerancia en días, mínimo de ocurrencias)
+PERIODOS = {
+    "semanal": (7, 1, 4),
+    "mensual": (30.44, 4, 3),
+    "anual": (365.25, 15, 2),
+}
+# Fracción de los intervalos que tiene que caer dentro de la tolerancia
+# (permite algún pago adelantado o atrasado)
+MIN_COINCIDENCIAS = 0.75
+
+
+def _periodicidad(fechas: List[date]) -> Optional[str]:
+    """La periodicidad de unas fechas ordenadas, o None si no son periódicas"""
+    intervalos = [(b - a).days for a, b in zip(fechas, fechas[1:])]
+    if not intervalos:
+        return None
+    tipico = median(intervalos)
+    for nombre, (dias, tolerancia, minimo) in PERIODOS.items():
+        if len(fechas) < minimo or abs(tipico - dias) > tolerancia:
+            continue
+        coincidencias = sum(1 for i in intervalos if abs(i - dias) <= tolerancia)
+        if coincidencias >= MIN_COINCIDENCIAS * len(intervalos):
+            return nombre
+    return None
+
+
+def _patron(categoria: str, grupo: List[tuple]) -> Optional[dict]:
+    """grupo: [(fecha, monto)] de montos parecidos de una categoría"""
+    grupo.sort()
+    # Dos cargos el mismo día cuentan como uno (el intervalo sería 0)
+    fechas = sorted({fecha for fecha, _ in grupo})
+    periodicidad = _periodicidad(fechas)
+    if periodicidad is None:
+        return None
+
+    dias = PERIODOS[periodicidad][0]
+    monto = grupo[-1][1]  # El último (si aumentó, el precio actual)
+    ultima = fechas[-1]
+    proxima = ultima + timedelta(days=round(dias))
+    return {
+        "categoria": categoria,
+        "periodicidad": periodicidad,
+        "monto": round(monto, 2),
+        "ocurrencias": len(fechas),
+        "primera": fechas[0],
+        "ultima": ultima,
+        "proxima": proxima,
+        "total_anual": round(monto * 365.25 / dias, 2),
+    }
+
+
+def detectar_recurrentes(movimientos: List[tuple]) -> List[dict]:
+    """
+    Patrones recurrentes en movimientos [(categoria, fecha, monto)]. La
+    categoría ya tiene que venir normalizada (clave_categoria).
+    """
+    patrones = []
+    grupo: List[tuple] = []
+    categoria_grupo, minimo = None, 0.0
+
+    for categoria, fecha, monto in sorted(movimientos, key=lambda m: (m[0], m[2])):
+        if categoria != categoria_grupo or monto > minimo * (1 + TOLERANCIA_MONTO):
+            if grupo:
+                patron = _patron(categoria_grupo, grupo)
+                if patron:
+                    patrones.append(patron)
+            grupo, categoria_grupo, minimo = [], categoria, monto
+        grupo.append((fecha, monto))
+
+    if grupo:
+        patron = _patron(categoria_grupo, grupo)
+        if patron:
+            patrones.append(patron)
+    return patrones
+
+
+# ========== CACHÉ ==========
+
+# usuario -> {categoría: patrones}; los usuarios menos consultados se olvidan
+_cache: "OrderedDict[int, Dict[str, List[dict]]]" = OrderedDict()
+# usuario -> categorías que cambiaron desde que se calcularon (están todos
+# los usuarios del caché)
+_pendientes: Dict[int, Set[str]] = {}
+_lock = threading.Lock()
+
+
+def _marcar(usuario_id: int, *movimientos: Optional[dict]):
+    """Anota las categorías de los movimientos (to_dict()) para recalcular. Con _lock"""
+    # Solo interesan los usuarios calculados (o calculándose)
+    if usuario_id not in _pendientes:
+        return
+    cambiadas = _pendientes[usuario_id]
+    for datos in movimientos:
+        if datos:
+            cambiadas.add(clave_categoria(datos.get("categoria")))
+
+
+def invalidar_recurrentes(usuario_id: int, anterior: Optional[dict], nuevo: Optional[dict]):
+    """
+    Lo llama egresoService DESPUÉS de su commit(): el próximo pedido de este
+    proceso ya recalcula las categorías afectadas, sin esperar al outbox
+    (que sigue avisando a los demás procesos).
+    """
+    with _lock:
+        _marcar(usuario_id, nuevo, anterior)
+
+
+@consumidor("egresos_recurrentes", entidades={"egreso"}, persistente=False)
+def marcar_categorias_cambiadas(eventos: List[dict]):
+    """Anota qué categorías de cada usuario hay que volver a calcular"""
+    with _lock:
+        for evento in eventos:
+            _marcar(evento["usuario_id"], evento["datos"], evento["anterior"])
+
+
+def _calcular(usuario_id: int, categorias: Optional[List[str]] = None) -> Dict[str, List[dict]]:
+    """Patrones por categoría (de todas, o solo de las indicadas)"""
+    sin_categoria = SIN_CATEGORIA
+    filtro = ""
+    if categorias is not None:
+        filtro = (
+            "AND COALESCE(NULLIF(lower(trim(categoria)), ''), $sin_categoria)"
+            " = ANY($categorias)"
+        )
+    # Montos en la moneda de reporte (un cargo en dólares que se repite se
+    # agrupa aunque el tipo de cambio se mueva un poco)
+    filas = db.select(
+        f"""SELECT COALESCE(NULLIF(lower(trim(categoria)), ''), $sin_categoria), fecha,
+               monto * tasa_cambio
+        FROM egresos
+        WHERE fk_usuarios = $usuario_id {filtro}
+        """
+    )
+    resultado: Dict[str, List[dict]] = {categoria: [] for categoria in categorias or ()}
+    for patron in detectar_recurrentes(filas):
+        resultado.setdefault(patron["categoria"], []).append(patron)
+    return resultado
+
+
+@db_session
+def obtener_recurrentes(usuario_id: int) -> dict:
+    """
+    Egresos recurrentes del usuario, con el total anual de los que siguen
+    vigentes. Una consulta solo si cambió algo desde la última vez.
+    """
+    with _lock:
+        por_categoria = _cache.get(usuario_id) if HAY_AVISOS else None
+        pendientes = _pendientes.get(usuario_id, set())
+        # Lo que cambie mientras se calcula queda para la próxima vez
+        if HAY_AVISOS:
+            _pendientes[usuario_id] = set()
+
+    if por_categoria is None:
+        por_categoria = _calcular(usuario_id)
+    elif pendientes:
+        por_categoria = dict(por_categoria, **_calcular(usuario_id, sorted(pendientes)))
+
+    if HAY_AVISOS:
+        with _lock:
+            _cache[usuario_id] = por_categoria
+            _cache.move_to_end(usuario_id)
+            while len(_cache) > MAX_USUARIOS_CACHE:
+                viejo, _ = _cache.popitem(last=False)
+                _pendientes.pop(viejo, None)
+
+    # Sigue vigente si el próximo pago no está atrasado más de medio período
+    # (se mira al leer porque el caché puede ser de otro día)
+    hoy = date.today()
+
+    def vigente(patron: dict) -> bool:
+        gracia = timedelta(days=PERIODOS[patron["periodicidad"]][0] / 2)
+        return hoy <= patron["proxima"] + gracia
+
+    patrones = sorted(
+        (dict(p, activa=vigente(p)) for lista in por_categoria.values() for p in lista),
+        key=lambda p: p["total_anual"],
+        reverse=True,
+    )
+    activos = [p for p in patrones if p["activa"]]
+    total_anual = sum(p["total_anual"] for p in activos)
+    return {
+        "usuario_id": usuario_id,
+        "recurrentes": patrones,
+        "total_anual": round(total_anual, 2),
+        "total_mensual": round(total_anual / 12, 2),
+    }
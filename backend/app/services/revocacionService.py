@@ -0,0 +1,221 @@
+# app/services/revocacionService.py
+# Lista de sesiones revocadas (logout, cambio de contraseña, refresh token
+# reutilizado), consultada en CADA request autenticado.
+#
+# Ir a la BD en cada request sería caro, y guardar todas las sesiones
+# revocadas en un set ocupa mucha memoria si son muchas. Se usa un filtro de
+# Bloom: un arreglo de bits donde cada sesión revocada prende k bits.
+# - Si alguno de los k bits de una sesión está apagado, seguro NO está
+#   revocada (el caso de casi todos los requests, unos microsegundos).
+# - Si están todos prendidos PUEDE estar revocada (o ser un falso positivo,
+#   ~1%), y solo en ese caso se confirma en la BD (respaldo exacto).
+#
+# Cada proceso tiene su filtro. Las revocaciones propias se agregan al
+# instante; las de otros procesos llegan con la sincronización periódica
+# (app/tareas/sincronizarRevocaciones.py).
+import hashlib
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Set
+from pony.orm import db_session
+from app.database.database import db
+from app.models.sesion import SesionRevocada
+
+# Sesiones revocadas que entran en el filtro manteniendo la tasa de error
+CAPACIDAD = int(os.getenv("REVOCACION_CAPACIDAD", "100000"))
+TASA_FALSOS_POSITIVOS = float(os.getenv("REVOCACION_FALSOS_POSITIVOS", "0.01"))
+
+# Al sincronizar se vuelve a leer este margen hacia atrás, por si una
+# transacción que empezó antes de la última lectura hizo commit después
+MARGEN_SINCRONIZACION = timedelta(seconds=60)
+
+
+class FiltroBloom:
+    """
+    Conjunto aproximado: `in` puede dar falsos positivos, nunca falsos negativos.
+
+    Con m bits y k funciones de hash para n elementos:
+    m = -n·ln(p) / ln(2)²  y  k = m/n · ln(2)
+    (p = 0.01 -> ~9.6 bits y 7 hashes por elemento: 100.000 sesiones en ~120 KB)
+    """
+
+    def __init__(self, capacidad: int, tasa_falsos_positivos: float):
+        self.capacidad = max(1, capacidad)
+        self.bits = max(
+            8,
+            math.ceil(
+                -self.capacidad * math.log(tasa_falsos_positivos) / math.log(2) ** 2
+            ),
+        )
+        self.hashes = max(1, round(self.bits / self.capacidad * math.log(2)))
+        self._arreglo = bytearray((self.bits + 7) // 8)
+        self.elementos = 0
+
+    def _posiciones(self, clave: str):
+        # Doble hashing: con dos hashes de 64 bits se generan los k
+        digest = hashlib.blake2b(clave.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def agregar(self, clave: str):
+        for posicion in self._posiciones(clave):
+            self._arreglo[posicion >> 3] |= 1 << (posicion & 7)
+        self.elementos += 1
+
+    def __contains__(self, clave: str) -> bool:
+        arreglo = self._arreglo
+        for posicion in self._posiciones(clave):
+            if not arreglo[posicion >> 3] & (1 << (posicion & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.elementos
+
+
+class ListaRevocacion:
+    """Filtro de Bloom + confirmación exacta en la BD"""
+
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self.capacidad = capacidad
+        self._filtro = FiltroBloom(capacidad, TASA_FALSOS_POSITIVOS)
+        self._lock = threading.Lock()
+        # Resultados de la BD para las sesiones que el filtro no puede
+        # descartar, así una sesión con falso positivo no consulta la BD en
+        # cada request. Se vacían al reconstruir el filtro.
+        self._confirmadas: Set[str] = set()
+        self._descartadas: Set[str] = set()
+        self._desde: Optional[datetime] = None
+        # Revocaciones confirmadas mientras se lee la BD para armar el filtro
+        # de cero (None si no se está armando): se pasan al filtro nuevo
+        self._durante_lectura: Optional[Set[str]] = None
+        self._lock_sincronizacion = threading.Lock()
+        self.consultas_bd = 0
+
+    def esta_revocada(self, sesion: str) -> bool:
+        if sesion not in self._filtro:
+            return False
+        if sesion in self._confirmadas:
+            return True
+        if sesion in self._descartadas:
+            return False
+
+        self.consultas_bd += 1
+        revocada = _existe_en_bd(sesion)
+        with self._lock:
+            if revocada:
+                self._confirmar(sesion)
+            else:
+                self._descartadas.add(sesion)
+        return revocada
+
+    def _confirmar(self, sesion: str):
+        # Con self._lock tomado
+        self._confirmadas.add(sesion)
+        if self._durante_lectura is not None:
+            self._durante_lectura.add(sesion)
+
+    def agregar(self, sesiones: Iterable[str]):
+        """Agrega sesiones revocadas (ya guardadas en la BD)"""
+        with self._lock:
+            for sesion in sesiones:
+                self._filtro.agregar(sesion)
+                self._confirmar(sesion)
+                self._descartadas.discard(sesion)
+
+    def sincronizar(self, completa: bool = False) -> int:
+        """
+        Trae de la BD las revocaciones nuevas (de este u otros procesos).
+        Con completa=True arma el filtro de cero: así se olvidan las que ya
+        vencieron y se agranda si se llenó. Devuelve cuántas leyó.
+        """
+        with self._lock_sincronizacion:
+            ahora = datetime.now()
+            desde = None if completa or self._desde is None else self._desde
+            if desde is None:
+                with self._lock:
+                    self._durante_lectura = set()
+            try:
+                sesiones = _leer_revocadas(ahora, desde)
+            except Exception:
+                with self._lock:
+                    self._durante_lectura = None
+                raise
+
+            with self._lock:
+                if desde is None:
+                    capacidad = max(self.capacidad, 2 * len(sesiones))
+                    self._filtro = FiltroBloom(capacidad, TASA_FALSOS_POSITIVOS)
+                    # Las revocadas en este proceso mientras se leía pueden
+                    # no estar en la lectura (su commit llegó después)
+                    self._confirmadas = self._durante_lectura
+                    self._durante_lectura = None
+                    for sesion in self._confirmadas:
+                        self._filtro.agregar(sesion)
+                for sesion in sesiones:
+                    self._filtro.agregar(sesion)
+                # Un "no revocada" guardado antes puede haber cambiado
+                self._descartadas = set()
+                self._desde = ahora - MARGEN_SINCRONIZACION
+
+            return len(sesiones)
+
+    def necesita_reconstruir(self) -> bool:
+        # Pasada la capacidad, la tasa de falsos positivos sube rápido
+        return self._filtro.elementos > self._filtro.capacidad
+
+
+lista_revocacion = ListaRevocacion()
+
+
+@db_session
+def _existe_en_bd(sesion: str) -> bool:
+    return SesionRevocada.exists(sesion=sesion)
+
+
+@db_session
+def _leer_revocadas(ahora: datetime, desde: Optional[datetime]) -> list:
+    if desde is None:
+        return db.select(
+            "SELECT sesion FROM sesiones_revocadas WHERE expira > $ahora"
+        )
+    return db.select(
+        "SELECT sesion FROM sesiones_revocadas WHERE creado >= $desde AND expira > $ahora"
+    )
+
+
+def revocar_sesiones(sesiones: Iterable[str], expira: datetime):
+    """
+    Guarda las sesiones como revocadas en la BD.
+    `expira` es cuándo vence el último token que pudo emitirse en ellas.
+
+    IMPORTANTE: se llama dentro de la db_session del servicio y no toca el
+    filtro. Devuelve las sesiones para pasarlas a lista_revocacion.agregar()
+    DESPUÉS del commit (si la transacción se descarta, no tiene que quedar
+    en memoria una sesión revocada que en la BD no lo está).
+    """
+    sesiones = list(dict.fromkeys(sesiones))
+    for sesion in sesiones:
+        revocada = SesionRevocada.get(sesion=sesion)
+        if revocada is None:
+            SesionRevocada(sesion=sesion, expira=expira)
+        elif revocada.expira < expira:
+            revocada.expira = expira
+    return sesiones
+
+
+def esta_revocada(sesion: Optional[str]) -> bool:
+    """Los tokens emitidos antes de que existieran las sesiones no tienen una"""
+    return sesion is not None and lista_revocacion.esta_revocada(sesion)
+
+
+@db_session
+def purgar_revocaciones_vencidas() -> int:
+    """Borra las revocaciones y refresh tokens que ya vencieron"""
+    ahora = datetime.now()
+    db.execute("DELETE FROM refresh_tokens WHERE expira < $ahora")
+    cursor = db.execute("DELETE FROM sesiones_revocadas WHERE expira < $ahora")
+    return cursor.rowcount
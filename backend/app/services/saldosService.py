@@ -0,0 +1,211 @@
+# app/services/saldosService.py
+# Libro diario acumulado de ingresos y egresos (tabla saldos_diarios, ver
+# sql/007_saldos_diarios.sql).
+#
+# Por cada usuario, tipo y categoría se guarda, para cada día con
+# movimientos, lo acumulado hasta ese día. Así:
+# - el total de un período es acumulado(fin) - acumulado(inicio - 1)
+# - el saldo a una fecha es ingresos acumulados - egresos acumulados
+# y cada acumulado es una búsqueda en la clave primaria (el último día con
+# movimientos <= fecha), sin recorrer los movimientos.
+#
+# Lo mantienen los services de ingresos y egresos llamando a
+# registrar_cambio() antes de su commit(), en la misma transacción.
+#
+# Los montos del libro están en la moneda de reporte: monto * tasa_cambio de
+# cada movimiento (ver tiposCambioService).
+from datetime import date, timedelta
+from typing import Dict, Optional
+from pony.orm import db_session
+from app.database.database import db
+from app.services.tiposCambioService import monto_en_reporte
+
+TIPOS = ("ingreso", "egreso")
+TOTAL = ""  # Categoría del total de cada tipo
+SIN_CATEGORIA = "(sin categoría)"
+
+
+def clave_categoria(categoria: str) -> str:
+    """
+    Como se guarda la categoría en el libro: lo mismo que
+    COALESCE(NULLIF(lower(trim(categoria)), ''), '(sin categoría)') en SQL
+    (trim() solo saca espacios, no tabs ni saltos de línea)
+    """
+    return (categoria or "").strip(" ").lower() or SIN_CATEGORIA
+
+
+def _sumar(usuario_id: int, tipo: str, categoria: str, fecha: date, monto: float):
+    """Suma `monto` (negativo para restar) al día `fecha` y a los acumulados siguientes"""
+    db.execute(
+        """
+        UPDATE saldos_diarios SET acumulado = acumulado + $monto
+        WHERE fk_usuarios = $usuario_id AND tipo = $tipo AND categoria = $categoria
+          AND fecha > $fecha
+        """
+    )
+    db.execute(
+        """
+        INSERT INTO saldos_diarios (fk_usuarios, tipo, categoria, fecha, monto, acumulado)
+        SELECT $usuario_id, $tipo, $categoria, $fecha, $monto, $monto + COALESCE((
+            SELECT acumulado FROM saldos_diarios
+            WHERE fk_usuarios = $usuario_id AND tipo = $tipo AND categoria = $categoria
+              AND fecha < $fecha
+            ORDER BY fecha DESC
+            LIMIT 1
+        ), 0)
+        ON CONFLICT (fk_usuarios, tipo, categoria, fecha) DO UPDATE
+        SET monto = saldos_diarios.monto + EXCLUDED.monto,
+            acumulado = saldos_diarios.acumulado + EXCLUDED.monto
+        """
+    )
+    if monto < 0:
+        # El día quedó sin movimientos (se borraron o cambiaron de fecha)
+        db.execute(
+            """
+            DELETE FROM saldos_diarios
+            WHERE fk_usuarios = $usuario_id AND tipo = $tipo AND categoria = $categoria
+              AND fecha = $fecha AND abs(monto) < 1e-9
+            """
+        )
+
+
+def registrar_cambio(
+    tipo: str, usuario_id: int, anterior: Optional[dict], nuevo: Optional[dict]
+):
+    """
+    Actualiza el libro por el alta (anterior=None), la modificación o la
+    baja (nuevo=None) de un ingreso o egreso. `anterior` y `nuevo` son el
+    to_dict() del movimiento (se usan monto, tasa_cambio, categoria y fecha).
+
+    IMPORTANTE: no hace commit. Se llama dentro de la db_session del servicio,
+    antes de su commit(), como registrar_evento del outbox.
+    """
+    # Los cambios de un mismo usuario se hacen de a uno (si no, dos altas
+    # simultáneas podrían calcular el acumulado sin ver la otra)
+    db.execute("SELECT pg_advisory_xact_lock(hashtext('saldos_diarios'), $usuario_id)")
+
+    for datos, signo in ((anterior, -1), (nuevo, 1)):
+        if datos is None:
+            continue
+        monto = signo * monto_en_reporte(datos)
+        for categoria in (TOTAL, clave_categoria(datos["categoria"])):
+            _sumar(usuario_id, tipo, categoria, datos["fecha"], monto)
+
+
+# ========== CONSULTAS ==========
+
+
+# Lo acumulado hasta una fecha: el último día con movimientos <= fecha
+_ACUMULADO = """COALESCE((
+    SELECT acumulado FROM saldos_diarios
+    WHERE fk_usuarios = $usuario_id AND tipo = {tipo} AND categoria = {categoria}
+      AND fecha <= {fecha}
+    ORDER BY fecha DESC
+    LIMIT 1
+), 0)"""
+
+
+def expresion_total(tipo: str, categoria: str, antes: str, hasta: str) -> str:
+    """
+    Expresión SQL del total después de `antes` y hasta `hasta` inclusive,
+    para usar dentro de otra consulta. Los argumentos son SQL: parámetros
+    ("$hasta") o columnas ("c.categoria").
+    """
+    fin = _ACUMULADO.format(tipo=tipo, categoria=categoria, fecha=hasta)
+    inicio = _ACUMULADO.format(tipo=tipo, categoria=categoria, fecha=antes)
+    return f"({fin} - {inicio})"
+
+
+@db_session
+def total_periodo(
+    usuario_id: int,
+    tipo: str,
+    desde: date,
+    hasta: Optional[date] = None,
+    categoria: Optional[str] = None,
+) -> float:
+    """
+    Total de ingresos o egresos entre `desde` y `hasta` inclusive (sin
+    `hasta`: hasta el último movimiento, aunque tenga fecha futura). Con
+    `categoria` solo los de esa categoría (sin distinguir mayúsculas).
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo inválido. Opciones: {', '.join(TIPOS)}")
+    clave = TOTAL if categoria is None else clave_categoria(categoria)
+    hasta = hasta or date.max
+    antes = desde - timedelta(days=1)
+    total = expresion_total("$tipo", "$clave", "$antes", "$hasta")
+    return float(db.select(f"SELECT {total}")[0])
+
+
+@db_session
+def totales_por_categoria(
+    usuario_id: int, tipo: str, desde: date, hasta: Optional[date] = None
+) -> Dict[str, float]:
+    """
+    Total del período de cada categoría del usuario ({"comida": 120.0, ...}),
+    con una sola consulta. Las categorías van en minúsculas.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo inválido. Opciones: {', '.join(TIPOS)}")
+    hasta = hasta or date.max
+    antes = desde - timedelta(days=1)
+    total = expresion_total("$tipo", "c.categoria", "$antes", "$hasta")
+    filas = db.select(
+        f"""SELECT c.categoria, {total}
+        FROM (
+            SELECT DISTINCT categoria FROM saldos_diarios
+            WHERE fk_usuarios = $usuario_id AND tipo = $tipo AND categoria <> ''
+        ) c
+        """
+    )
+    return {categoria: float(total) for categoria, total in filas if total}
+
+
+@db_session
+def saldo_a_fecha(usuario_id: int, fecha: date) -> Dict:
+    """Ingresos, egresos y saldo acumulados hasta `fecha` inclusive"""
+    total = TOTAL
+    ingresos = _ACUMULADO.format(tipo="'ingreso'", categoria="$total", fecha="$fecha")
+    egresos = _ACUMULADO.format(tipo="'egreso'", categoria="$total", fecha="$fecha")
+    ingresos, egresos = db.select(f"SELECT {ingresos}, {egresos}")[0]
+    return {
+        "usuario_id": usuario_id,
+        "fecha": fecha,
+        "ingresos_acumulados": round(ingresos, 2),
+        "egresos_acumulados": round(egresos, 2),
+        "balance": round(ingresos - egresos, 2),
+    }
+
+
+@db_session
+def reconstruir_saldos(usuario_id: int) -> int:
+    """
+    Arma de cero el libro del usuario a partir de sus movimientos (por si
+    se cargaron datos por fuera de los services). Devuelve las filas creadas.
+    """
+    db.execute("SELECT pg_advisory_xact_lock(hashtext('saldos_diarios'), $usuario_id)")
+    db.execute("DELETE FROM saldos_diarios WHERE fk_usuarios = $usuario_id")
+    sin_categoria = SIN_CATEGORIA
+    return db.execute(
+        """
+        INSERT INTO saldos_diarios (fk_usuarios, tipo, categoria, fecha, monto, acumulado)
+        SELECT $usuario_id, tipo, categoria, fecha, monto,
+               SUM(monto) OVER (PARTITION BY tipo, categoria ORDER BY fecha)
+        FROM (
+            SELECT tipo, libro.categoria, fecha, SUM(monto)
+            FROM (
+                SELECT 'ingreso' AS tipo, fecha, monto * tasa_cambio AS monto,
+                       COALESCE(NULLIF(lower(trim(categoria)), ''), $sin_categoria)
+                           AS categoria
+                FROM ingresos WHERE fk_usuarios = $usuario_id
+                UNION ALL
+                SELECT 'egreso', fecha, monto * tasa_cambio,
+                       COALESCE(NULLIF(lower(trim(categoria)), ''), $sin_categoria)
+                FROM egresos WHERE fk_usuarios = $usuario_id
+            ) movimientos
+            CROSS JOIN LATERAL (VALUES (movimientos.categoria), ('')) AS libro (categoria)
+            GROUP BY tipo, libro.categoria, fecha
+        ) dias (tipo, categoria, fecha, monto)
+        """
+    ).rowcount
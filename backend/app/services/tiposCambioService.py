@@ -0,0 +1,190 @@
+# app/services/tiposCambioService.py
+# Tipos de cambio para llevar los montos de cada moneda a la moneda de
+# reporte (MONEDA_REPORTE).
+#
+# Se cargan de un archivo CSV (TIPOS_CAMBIO_ARCHIVO) con una fila por moneda
+# y fecha:
+#
+#   fecha,moneda,valor
+#   2026-01-02,USD,905.10      <- 1 USD = 905.10 en la moneda de reporte
+#
+# El tipo de cambio de un día es el de la última fecha cargada que no sea
+# posterior (o el primero que haya, para fechas anteriores al archivo).
+#
+# Cada ingreso y egreso guarda el tipo de cambio de su moneda y fecha
+# (tasa_cambio, ver sql/011_tasa_cambio_movimientos.sql), que se busca en
+# memoria con búsqueda binaria (bisect) al crearlo o modificarlo. Todo lo que
+# suma movimientos usa monto * tasa_cambio, así las consultas y los libros
+# que se mantienen en cada cambio dan lo mismo y una baja resta exactamente
+# lo que se sumó.
+#
+# Los activos no tienen fecha: se convierten al tipo de cambio de hoy dentro
+# de las consultas (expresion_tasa), con la tabla tipos_cambio
+# (sql/010_monedas.sql, clave (moneda, fecha)), que se sincroniza con el
+# archivo al arrancar.
+import csv
+import os
+import re
+import threading
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+from pony.orm import db_session
+from app.database.database import db
+
+MONEDA_REPORTE = os.getenv("MONEDA_REPORTE", "CLP").upper()
+ARCHIVO = os.getenv("TIPOS_CAMBIO_ARCHIVO")
+
+_CODIGO = re.compile(r"^[A-Z]{3}$")
+if not _CODIGO.match(MONEDA_REPORTE):
+    raise ValueError(f"MONEDA_REPORTE inválida: {MONEDA_REPORTE} (código ISO de 3 letras)")
+
+# moneda -> (fechas ordenadas, valores)
+_tasas: Optional[Dict[str, Tuple[List[date], List[float]]]] = None
+_lock = threading.Lock()
+
+
+def leer_archivo(ruta: Optional[str]) -> Dict[str, Tuple[List[date], List[float]]]:
+    """Lee el CSV de tipos de cambio (sin archivo, solo la moneda de reporte)"""
+    por_moneda: Dict[str, Dict[date, float]] = {}
+    if ruta:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            for numero, fila in enumerate(csv.DictReader(archivo), start=2):
+                try:
+                    moneda = fila["moneda"].strip().upper()
+                    fecha = date.fromisoformat(fila["fecha"].strip())
+                    valor = float(fila["valor"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"{ruta}, línea {numero}: fila inválida ({e})")
+                if not _CODIGO.match(moneda) or valor <= 0:
+                    raise ValueError(f"{ruta}, línea {numero}: moneda o valor inválido")
+                por_moneda.setdefault(moneda, {})[fecha] = valor
+
+    tasas = {}
+    for moneda, valores in por_moneda.items():
+        fechas = sorted(valores)
+        tasas[moneda] = (fechas, [valores[f] for f in fechas])
+    return tasas
+
+
+def _tabla() -> Dict[str, Tuple[List[date], List[float]]]:
+    global _tasas
+    if _tasas is None:
+        with _lock:
+            if _tasas is None:
+                _tasas = leer_archivo(ARCHIVO)
+    return _tasas
+
+
+def monedas() -> List[str]:
+    """Monedas que se pueden usar en los movimientos"""
+    return sorted({MONEDA_REPORTE, *_tabla()})
+
+
+def validar_moneda(moneda: Optional[str]) -> str:
+    """Normaliza el código (None -> moneda de reporte) y verifica que tenga tipo de cambio"""
+    moneda = (moneda or MONEDA_REPORTE).strip().upper()
+    if moneda != MONEDA_REPORTE and moneda not in _tabla():
+        raise ValueError(f"Moneda {moneda} sin tipo de cambio. Opciones: {', '.join(monedas())}")
+    return moneda
+
+
+def tasa(moneda: Optional[str], fecha: date) -> float:
+    """Cuánto vale 1 unidad de `moneda` en la moneda de reporte ese día"""
+    moneda = moneda or MONEDA_REPORTE
+    if moneda == MONEDA_REPORTE:
+        return 1.0
+    if moneda not in _tabla():
+        raise ValueError(f"Moneda {moneda} sin tipo de cambio")
+    fechas, valores = _tabla()[moneda]
+    return valores[max(bisect_right(fechas, fecha) - 1, 0)]
+
+
+def monto_en_reporte(datos: dict) -> float:
+    """
+    El monto de un ingreso o egreso (to_dict()) en la moneda de reporte, con
+    el tipo de cambio que quedó guardado en el movimiento
+    """
+    return float(datos["monto"]) * float(datos["tasa_cambio"])
+
+
+def expresion_tasa(moneda: str, fecha: str) -> str:
+    """
+    Expresión SQL del tipo de cambio de la fila (`moneda` y `fecha` son
+    columnas o expresiones SQL), para multiplicar montos dentro de un SUM
+    (los activos) o recalcular tasa_cambio. Las columnas tienen que ir con
+    el alias de su tabla ("a.moneda"): sin alias, dentro de la subconsulta
+    serían las de tipos_cambio.
+    En la moneda de reporte es 1 y no se busca nada; en las demás son
+    búsquedas por la clave primaria de tipos_cambio.
+    """
+    return f"""CASE WHEN {moneda} = '{MONEDA_REPORTE}' THEN 1 ELSE COALESCE(
+        (SELECT t.valor FROM tipos_cambio t
+         WHERE t.moneda = {moneda} AND t.fecha <= {fecha}
+         ORDER BY t.fecha DESC LIMIT 1),
+        (SELECT t.valor FROM tipos_cambio t
+         WHERE t.moneda = {moneda}
+         ORDER BY t.fecha LIMIT 1)
+    ) END"""
+
+
+def _monedas_cambiadas() -> Set[str]:
+    """Monedas cuyos tipos de cambio en la tabla no son los del archivo"""
+    en_tabla: Dict[str, Dict[date, float]] = {}
+    for moneda, fecha, valor in db.select("SELECT moneda, fecha, valor FROM tipos_cambio"):
+        en_tabla.setdefault(moneda, {})[fecha] = valor
+    en_archivo = {
+        moneda: dict(zip(fechas, valores)) for moneda, (fechas, valores) in _tabla().items()
+    }
+    return {
+        moneda
+        for moneda in en_tabla.keys() | en_archivo.keys()
+        if en_tabla.get(moneda) != en_archivo.get(moneda)
+    }
+
+
+@db_session
+def sincronizar_tipos_cambio() -> Set[int]:
+    """
+    Deja la tabla tipos_cambio igual al archivo (se llama al arrancar) y
+    recalcula la tasa_cambio de los movimientos de las monedas que
+    cambiaron. Devuelve los usuarios con movimientos recalculados (hay que
+    armar de cero sus libros, ver librosService).
+    """
+    # Con varios procesos arrancando a la vez, se cargan de a uno (y los
+    # que siguen ya encuentran la tabla al día)
+    db.execute("SELECT pg_advisory_xact_lock(hashtext('tipos_cambio'))")
+    cambiadas = sorted(_monedas_cambiadas())
+    if not cambiadas:
+        return set()
+
+    db.execute("DELETE FROM tipos_cambio WHERE moneda = ANY($cambiadas)")
+    filas = [
+        (moneda, fecha, valor)
+        for moneda in cambiadas
+        if moneda in _tabla()
+        for fecha, valor in zip(*_tabla()[moneda])
+    ]
+    if filas:
+        # Una sola sentencia con todas las filas (executemany haría una por fila)
+        cursor = db.get_connection().cursor()
+        valores = b",".join(cursor.mogrify("(%s, %s, %s)", fila) for fila in filas)
+        cursor.execute(b"INSERT INTO tipos_cambio (moneda, fecha, valor) VALUES " + valores)
+
+    # Las monedas que ya no están en el archivo conservan la tasa guardada
+    usuarios: Set[int] = set()
+    tasa_sql = expresion_tasa("m.moneda", "m.fecha")
+    for tabla in ("ingresos", "egresos"):
+        usuarios.update(
+            fila[0]
+            for fila in db.execute(
+                f"""
+                UPDATE {tabla} m SET tasa_cambio = {tasa_sql}
+                WHERE m.moneda = ANY($cambiadas)
+                  AND m.moneda IN (SELECT moneda FROM tipos_cambio)
+                  AND m.tasa_cambio IS DISTINCT FROM {tasa_sql}
+                RETURNING m.fk_usuarios
+                """
+            ).fetchall()
+        )
+    return usuarios
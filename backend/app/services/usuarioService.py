@@ -1,36 +1,31 @@
 # app/services/usuarioService.py
+from typing import List, Optional
 from pony.orm import db_session, commit
 from app.models.usuario import Usuario
 from app.schemas.usuario import UsuarioUpdate
+from app.services.proyeccionService import seleccionar_campos
+from app.services.eliminacionUsuarioService import (
+    solicitar_eliminacion,
+    obtener_eliminacion,
+)
 
 
 # IMPORTANTE: En services NO hay HTTPException ni respuestas HTTP
 # Solo devolvemos datos o lanzamos excepciones de Python
 
 
+# Columnas que se pueden pedir con ?fields= (la contraseña nunca se devuelve)
+CAMPOS_USUARIO = ["id", "nombre_completo", "email", "username"]
+
+
 # GET USUARIOS - Devuelve la lista de usuarios
 @db_session
-def get_usuarios() -> list:
+def get_usuarios(campos: Optional[List[str]] = None) -> list:
     """
-    Obtiene todos los usuarios de la BD.
+    Obtiene todos los usuarios de la BD (solo las columnas pedidas).
     """
     try:
-        # Usar query más directa
-        usuarios_query = Usuario.select().order_by(Usuario.id)
-
-        resultado = []
-        for usuario in usuarios_query:
-            resultado.append(
-                {
-                    "id": usuario.id,
-                    "nombre_completo": usuario.nombre_completo,
-                    "password": usuario.password,
-                    "email": usuario.email,
-                    "username": usuario.username,
-                }
-            )
-
-        return resultado
+        return seleccionar_campos("usuarios", campos or CAMPOS_USUARIO, "TRUE", {})
 
     except Exception as e:
         print(f"Error en get_usuarios: {e}")
@@ -39,23 +34,22 @@ def get_usuarios() -> list:
 
 # GET USUARIO - Obtener un usuario por ID
 @db_session
-def get_usuario(usuario_id: int) -> dict:
+def get_usuario(usuario_id: int, campos: Optional[List[str]] = None) -> dict:
     """
     Obtiene un usuario específico por ID.
     """
     try:
-        usuario = Usuario.get(id=usuario_id)
-
-        if not usuario:
+        filas = seleccionar_campos(
+            "usuarios",
+            campos or CAMPOS_USUARIO,
+            "id = $usuario_id",
+            {"usuario_id": usuario_id},
+        )
+
+        if not filas:
             raise ValueError(f"Usuario con ID {usuario_id} no encontrado")
 
-        return {
-            "id": usuario.id,
-            "nombre_completo": usuario.nombre_completo,
-            "password": usuario.password,
-            "email": usuario.email,
-            "username": usuario.username,
-        }
+        return filas[0]
 
     except ValueError:
         raise
@@ -107,7 +101,6 @@ def put_usuario(usuario_id: int, data: UsuarioUpdate) -> dict:
         return {
             "id": usuario.id,
             "nombre_completo": usuario.nombre_completo,
-            "password": usuario.password,
             "email": usuario.email,
             "username": usuario.username,
         }
@@ -120,24 +113,33 @@ def put_usuario(usuario_id: int, data: UsuarioUpdate) -> dict:
 
 
 # DELETE USUARIO - Permite eliminar un usuario por ID
-@db_session
 def delete_usuario(usuario_id: int) -> dict:
     """
-    Elimina un usuario de la BD.
+    Pide la baja de un usuario. Sus datos se borran en segundo plano
+    (ver eliminacionUsuarioService); el avance se consulta con
+    get_eliminacion_usuario.
     """
     try:
-        usuario = Usuario.get(id=usuario_id)
+        trabajo = solicitar_eliminacion(usuario_id)
+        trabajo["mensaje"] = (
+            f"La eliminación del usuario con ID {usuario_id} está en curso"
+        )
+        return trabajo
 
-        if not usuario:
-            raise ValueError(f"Usuario con ID {usuario_id} no encontrado")
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"Error en delete_usuario: {e}")
+        raise ValueError(f"Error al eliminar usuario: {str(e)}")
 
-        usuario.delete()
-        commit()
 
-        return {"mensaje": f"Usuario con ID {usuario_id} eliminado correctamente"}
+# GET ELIMINACION - Avance de la baja de un usuario
+def get_eliminacion_usuario(usuario_id: int) -> dict:
+    try:
+        return obtener_eliminacion(usuario_id)
 
     except ValueError:
         raise
     except Exception as e:
-        print(f"Error en delete_usuario: {e}")
-        raise ValueError(f"Error al eliminar usuario: {str(e)}")
+        print(f"Error en get_eliminacion_usuario: {e}")
+        raise ValueError(f"Error al obtener la eliminación del usuario: {str(e)}")
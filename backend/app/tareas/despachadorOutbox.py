@@ -0,0 +1,159 @@
+# app/tareas/despachadorOutbox.py
+# Despachador de eventos del outbox hacia los consumidores registrados.
+#
+# Cada consumidor tiene su propio offset (último evento procesado). El
+# despachador lee lotes de eventos posteriores a ese offset, se los pasa al
+# consumidor y, solo si terminó sin errores, guarda el nuevo offset.
+# Si el consumidor falla, el lote se vuelve a entregar en la próxima vuelta
+# (entrega "al menos una vez"), por eso los consumidores deben tolerar
+# recibir el mismo evento más de una vez.
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+from app.services.outboxService import (
+    leer_eventos,
+    marca_transacciones,
+    terminaron_transacciones,
+    hay_eventos_entre,
+    obtener_ultimo_id,
+    obtener_offset,
+    guardar_offset,
+    purgar_eventos,
+)
+
+HABILITADO = os.getenv("DESPACHADOR_OUTBOX", "1") == "1"
+INTERVALO_SEGUNDOS = float(os.getenv("OUTBOX_INTERVALO_SEGUNDOS", "0.5"))
+TAMANO_LOTE = int(os.getenv("OUTBOX_TAMANO_LOTE", "500"))
+
+# nombre -> (funcion, entidades que le interesan o None para todas, persistente)
+_consumidores: Dict[str, tuple] = {}
+# Offsets de los consumidores no persistentes (viven en memoria del proceso)
+_offsets_en_memoria: Dict[str, int] = {}
+# consumidor -> {primer ID del hueco: marca de transacciones al verlo}. Solo
+# tiene los huecos posteriores al offset (a lo sumo uno por consumidor).
+_huecos: Dict[str, Dict[int, int]] = {}
+_detener = threading.Event()
+
+
+def consumidor(
+    nombre: str, entidades: Optional[Set[str]] = None, persistente: bool = True
+):
+    """
+    Decorador para registrar un consumidor del outbox.
+
+    Uso:
+    @consumidor("recalcular_algo", entidades={"egreso"})
+    def recalcular_algo(eventos: list):
+        ...
+
+    La función recibe una lista de eventos (dicts) en orden de ID.
+
+    Con persistente=False el offset se guarda en memoria y arranca desde el
+    último evento existente: sirve para consumidores que avisan a algo que
+    vive en el proceso (por ejemplo conexiones abiertas), donde cada proceso
+    tiene que ver todos los eventos y no tiene sentido reprocesar el pasado.
+    """
+
+    def registrar(funcion: Callable[[List[dict]], None]):
+        _consumidores[nombre] = (funcion, entidades, persistente)
+        return funcion
+
+    return registrar
+
+
+def _eventos_contiguos(nombre: str, eventos: List[dict], desde_id: int) -> List[dict]:
+    """
+    Recorta el lote en el primer hueco de IDs que todavía puede llenarse,
+    para no avanzar el offset por encima de un evento que aún no es visible.
+
+    Un hueco se saltea solo cuando terminaron todas las transacciones que
+    estaban abiertas al verlo y sus IDs siguen sin aparecer (fueron
+    rollbacks). Mientras tanto el lote se corta ahí, aunque tarde.
+    """
+    huecos = _huecos.setdefault(nombre, {})
+    esperado = desde_id + 1
+    resultado = []
+
+    for evento in eventos:
+        if evento["id"] != esperado:
+            marca = huecos.get(esperado)
+            if marca is None:
+                huecos[esperado] = marca_transacciones()
+                break
+            if not terminaron_transacciones(marca):
+                break
+            # Terminaron: si algún ID del hueco apareció, se lee en la próxima vuelta
+            if hay_eventos_entre(esperado, evento["id"] - 1):
+                break
+        resultado.append(evento)
+        esperado = evento["id"] + 1
+
+    # Los huecos que el offset va a dejar atrás ya no hacen falta
+    for inicio in [i for i in huecos if i < esperado]:
+        del huecos[inicio]
+    return resultado
+
+
+def despachar_una_vez() -> int:
+    """
+    Entrega un lote a cada consumidor. Devuelve cuántos eventos se procesaron
+    en total (0 si no había nada nuevo).
+    """
+    entregados = 0
+
+    for nombre, (funcion, entidades, persistente) in list(_consumidores.items()):
+        if persistente:
+            desde_id = obtener_offset(nombre)
+        else:
+            if nombre not in _offsets_en_memoria:
+                _offsets_en_memoria[nombre] = obtener_ultimo_id()
+            desde_id = _offsets_en_memoria[nombre]
+        eventos = _eventos_contiguos(nombre, leer_eventos(desde_id, TAMANO_LOTE), desde_id)
+        if not eventos:
+            continue
+
+        lote = [e for e in eventos if entidades is None or e["entidad"] in entidades]
+        try:
+            if lote:
+                funcion(lote)
+        except Exception as e:
+            print(f"❌ Error en el consumidor '{nombre}': {e}")
+            continue
+
+        if persistente:
+            guardar_offset(nombre, eventos[-1]["id"])
+        else:
+            _offsets_en_memoria[nombre] = eventos[-1]["id"]
+        entregados += len(eventos)
+
+    return entregados
+
+
+def _bucle():
+    ultima_purga = 0.0
+    while not _detener.is_set():
+        try:
+            entregados = despachar_una_vez()
+
+            if time.monotonic() - ultima_purga > 3600:
+                purgar_eventos()
+                ultima_purga = time.monotonic()
+        except Exception as e:
+            entregados = 0
+            print(f"❌ Error en el despachador del outbox: {e}")
+
+        # Si había trabajo se sigue enseguida, si no se espera un intervalo
+        if not entregados:
+            _detener.wait(INTERVALO_SEGUNDOS)
+
+
+def iniciar_despachador():
+    if not HABILITADO:
+        return
+    _detener.clear()
+    threading.Thread(target=_bucle, name="despachador-outbox", daemon=True).start()
+
+
+def detener_despachador():
+    _detener.set()
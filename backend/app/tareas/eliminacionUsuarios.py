@@ -0,0 +1,85 @@
+# app/tareas/eliminacionUsuarios.py
+# Trabajador que procesa las bajas de cuenta pedidas con DELETE /usuarios/{id}.
+#
+# Toma un pedido, cuenta las filas y las borra tabla por tabla en lotes
+# (ver app/services/eliminacionUsuarioService.py). Entre lote y lote hace
+# una pausa corta para no acaparar la BD. Si el proceso se detiene a mitad
+# de un pedido, lo deja "pendiente" y se retoma donde quedó.
+import os
+import threading
+from app.services.eliminacionUsuarioService import (
+    TABLAS_USUARIO,
+    TAMANO_LOTE,
+    hay_trabajo,
+    tomar_trabajo,
+    contar_filas,
+    borrar_lote,
+    finalizar_eliminacion,
+    marcar_trabajo,
+)
+
+HABILITADO = os.getenv("ELIMINACION_USUARIOS", "1") == "1"
+INTERVALO_SEGUNDOS = float(os.getenv("ELIMINACION_INTERVALO_SEGUNDOS", "5"))
+PAUSA_ENTRE_LOTES = float(os.getenv("ELIMINACION_PAUSA_SEGUNDOS", "0.05"))
+
+_detener = threading.Event()
+
+
+def procesar_trabajo(trabajo_id: int, usuario_id: int) -> bool:
+    """
+    Borra los datos del usuario y al usuario. Devuelve False si se cortó
+    porque se está deteniendo el proceso.
+    """
+    contar_filas(trabajo_id, usuario_id)
+
+    for tabla, columna in TABLAS_USUARIO:
+        while True:
+            if _detener.is_set():
+                marcar_trabajo(trabajo_id, "pendiente")
+                return False
+            if borrar_lote(trabajo_id, usuario_id, tabla, columna) < TAMANO_LOTE:
+                break
+            _detener.wait(PAUSA_ENTRE_LOTES)
+
+    finalizar_eliminacion(trabajo_id, usuario_id)
+    return True
+
+
+def procesar_pendientes() -> int:
+    """Procesa todos los pedidos pendientes. Devuelve cuántos terminó."""
+    terminados = 0
+    while not _detener.is_set():
+        trabajo = tomar_trabajo()
+        if trabajo is None:
+            break
+        trabajo_id, usuario_id = trabajo
+        try:
+            if procesar_trabajo(trabajo_id, usuario_id):
+                terminados += 1
+                print(f"✅ Cuenta {usuario_id} eliminada")
+        except Exception as e:
+            print(f"❌ Error al eliminar la cuenta {usuario_id}: {e}")
+            marcar_trabajo(trabajo_id, "error", str(e))
+    return terminados
+
+
+def _bucle():
+    while not _detener.is_set():
+        hay_trabajo.clear()
+        try:
+            procesar_pendientes()
+        except Exception as e:
+            print(f"❌ Error en el trabajador de bajas de cuenta: {e}")
+        hay_trabajo.wait(INTERVALO_SEGUNDOS)
+
+
+def iniciar_eliminacion_usuarios():
+    if not HABILITADO:
+        return
+    _detener.clear()
+    threading.Thread(target=_bucle, name="eliminacion-usuarios", daemon=True).start()
+
+
+def detener_eliminacion_usuarios():
+    _detener.set()
+    hay_trabajo.set()  # Para que no se quede esperando el intervalo
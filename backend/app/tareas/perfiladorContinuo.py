@@ -0,0 +1,45 @@
+# app/tareas/perfiladorContinuo.py
+# Perfilador de CPU que corre siempre (si PERFILADOR_CONTINUO=1): cada
+# PERFILADOR_INTERVALO_MS toma la pila de todos los hilos y la suma a
+# perfilador_continuo (app/services/perfilesService.py). Lo acumulado se lee
+# en /admin/perfilador, en el formato de flamegraph.pl / speedscope.
+#
+# Sirve para ver a dónde se va la CPU con tráfico real (bcrypt, armar
+# entidades de Pony, limpiar_texto, pasar a JSON...) sin saber de antemano
+# qué request mirar. El costo se mide solo (ver /admin/perfilador/estado) y
+# el muestreador se espacia para no pasar del 2%.
+import os
+import threading
+from app.services.perfilesService import perfilador_continuo
+
+HABILITADO = os.getenv("PERFILADOR_CONTINUO", "0") == "1"
+
+_detener = threading.Event()
+
+
+def _bucle():
+    propio = threading.get_ident()
+    espera = perfilador_continuo.intervalo
+    while not _detener.wait(espera):
+        try:
+            espera = perfilador_continuo.muestrear(excluir=propio)
+        except Exception as e:
+            print(f"❌ Error en el perfilador continuo: {e}")
+            espera = 1.0
+
+
+def iniciar_perfilador_continuo():
+    if not HABILITADO:
+        return
+    _detener.clear()
+    perfilador_continuo.reiniciar()
+    perfilador_continuo.activo = True
+    threading.Thread(target=_bucle, name="perfilador-continuo", daemon=True).start()
+    print(
+        f"✅ Perfilador continuo cada {perfilador_continuo.intervalo * 1000:.0f} ms"
+    )
+
+
+def detener_perfilador_continuo():
+    _detener.set()
+    perfilador_continuo.activo = False
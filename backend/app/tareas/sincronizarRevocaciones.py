@@ -0,0 +1,56 @@
+# app/tareas/sincronizarRevocaciones.py
+# Mantiene el filtro de sesiones revocadas de este proceso al día con la BD.
+#
+# - Al arrancar se carga completo (antes de atender requests).
+# - Cada INTERVALO segundos se traen las revocaciones nuevas (las hechas en
+#   otros procesos tardan como mucho eso en rechazarse acá).
+# - Cada hora (o si se llenó) se arma de cero, para olvidar las vencidas, y
+#   se borran de la BD las revocaciones y refresh tokens vencidos.
+import os
+import threading
+import time
+from app.services.revocacionService import (
+    lista_revocacion,
+    purgar_revocaciones_vencidas,
+)
+
+HABILITADO = os.getenv("SINCRONIZAR_REVOCACIONES", "1") == "1"
+INTERVALO_SEGUNDOS = float(os.getenv("REVOCACION_INTERVALO_SEGUNDOS", "5"))
+RECONSTRUIR_SEGUNDOS = 3600
+
+_detener = threading.Event()
+
+
+def _bucle():
+    ultima_reconstruccion = time.monotonic()
+    while not _detener.wait(INTERVALO_SEGUNDOS):
+        try:
+            if (
+                time.monotonic() - ultima_reconstruccion > RECONSTRUIR_SEGUNDOS
+                or lista_revocacion.necesita_reconstruir()
+            ):
+                purgar_revocaciones_vencidas()
+                lista_revocacion.sincronizar(completa=True)
+                ultima_reconstruccion = time.monotonic()
+            else:
+                lista_revocacion.sincronizar()
+        except Exception as e:
+            print(f"❌ Error al sincronizar las sesiones revocadas: {e}")
+
+
+def iniciar_sincronizacion_revocaciones():
+    if not HABILITADO:
+        return
+    try:
+        cantidad = lista_revocacion.sincronizar(completa=True)
+        print(f"✅ Sesiones revocadas cargadas: {cantidad}")
+    except Exception as e:
+        print(f"❌ Error al cargar las sesiones revocadas: {e}")
+    _detener.clear()
+    threading.Thread(
+        target=_bucle, name="sincronizar-revocaciones", daemon=True
+    ).start()
+
+
+def detener_sincronizacion_revocaciones():
+    _detener.set()
@@ -0,0 +1,69 @@
+# app/tareas/snapshotPatrimonio.py
+# Tarea programada que guarda la foto diaria del patrimonio de los usuarios.
+# Se inicia junto con la API (ver main.py) y también se puede correr a mano
+# o desde un cron:  python -m app.tareas.snapshotPatrimonio
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pony.orm import db_session
+from app.database.database import db
+from app.services.patrimonioService import generar_snapshot_patrimonio
+
+# Hora local (HH:MM) en la que se cierra el día anterior
+HORA_SNAPSHOT = os.getenv("HORA_SNAPSHOT_PATRIMONIO", "00:05")
+HABILITADO = os.getenv("SNAPSHOT_PATRIMONIO", "1") == "1"
+
+_detener = threading.Event()
+
+
+def segundos_hasta_proxima_ejecucion(ahora: datetime = None) -> float:
+    ahora = ahora or datetime.now()
+    hora, minuto = (int(x) for x in HORA_SNAPSHOT.split(":"))
+    proxima = ahora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+    if proxima <= ahora:
+        proxima += timedelta(days=1)
+    return (proxima - ahora).total_seconds()
+
+
+@db_session
+def _existe_snapshot(fecha: date) -> bool:
+    return db.exists("SELECT 1 FROM patrimonio_diario WHERE fecha = $fecha")
+
+
+def cerrar_dia_anterior():
+    """Guarda la foto de ayer (el día ya terminó, sus movimientos están completos)"""
+    ayer = date.today() - timedelta(days=1)
+    try:
+        cantidad = generar_snapshot_patrimonio(ayer)
+        print(f"✅ Snapshot de patrimonio del {ayer} generado ({cantidad} usuarios)")
+    except Exception as e:
+        print(f"❌ Error al generar el snapshot de patrimonio: {e}")
+
+
+def _bucle():
+    # Si la API estuvo apagada a la hora programada, se recupera al iniciar
+    try:
+        if not _existe_snapshot(date.today() - timedelta(days=1)):
+            cerrar_dia_anterior()
+    except Exception as e:
+        print(f"❌ Error al verificar el snapshot de patrimonio: {e}")
+
+    while not _detener.wait(segundos_hasta_proxima_ejecucion()):
+        cerrar_dia_anterior()
+
+
+def iniciar_snapshot_diario():
+    if not HABILITADO:
+        return
+    _detener.clear()
+    threading.Thread(target=_bucle, name="snapshot-patrimonio", daemon=True).start()
+
+
+def detener_snapshot_diario():
+    _detener.set()
+
+
+if __name__ == "__main__":
+    import app.main  # noqa: F401  (registra los modelos e inicializa la BD)
+
+    cerrar_dia_anterior()
@@ -0,0 +1,103 @@
+# benchmarks/bench_busqueda.py
+# Mide GET /busqueda (servicio) en una cuenta con 100.000 filas.
+# Necesita una BD con las tablas creadas y sql/004_busqueda_trigramas.sql
+# aplicado (usa DATABASE_URL del .env).
+# Uso (desde la carpeta backend):  python -m benchmarks.bench_busqueda
+# Objetivo: menos de 10 ms por búsqueda. Los datos de prueba se borran al final.
+import statistics
+import time
+import uuid
+from pony.orm import db_session, commit
+from app.database.database import db, init_database
+from app.models import Usuario  # Registra todas las entidades
+
+init_database()
+
+from app.services.busquedaService import buscar_service
+
+PALABRAS = [
+    "hipoteca", "prestamo", "tarjeta", "auto", "moto", "casa", "departamento",
+    "banco", "nacion", "galicia", "santander", "personal", "plazo", "fijo",
+    "acciones", "bonos", "cripto", "negocio", "local", "terreno", "comida",
+    "transporte", "servicios", "salud", "viajes", "educación", "sueldo",
+]
+
+
+@db_session
+def crear_datos(filas_por_tabla: int) -> int:
+    sufijo = uuid.uuid4().hex[:8]
+    usuario = Usuario(
+        nombre_completo="Benchmark",
+        password="-",
+        email=f"bench_{sufijo}@example.com",
+        username=f"bench_{sufijo}",
+    )
+    commit()
+    usuario_id = usuario.id
+    palabras = PALABRAS
+    cantidad_palabras = len(PALABRAS)
+
+    # Nombres de 2 palabras al azar más un número, para que haya variedad
+    elegir = "($palabras::text[])[1 + floor(random() * $cantidad_palabras)::int]"
+    nombre = f"{elegir} || ' ' || {elegir} || ' ' || g"
+    db.execute(
+        f"""
+        INSERT INTO activos (valor, tipo, nombre, fk_usuarios)
+        SELECT 1000, 'Otro', {nombre}, $usuario_id
+        FROM generate_series(1, $filas_por_tabla) g
+        """
+    )
+    db.execute(
+        f"""
+        INSERT INTO pasivos (nombre, tipo, monto_total, pago_mensual, fecha_vencimiento, fk_usuarios)
+        SELECT {nombre}, 'Otro', 1000, 100, current_date + 365, $usuario_id
+        FROM generate_series(1, $filas_por_tabla) g
+        """
+    )
+    for tabla in ("ingresos", "egresos"):
+        db.execute(
+            f"""
+            INSERT INTO {tabla} (monto, categoria, fecha, fk_usuarios)
+            SELECT 100, {elegir}, current_date - (g % 365), $usuario_id
+            FROM generate_series(1, $filas_por_tabla) g
+            """
+        )
+    for tabla in ("activos", "pasivos", "ingresos", "egresos"):
+        db.execute(f"ANALYZE {tabla}")
+    return usuario_id
+
+
+@db_session
+def borrar_datos(usuario_id: int):
+    for tabla in ("activos", "pasivos", "ingresos", "egresos"):
+        db.execute(f"DELETE FROM {tabla} WHERE fk_usuarios = $usuario_id")
+    db.execute("DELETE FROM usuarios WHERE id = $usuario_id")
+
+
+def medir(usuario_id: int, q: str, pagina: int = 1, repeticiones: int = 50):
+    buscar_service(usuario_id, q, pagina=pagina)  # calentar
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        buscar_service(usuario_id, q, pagina=pagina)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+if __name__ == "__main__":
+    usuario_id = crear_datos(25_000)  # 4 tablas x 25.000 = 100.000 filas
+    try:
+        for q, pagina in [
+            ("hipo", 1),
+            ("tarjeta galicia", 1),
+            ("banco", 5),
+            ("a", 1),
+            ("comida", 1),
+            ("12345", 1),
+            ("no existe", 1),
+        ]:
+            p50, p95 = medir(usuario_id, q, pagina)
+            print(f"q={q!r:20} página {pagina}: p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+    finally:
+        borrar_datos(usuario_id)
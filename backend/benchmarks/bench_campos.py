@@ -0,0 +1,76 @@
+# benchmarks/bench_campos.py
+# Compara el listado de egresos completo contra campos parciales (?fields=).
+# Necesita una BD con las tablas creadas (usa DATABASE_URL del .env).
+# Uso (desde la carpeta backend):  python -m benchmarks.bench_campos
+# Crea un usuario temporal con muchos egresos y lo borra al terminar.
+import time
+import uuid
+from typing import List
+from pydantic import TypeAdapter
+from pony.orm import db_session, commit
+from app.database.database import db, init_database
+from app.models import Usuario  # Registra todas las entidades
+
+init_database()
+
+from app.services.egresoService import get_egresos_service
+from app.controllers.respuestas import respuesta_parcial
+from app.schemas.egreso import EgresoOut
+
+# Lo que hace FastAPI con el response_model cuando no se pide ?fields=
+lista_egresos = TypeAdapter(List[EgresoOut])
+
+
+@db_session
+def crear_datos(cantidad: int) -> int:
+    sufijo = uuid.uuid4().hex[:8]
+    usuario = Usuario(
+        nombre_completo="Benchmark",
+        password="-",
+        email=f"bench_{sufijo}@example.com",
+        username=f"bench_{sufijo}",
+    )
+    commit()
+    usuario_id = usuario.id
+    db.execute(
+        """
+        INSERT INTO egresos (monto, categoria, fecha, fk_usuarios)
+        SELECT round((random() * 500)::numeric, 2), 'comida',
+               current_date - (g % 365), $usuario_id
+        FROM generate_series(1, $cantidad) g
+        """
+    )
+    return usuario_id
+
+
+@db_session
+def borrar_datos(usuario_id: int):
+    db.execute("DELETE FROM egresos WHERE fk_usuarios = $usuario_id")
+    db.execute("DELETE FROM usuarios WHERE id = $usuario_id")
+
+
+def medir(usuario_id: int, campos, repeticiones: int = 5):
+    """Tiempo de lectura + serialización a JSON (ms) y tamaño de la respuesta"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        datos = get_egresos_service(usuario_id, campos)
+        if campos is None:
+            cuerpo = lista_egresos.dump_json(lista_egresos.validate_python(datos))
+        else:
+            cuerpo = respuesta_parcial(datos, campos).body
+    return (time.perf_counter() - inicio) / repeticiones * 1000, len(cuerpo)
+
+
+if __name__ == "__main__":
+    for cantidad in (1_000, 10_000, 100_000):
+        usuario_id = crear_datos(cantidad)
+        try:
+            completo_ms, completo_bytes = medir(usuario_id, None)
+            parcial_ms, parcial_bytes = medir(usuario_id, ["id", "monto", "fecha"])
+            print(
+                f"{cantidad:>7} egresos | completo: {completo_ms:8.2f} ms "
+                f"{completo_bytes / 1024:8.0f} KB | id,monto,fecha: {parcial_ms:8.2f} ms "
+                f"{parcial_bytes / 1024:8.0f} KB"
+            )
+        finally:
+            borrar_datos(usuario_id)
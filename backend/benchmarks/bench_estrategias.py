@@ -0,0 +1,34 @@
+# benchmarks/bench_estrategias.py
+# Mide la simulación de estrategias de pago con carteras grandes de deudas.
+# Uso (desde la carpeta backend):  python -m benchmarks.bench_estrategias
+# Objetivo: 500 pasivos, 360 meses y 4 estrategias en menos de 100 ms.
+import time
+import numpy as np
+from app.services.estrategiaPagoService import simular_estrategias
+
+
+def medir(cantidad_pasivos: int, meses: int, repeticiones: int = 5) -> float:
+    rng = np.random.default_rng(42)
+    saldos = rng.uniform(1_000, 200_000, cantidad_pasivos)
+    tasas = rng.uniform(0, 80, cantidad_pasivos)
+    pagos = saldos * (tasas / 100 / 12 + 0.002)
+    presupuesto = pagos.sum() * 1.3
+
+    ordenes = [
+        np.argsort(-tasas),  # avalancha
+        np.argsort(saldos),  # bola de nieve
+        rng.permutation(cantidad_pasivos),  # personalizada
+        None,  # solo mínimos
+    ]
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        simular_estrategias(saldos, pagos, tasas, presupuesto, ordenes, meses)
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+if __name__ == "__main__":
+    for cantidad in (10, 100, 500, 1000):
+        for meses in (120, 360):
+            ms = medir(cantidad, meses)
+            print(f"{cantidad:>5} pasivos x {meses:>3} meses x 4 estrategias: {ms:7.2f} ms")
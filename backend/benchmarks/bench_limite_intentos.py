@@ -0,0 +1,59 @@
+# benchmarks/bench_limite_intentos.py
+# Mide cuánto cuesta rechazar un intento de login comparado con correr bcrypt.
+# Uso (desde la carpeta backend):  python -m benchmarks.bench_limite_intentos
+# Objetivo: un rechazo tiene que costar microsegundos.
+import time
+from app.services.auth_service import hash_password, verify_password
+from app.services.limiteIntentosService import (
+    LimitadorTokens,
+    LimiteExcedido,
+    POLITICAS,
+    verificar_limite_intentos,
+)
+
+
+def medir_rechazos(repeticiones: int = 200_000) -> float:
+    """µs por intento rechazado (IP y email ya sin fichas)"""
+    for _ in range(100):
+        try:
+            verificar_limite_intentos("login", ip="10.0.0.1", email="victima@example.com")
+        except LimiteExcedido:
+            pass
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        try:
+            verificar_limite_intentos("login", ip="10.0.0.1", email="victima@example.com")
+        except LimiteExcedido:
+            pass
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def medir_claves_distintas(cantidad: int, max_claves: int) -> tuple:
+    """µs por intento con claves siempre nuevas (IPs rotando) y claves guardadas"""
+    limitador = LimitadorTokens(5, 60, max_claves=max_claves)
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        limitador.consumir(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+    return (time.perf_counter() - inicio) / cantidad * 1e6, len(limitador)
+
+
+def medir_bcrypt(repeticiones: int = 5) -> float:
+    """µs por verificación de contraseña (lo que se ahorra con cada rechazo)"""
+    hash_guardado = hash_password("una-contraseña")
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        verify_password("otra-contraseña", hash_guardado)
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+if __name__ == "__main__":
+    politica = POLITICAS["login"]
+    print(
+        f"Política login: IP {politica['ip'].capacidad}/{politica['ip'].segundos:.0f}s, "
+        f"email {politica['email'].capacidad}/{politica['email'].segundos:.0f}s"
+    )
+    print(f"Rechazo (IP + email sin fichas): {medir_rechazos():8.2f} µs")
+    us, guardadas = medir_claves_distintas(1_000_000, max_claves=100_000)
+    print(f"1.000.000 IPs distintas:         {us:8.2f} µs  ({guardadas} claves en memoria)")
+    print(f"bcrypt verify:                   {medir_bcrypt():8.0f} µs")
@@ -0,0 +1,3 @@
+-- Tasa nominal anual (en %) de cada pasivo, usada por la amortización.
+-- Es opcional: si queda en NULL el pasivo se amortiza sin interés.
+ALTER TABLE pasivos ADD COLUMN IF NOT EXISTS tasa_interes DOUBLE PRECISION;
@@ -0,0 +1,11 @@
+-- Foto diaria de los totales de cada usuario (una fila por usuario y día).
+-- La llena la tarea programada de app/tareas/snapshotPatrimonio.py
+CREATE TABLE IF NOT EXISTS patrimonio_diario (
+    fk_usuarios   INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+    fecha         DATE NOT NULL,
+    total_activos DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_pasivos DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ingresos      DOUBLE PRECISION NOT NULL DEFAULT 0,
+    egresos       DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_usuarios, fecha)
+);
@@ -0,0 +1,20 @@
+-- Outbox: cada alta, modificación o baja de ingresos, egresos, activos y
+-- pasivos deja una fila acá dentro de la misma transacción.
+-- Los consumidores (app/tareas/despachadorOutbox.py) la leen en lotes.
+CREATE TABLE IF NOT EXISTS outbox_eventos (
+    id         BIGSERIAL PRIMARY KEY,
+    entidad    TEXT NOT NULL,
+    entidad_id INTEGER NOT NULL,
+    operacion  TEXT NOT NULL,
+    usuario_id INTEGER NOT NULL,
+    datos      JSONB,
+    anterior   JSONB,
+    creado     TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Último evento procesado por cada consumidor (checkpoint)
+CREATE TABLE IF NOT EXISTS outbox_offsets (
+    consumidor  TEXT PRIMARY KEY,
+    ultimo_id   BIGINT NOT NULL DEFAULT 0,
+    actualizado TIMESTAMP NOT NULL DEFAULT now()
+);
@@ -0,0 +1,32 @@
+-- Búsqueda por texto (GET /busqueda), índices por usuario.
+--
+-- Trigramas (pg_trgm, GiST): buscar "parte del nombre" (LIKE '%texto%') y
+-- ordenar por parecido (operador <->) usando el índice. btree_gist hace
+-- falta para poner fk_usuarios en el mismo índice, así cada usuario recorre
+-- solo sus filas aunque la tabla sea enorme. siglen=128 hace la firma más
+-- precisa (menos filas descartadas después de leerlas).
+--
+-- Prefijo (B-tree con collation "C"): para textos de 1 o 2 letras, donde los
+-- trigramas no sirven. Resuelve LIKE 'te%' y el orden alfabético.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE INDEX IF NOT EXISTS activos_nombre_trgm
+    ON activos USING gist (fk_usuarios, lower(nombre) gist_trgm_ops(siglen=128));
+CREATE INDEX IF NOT EXISTS activos_nombre_prefijo
+    ON activos (fk_usuarios, (lower(nombre) COLLATE "C"), id);
+
+CREATE INDEX IF NOT EXISTS pasivos_nombre_trgm
+    ON pasivos USING gist (fk_usuarios, lower(nombre) gist_trgm_ops(siglen=128));
+CREATE INDEX IF NOT EXISTS pasivos_nombre_prefijo
+    ON pasivos (fk_usuarios, (lower(nombre) COLLATE "C"), id);
+
+CREATE INDEX IF NOT EXISTS ingresos_categoria_trgm
+    ON ingresos USING gist (fk_usuarios, lower(categoria) gist_trgm_ops(siglen=128));
+CREATE INDEX IF NOT EXISTS ingresos_categoria_prefijo
+    ON ingresos (fk_usuarios, (lower(categoria) COLLATE "C"), id);
+
+CREATE INDEX IF NOT EXISTS egresos_categoria_trgm
+    ON egresos USING gist (fk_usuarios, lower(categoria) gist_trgm_ops(siglen=128));
+CREATE INDEX IF NOT EXISTS egresos_categoria_prefijo
+    ON egresos (fk_usuarios, (lower(categoria) COLLATE "C"), id);
@@ -0,0 +1,25 @@
+-- Sesiones (POST /auth/refresh y /auth/logout).
+--
+-- Cada login abre una sesión. Los refresh tokens de la sesión se rotan: cada
+-- uno sirve una sola vez y al usarlo se marca `usado`. Si llega uno ya usado
+-- es señal de que lo robaron, y se revoca la sesión entera.
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    jti        TEXT PRIMARY KEY,
+    sesion     TEXT NOT NULL,
+    usuario_id INTEGER NOT NULL,
+    expira     TIMESTAMP NOT NULL,
+    usado      TIMESTAMP,
+    creado     TIMESTAMP NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS refresh_tokens_usuario ON refresh_tokens (usuario_id);
+
+-- Sesiones cerradas antes de tiempo. Los access tokens de una sesión
+-- revocada se rechazan aunque no hayan vencido. `expira` es cuándo vence el
+-- último token que pudo emitirse en la sesión: después la fila ya no hace
+-- falta y se borra.
+CREATE TABLE IF NOT EXISTS sesiones_revocadas (
+    sesion  TEXT PRIMARY KEY,
+    expira  TIMESTAMP NOT NULL,
+    creado  TIMESTAMP NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS sesiones_revocadas_creado ON sesiones_revocadas (creado);
@@ -0,0 +1,23 @@
+-- Bajas de cuenta (DELETE /usuarios/{id}) como trabajos en segundo plano.
+--
+-- Una fila por pedido de baja. El trabajador (app/tareas/eliminacionUsuarios.py)
+-- borra los datos del usuario en lotes y va guardando el avance acá, así
+-- GET /usuarios/{id}/eliminacion puede informarlo (y si el proceso se
+-- reinicia, otro retoma el trabajo donde quedó).
+--
+-- Los lotes buscan las filas por fk_usuarios: usan los índices que empiezan
+-- por esa columna (los de 004_busqueda_trigramas.sql).
+CREATE TABLE IF NOT EXISTS eliminaciones_usuario (
+    id          SERIAL PRIMARY KEY,
+    usuario_id  INTEGER NOT NULL,            -- Sin FK: el usuario se borra al final
+    estado      TEXT NOT NULL DEFAULT 'pendiente',  -- pendiente, en_curso, completado, error
+    total       INTEGER NOT NULL DEFAULT 0,  -- Filas a borrar (se cuentan al empezar)
+    borradas    INTEGER NOT NULL DEFAULT 0,
+    tabla       TEXT,                        -- Tabla que se está borrando
+    error       TEXT,
+    creado      TIMESTAMP NOT NULL DEFAULT now(),
+    actualizado TIMESTAMP NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS eliminaciones_usuario_usuario ON eliminaciones_usuario (usuario_id);
+CREATE INDEX IF NOT EXISTS eliminaciones_usuario_activas
+    ON eliminaciones_usuario (id) WHERE estado IN ('pendiente', 'en_curso');
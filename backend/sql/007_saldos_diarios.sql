@@ -0,0 +1,43 @@
+-- Libro diario acumulado de ingresos y egresos (sumas prefijas por día).
+--
+-- Una fila por usuario, tipo ('ingreso' / 'egreso'), categoría y día con
+-- movimientos:
+--   monto      = lo movido ese día
+--   acumulado  = todo lo movido hasta ese día inclusive
+-- La categoría '' es el total del tipo (todas las categorías juntas); las
+-- demás se guardan en minúsculas.
+--
+-- El total de cualquier período es la resta de dos acumulados (el último
+-- hasta el fin y el último antes del inicio), cada uno una búsqueda en la
+-- clave primaria. Lo mantienen al día los services de ingresos y egresos
+-- (app/services/saldosService.py), en la misma transacción que el cambio.
+CREATE TABLE IF NOT EXISTS saldos_diarios (
+    fk_usuarios INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+    tipo        TEXT NOT NULL,   -- ingreso, egreso
+    categoria   TEXT NOT NULL,   -- '' = total del tipo
+    fecha       DATE NOT NULL,
+    monto       DOUBLE PRECISION NOT NULL DEFAULT 0,
+    acumulado   DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_usuarios, tipo, categoria, fecha)
+);
+
+-- Carga inicial con los movimientos que ya existen
+INSERT INTO saldos_diarios (fk_usuarios, tipo, categoria, fecha, monto, acumulado)
+SELECT fk_usuarios, tipo, categoria, fecha, monto,
+       SUM(monto) OVER (PARTITION BY fk_usuarios, tipo, categoria ORDER BY fecha)
+FROM (
+    -- Cada movimiento suma en su categoría y en el total ('')
+    SELECT fk_usuarios, tipo, libro.categoria, fecha, SUM(monto)
+    FROM (
+        SELECT fk_usuarios, 'ingreso' AS tipo, fecha, monto,
+               COALESCE(NULLIF(lower(trim(categoria)), ''), '(sin categoría)') AS categoria
+        FROM ingresos
+        UNION ALL
+        SELECT fk_usuarios, 'egreso', fecha, monto,
+               COALESCE(NULLIF(lower(trim(categoria)), ''), '(sin categoría)')
+        FROM egresos
+    ) movimientos
+    CROSS JOIN LATERAL (VALUES (movimientos.categoria), ('')) AS libro (categoria)
+    GROUP BY fk_usuarios, tipo, libro.categoria, fecha
+) dias (fk_usuarios, tipo, categoria, fecha, monto)
+ON CONFLICT DO NOTHING;
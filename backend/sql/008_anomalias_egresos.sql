@@ -0,0 +1,44 @@
+-- Detección de egresos inusualmente altos para su categoría.
+--
+-- estadisticas_egresos: por usuario y categoría (en minúsculas, igual que
+-- saldos_diarios), la cantidad de egresos, la media y la suma de los
+-- cuadrados de las diferencias con la media (m2, algoritmo de Welford).
+-- El desvío es sqrt(m2 / (cantidad - 1)). La mantiene egresoService en la
+-- misma transacción que el cambio (app/services/anomaliasService.py), así
+-- cada egreso nuevo se compara con su categoría sin recorrer el historial.
+--
+-- anomalias_egresos: los egresos que al crearse quedaron muy por encima de
+-- la media de su categoría. Se borran con el egreso.
+CREATE TABLE IF NOT EXISTS estadisticas_egresos (
+    fk_usuarios INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+    categoria   TEXT NOT NULL,
+    cantidad    INTEGER NOT NULL DEFAULT 0,
+    media       DOUBLE PRECISION NOT NULL DEFAULT 0,
+    m2          DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_usuarios, categoria)
+);
+
+CREATE TABLE IF NOT EXISTS anomalias_egresos (
+    id          SERIAL PRIMARY KEY,
+    fk_usuarios INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+    fk_egresos  INTEGER NOT NULL REFERENCES egresos (id) ON DELETE CASCADE,
+    categoria   TEXT NOT NULL,
+    monto       DOUBLE PRECISION NOT NULL,
+    media       DOUBLE PRECISION NOT NULL,  -- De la categoría antes del egreso
+    desvio      DOUBLE PRECISION NOT NULL,
+    puntaje_z   DOUBLE PRECISION NOT NULL,  -- (monto - media) / desvio
+    muestras    INTEGER NOT NULL,           -- Egresos de la categoría antes de este
+    creado      TIMESTAMP NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS anomalias_egresos_usuario
+    ON anomalias_egresos (fk_usuarios, id DESC);
+CREATE INDEX IF NOT EXISTS anomalias_egresos_egreso ON anomalias_egresos (fk_egresos);
+
+-- Carga inicial con los egresos que ya existen (m2 = varianza poblacional * n)
+INSERT INTO estadisticas_egresos (fk_usuarios, categoria, cantidad, media, m2)
+SELECT fk_usuarios,
+       COALESCE(NULLIF(lower(trim(categoria)), ''), '(sin categoría)'),
+       count(*), avg(monto), COALESCE(var_pop(monto) * count(*), 0)
+FROM egresos
+GROUP BY 1, 2
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,27 @@
+-- Presupuestos mensuales por categoría de egresos.
+--
+-- presupuestos: cuánto quiere gastar el usuario por mes en una categoría
+-- (en minúsculas, igual que saldos_diarios) y a qué fracción avisar.
+--
+-- consumos_presupuesto: lo gastado en cada mes (mes = primer día) de cada
+-- presupuesto. Lo mantienen los services de egresos en la misma transacción
+-- que el cambio (app/services/presupuestoService.py), así el estado de los
+-- presupuestos se lee sin sumar egresos. La fila de un mes se crea con el
+-- total del mes tomado del libro diario (saldos_diarios) y después solo se
+-- le suma o resta cada cambio.
+CREATE TABLE IF NOT EXISTS presupuestos (
+    id             SERIAL PRIMARY KEY,
+    fk_usuarios    INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+    categoria      TEXT NOT NULL,
+    monto_mensual  DOUBLE PRECISION NOT NULL,
+    umbral_alerta  DOUBLE PRECISION NOT NULL DEFAULT 0.8,  -- Fracción del monto
+    creado         TIMESTAMP NOT NULL DEFAULT now(),
+    UNIQUE (fk_usuarios, categoria)
+);
+
+CREATE TABLE IF NOT EXISTS consumos_presupuesto (
+    fk_presupuestos INTEGER NOT NULL REFERENCES presupuestos (id) ON DELETE CASCADE,
+    mes             DATE NOT NULL,
+    consumido       DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_presupuestos, mes)
+);
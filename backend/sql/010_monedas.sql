@@ -0,0 +1,25 @@
+-- Moneda de cada movimiento y tipos de cambio.
+--
+-- ingresos.monto, egresos.monto y activos.valor (y flujo_mensual) quedan en
+-- la moneda de la fila. Los movimientos que ya existían son de la moneda de
+-- reporte (MONEDA_REPORTE, por defecto CLP).
+--
+-- tipos_cambio: cuánto vale 1 unidad de cada moneda en la moneda de reporte
+-- desde cada fecha. Se llena al arrancar con el archivo TIPOS_CAMBIO_ARCHIVO
+-- (app/services/tiposCambioService.py); las consultas que suman movimientos
+-- convierten cada fila buscando en la clave primaria la última fecha <= la
+-- del movimiento.
+--
+-- Los libros que se mantienen en cada cambio (saldos_diarios,
+-- estadisticas_egresos, consumos_presupuesto) guardan montos ya convertidos.
+-- Si la moneda de reporte no es CLP, cambiar el DEFAULT antes de correrla.
+ALTER TABLE ingresos ADD COLUMN IF NOT EXISTS moneda TEXT NOT NULL DEFAULT 'CLP';
+ALTER TABLE egresos ADD COLUMN IF NOT EXISTS moneda TEXT NOT NULL DEFAULT 'CLP';
+ALTER TABLE activos ADD COLUMN IF NOT EXISTS moneda TEXT NOT NULL DEFAULT 'CLP';
+
+CREATE TABLE IF NOT EXISTS tipos_cambio (
+    moneda  TEXT NOT NULL,
+    fecha   DATE NOT NULL,
+    valor   DOUBLE PRECISION NOT NULL CHECK (valor > 0),
+    PRIMARY KEY (moneda, fecha)
+);
@@ -0,0 +1,29 @@
+-- Tipo de cambio aplicado a cada ingreso y egreso.
+--
+-- Se guarda al crear o modificar el movimiento (el de su moneda y fecha) y
+-- todo lo que suma movimientos en la moneda de reporte usa monto *
+-- tasa_cambio: las consultas y los libros que se mantienen en cada cambio
+-- (saldos_diarios, estadisticas_egresos, consumos_presupuesto). Así una baja
+-- o una modificación resta exactamente lo que se sumó, aunque después se
+-- haya cargado otro tipo de cambio para esa fecha.
+--
+-- Si el archivo de tipos de cambio cambia, al arrancar se recalcula la tasa
+-- de los movimientos afectados y se arman de cero los libros de esos
+-- usuarios (app/services/librosService.py).
+ALTER TABLE ingresos ADD COLUMN IF NOT EXISTS tasa_cambio DOUBLE PRECISION NOT NULL DEFAULT 1;
+ALTER TABLE egresos ADD COLUMN IF NOT EXISTS tasa_cambio DOUBLE PRECISION NOT NULL DEFAULT 1;
+
+-- Los movimientos en otras monedas que ya existían toman el tipo de cambio
+-- de su fecha de la tabla tipos_cambio (el mismo que se usó para sus libros)
+UPDATE ingresos i SET tasa_cambio = COALESCE(
+    (SELECT t.valor FROM tipos_cambio t
+     WHERE t.moneda = i.moneda AND t.fecha <= i.fecha ORDER BY t.fecha DESC LIMIT 1),
+    (SELECT t.valor FROM tipos_cambio t WHERE t.moneda = i.moneda ORDER BY t.fecha LIMIT 1),
+    1)
+WHERE i.moneda <> 'CLP';
+UPDATE egresos e SET tasa_cambio = COALESCE(
+    (SELECT t.valor FROM tipos_cambio t
+     WHERE t.moneda = e.moneda AND t.fecha <= e.fecha ORDER BY t.fecha DESC LIMIT 1),
+    (SELECT t.valor FROM tipos_cambio t WHERE t.moneda = e.moneda ORDER BY t.fecha LIMIT 1),
+    1)
+WHERE e.moneda <> 'CLP';
@@ -0,0 +1,14 @@
+-- Última escritura de cada usuario, para la ventana de lectura propia de la
+-- réplica (VENTANA_LECTURA_PROPIA_SEGUNDOS, app/database/database.py).
+--
+-- Está en la primaria y la comparten todos los procesos: si un usuario
+-- escribe en un worker, sus lecturas en cualquier otro siguen yendo a la
+-- primaria durante la ventana.
+--
+-- UNLOGGED: no pasa por el WAL (cada escritura de la API la actualiza) ni se
+-- copia a la réplica. Si PostgreSQL se cae se vacía, y lo único que se
+-- pierde son ventanas de unos segundos.
+CREATE UNLOGGED TABLE IF NOT EXISTS escrituras_recientes (
+    fk_usuarios INTEGER PRIMARY KEY,  -- Sin FK: se borra junto con el usuario a mano
+    momento     TIMESTAMPTZ NOT NULL
+);
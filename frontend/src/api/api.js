@@ -23,12 +23,74 @@ api.interceptors.request.use(
   }
 );
 
+// Interceptor: si el access token venció, pide uno nuevo con el refresh token
+// y repite la petición una sola vez. Si tampoco se puede renovar, se borra la
+// sesión guardada (hay que volver a iniciar sesión).
+let renovacionEnCurso = null;
+
+const renovarTokens = async () => {
+  const refreshToken = localStorage.getItem("refreshToken");
+  if (!refreshToken) throw new Error("Sin refresh token");
+
+  // Si varias peticiones fallan a la vez se renueva una sola vez
+  // (cada refresh token sirve una sola vez)
+  if (!renovacionEnCurso) {
+    renovacionEnCurso = axios
+      .post(`${api.defaults.baseURL}/auth/refresh`, {
+        refresh_token: refreshToken,
+      })
+      .then((response) => {
+        localStorage.setItem("token", response.data.access_token);
+        localStorage.setItem("refreshToken", response.data.refresh_token);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        renovacionEnCurso = null;
+      });
+  }
+  return renovacionEnCurso;
+};
+
+api.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const original = error.config;
+    const status = error.response?.status;
+
+    if (
+      (status === 401 || status === 403) &&
+      original &&
+      !original._reintentado &&
+      !original.url?.startsWith("/auth/")
+    ) {
+      original._reintentado = true;
+      try {
+        const token = await renovarTokens();
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      } catch {
+        localStorage.removeItem("token");
+        localStorage.removeItem("refreshToken");
+      }
+    }
+    return Promise.reject(error);
+  }
+);
+
 // ============= AUTENTICACIÓN =============
 export const login = async (email, password) => {
   const response = await api.post("/auth/login", { email, password });
   return response.data;
 };
 
+// Recibe el token porque se llama justo antes de borrarlo del localStorage
+export const logout = async (token) => {
+  const response = await api.post("/auth/logout", null, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  return response.data;
+};
+
 export const register = async (nombre_completo, email, username, password) => {
   const response = await api.post("/auth/register", {
     nombre_completo,
@@ -136,4 +198,67 @@ export const getDistribucionGastos = async (usuarioId, dias = 30) => {
   return response.data;
 };
 
+// ============= BÚSQUEDA =============
+// tipos: lista con "activo", "pasivo", "ingreso" y/o "egreso" (todos si se omite)
+export const buscar = async (q, { tipos = [], pagina = 1, limite = 20 } = {}) => {
+  const response = await api.get("/busqueda/", {
+    params: { q, tipos, pagina, limite },
+    paramsSerializer: { indexes: null }, // tipos=a&tipos=b
+  });
+  return response.data;
+};
+
+// ============= ACTUALIZACIONES EN TIEMPO REAL (SSE) =============
+// Devuelve una función para cerrar la conexión.
+// El token va en la URL porque EventSource no permite mandar headers. Si la
+// conexión se corta el navegador reintenta solo con la misma URL; si el
+// token ya venció el servidor responde 401 y EventSource se cierra, así que
+// se renueva el token y se vuelve a abrir. onError se llama cuando no hay
+// forma de seguir (sin EventSource o sin sesión), para cargar por REST.
+const MAX_REINTENTOS_STREAM = 3;
+
+export const suscribirAnalisis = (usuarioId, dias, { onResumen, onError }) => {
+  if (typeof EventSource === "undefined") {
+    onError?.();
+    return () => {};
+  }
+
+  let fuente = null;
+  let cerrada = false;
+  let reintentos = 0;
+
+  const abrir = () => {
+    const token = localStorage.getItem("token");
+    fuente = new EventSource(
+      `${api.defaults.baseURL}/analisis/stream/${usuarioId}?dias=${dias}&token=${token}`
+    );
+    fuente.addEventListener("resumen", (e) => {
+      reintentos = 0;
+      onResumen(JSON.parse(e.data));
+    });
+    fuente.onerror = async () => {
+      // CONNECTING: el navegador está reintentando por su cuenta
+      if (cerrada || fuente.readyState !== EventSource.CLOSED) return;
+      if (reintentos >= MAX_REINTENTOS_STREAM) {
+        onError?.();
+        return;
+      }
+      reintentos += 1;
+      try {
+        // Si otra petición ya renovó el token alcanza con usar el nuevo
+        if (localStorage.getItem("token") === token) await renovarTokens();
+        setTimeout(() => !cerrada && abrir(), 1000 * (reintentos - 1));
+      } catch {
+        onError?.();
+      }
+    };
+  };
+
+  abrir();
+  return () => {
+    cerrada = true;
+    fuente?.close();
+  };
+};
+
 export default api;
@@ -1,5 +1,6 @@
 // frontend/src/context/AuthContext.jsx
 import { createContext, useState, useContext, useEffect } from "react";
+import { logout } from "../api/api";
 
 const AuthContext = createContext();
 
@@ -29,15 +30,20 @@ export const AuthProvider = ({ children }) => {
   }, []);
 
   // Función para iniciar sesión
-  const loginUser = (userData, token) => {
+  const loginUser = (userData, token, refreshToken) => {
     localStorage.setItem("token", token);
+    localStorage.setItem("refreshToken", refreshToken);
     localStorage.setItem("user", JSON.stringify(userData));
     setUser(userData);
   };
 
   // Función para cerrar sesión
   const logoutUser = () => {
+    // Revoca la sesión en el backend (si falla igual se borra localmente)
+    const token = localStorage.getItem("token");
+    if (token) logout(token).catch(() => {});
     localStorage.removeItem("token");
+    localStorage.removeItem("refreshToken");
     localStorage.removeItem("user");
     setUser(null);
   };
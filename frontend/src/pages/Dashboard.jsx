@@ -1,7 +1,11 @@
 // frontend/src/pages/Dashboard.jsx
 import { useState, useEffect, useCallback } from "react";
 import { useAuth } from "../context/AuthContext";
-import { getSaludFinanciera, getDistribucionGastos } from "../api/api";
+import {
+  getSaludFinanciera,
+  getDistribucionGastos,
+  suscribirAnalisis,
+} from "../api/api";
 import Sidebar from "../components/Sidebar";
 import {
   ArrowUpCircle,
@@ -44,6 +48,9 @@ const Dashboard = () => {
   const [dias, setDias] = useState(30);
   const [expandedRules, setExpandedRules] = useState({});
   const [datosDistribucion, setDatosDistribucion] = useState([]);
+  // Cuántos análisis llegaron por el stream (cada uno es un cambio en los datos)
+  const [versionDatos, setVersionDatos] = useState(0);
+  const [sinStream, setSinStream] = useState(false);
 
   // --- Funciones ---
   const cargarAnalisis = useCallback(async () => {
@@ -59,13 +66,32 @@ const Dashboard = () => {
   }, [user, dias]);
 
   // --- useEffects ---
+  // El análisis llega por el stream: al conectarse manda el estado actual y
+  // después uno nuevo con cada cambio (desde esta u otra pestaña o
+  // dispositivo). Solo si el stream no está disponible se pide por REST.
+  useEffect(() => {
+    if (!user?.usuario_id) return;
+    setLoading(true);
+    setSinStream(false);
+    return suscribirAnalisis(user.usuario_id, dias, {
+      onResumen: (data) => {
+        setAnalisis(data);
+        setLoading(false);
+        setVersionDatos((version) => version + 1);
+      },
+      onError: () => setSinStream(true),
+    });
+  }, [user, dias]);
+
   useEffect(() => {
-    cargarAnalisis();
-  }, [cargarAnalisis]);
+    if (sinStream) cargarAnalisis();
+  }, [sinStream, cargarAnalisis]);
 
+  // La distribución se vuelve a pedir con cada análisis que llega por el
+  // stream, para que no quede desactualizada
   useEffect(() => {
     const usuarioId = user?.usuario_id || localStorage.getItem("usuarioId");
-    if (!usuarioId) return;
+    if (!usuarioId || (versionDatos === 0 && !sinStream)) return;
 
     getDistribucionGastos(usuarioId)
       .then((data) => {
@@ -80,7 +106,7 @@ const Dashboard = () => {
       .catch((error) =>
         console.error("Error al obtener distribución de gastos:", error)
       );
-  }, [user]);
+  }, [user, versionDatos, sinStream]);
 
   const toggleRule = (ruleKey) => {
     setExpandedRules((prev) => ({
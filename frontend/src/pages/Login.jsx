@@ -28,7 +28,8 @@ const Login = () => {
           email: data.email,
           nombre_completo: data.nombre_completo,
         },
-        data.access_token
+        data.access_token,
+        data.refresh_token
       );
 
       navigate("/dashboard");